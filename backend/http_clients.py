@@ -0,0 +1,367 @@
+"""
+HTTP CLIENTS - Pooled outbound clients per upstream API
+Keep-alive + HTTP/2, DNS cache, retry/backoff and latency metrics
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+import socket
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+logger = logging.getLogger("api")
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# ============== DNS CACHE ==============
+
+class DNSCache:
+    """Caches getaddrinfo results so new pool connections skip the lookup.
+
+    Every address is kept, in getaddrinfo's preference order (IPv6/IPv4 as
+    the system ranks them), so a connection can fall back to the next one.
+    """
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[List[str], float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry and entry[1] > time.monotonic():
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._entries[key] = (addresses, time.monotonic() + self.ttl)
+        return addresses
+
+    def forget(self, host: str, port: int) -> None:
+        self._entries.pop((host, port), None)
+
+
+def _is_ip_literal(host: str) -> bool:
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except OSError:
+            continue
+    return False
+
+
+class _CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that connects to the cached addresses in turn; TLS SNI still uses the hostname"""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, dns_cache: DNSCache):
+        self._backend = backend
+        self._dns = dns_cache
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        if _is_ip_literal(host):
+            return await self._backend.connect_tcp(host, port, timeout=timeout, local_address=local_address, socket_options=socket_options)
+        try:
+            addresses = await self._dns.resolve(host, port)
+        except OSError:
+            # Let the default backend raise its usual ConnectError
+            addresses = [host]
+        for index, address in enumerate(addresses):
+            try:
+                return await self._backend.connect_tcp(address, port, timeout=timeout, local_address=local_address, socket_options=socket_options)
+            except Exception:
+                if index == len(addresses) - 1:
+                    self._dns.forget(host, port)  # every address failed: resolve again next time
+                    raise
+                logger.info(f"Connect to {host} via {address} failed, trying next address")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# ============== TRANSPORT ==============
+
+# httpcore errors as the httpx errors callers (and the retry loop) expect; most specific first
+_ERROR_MAP = (
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+def _httpx_error(error: Exception) -> Exception:
+    for core_type, httpx_type in _ERROR_MAP:
+        if isinstance(error, core_type):
+            return httpx_type(str(error))
+    return error
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, response: httpcore.Response):
+        self._response = response
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._response.aiter_stream():
+                yield chunk
+        except Exception as e:
+            mapped = _httpx_error(e)
+            if mapped is e:
+                raise
+            raise mapped from e
+
+    async def aclose(self) -> None:
+        await self._response.aclose()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """httpx transport over an ``httpcore.AsyncConnectionPool`` built with our network backend.
+
+    ``AsyncHTTPTransport`` has no public way to pass a network backend, so the
+    pool is created here through httpcore's public constructor instead.
+    """
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool):
+        self.pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            response = await self.pool.handle_async_request(core_request)
+        except Exception as e:
+            mapped = _httpx_error(e)
+            if mapped is e:
+                raise
+            raise mapped from e
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+
+def _build_transport(config: "UpstreamConfig", dns_cache: DNSCache) -> PooledTransport:
+    http2 = config.http2 and HTTP2_AVAILABLE
+    ssl_context = httpx.create_ssl_context()
+    if http2:
+        ssl_context.set_alpn_protocols(["http/1.1", "h2"])
+    return PooledTransport(httpcore.AsyncConnectionPool(
+        ssl_context=ssl_context,
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive,
+        keepalive_expiry=config.keepalive_expiry,
+        http1=True,
+        http2=http2,
+        network_backend=_CachingDNSBackend(httpcore.AnyIOBackend(), dns_cache),
+    ))
+
+# ============== UPSTREAM CONFIG & METRICS ==============
+
+class UpstreamConfig:
+    """Connection, timeout and retry policy for one upstream API"""
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout: float = 10,
+        connect_timeout: float = 5,
+        max_connections: int = 10,
+        max_keepalive: int = 5,
+        keepalive_expiry: float = 120,
+        http2: bool = True,
+        retries: int = 1,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8,
+        retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.name = name
+        self.base_url = base_url
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.headers = headers or {}
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return delay * (0.5 + random.random() / 2)
+
+
+class UpstreamMetrics:
+    def __init__(self, window: int = 200):
+        self.requests = 0
+        self.new_connections = 0
+        self.retries = 0
+        self.errors = 0
+        self.status_counts: Dict[str, int] = {}
+        self.latencies_ms: deque = deque(maxlen=window)
+
+    def record_status(self, status_code: int) -> None:
+        bucket = f"{status_code // 100}xx"
+        self.status_counts[bucket] = self.status_counts.get(bucket, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+
+        def pct(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        reused = max(0, self.requests - self.new_connections)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            "retries": self.retries,
+            "errors": self.errors,
+            "status_counts": dict(self.status_counts),
+            "latency_ms": {
+                "avg": round(sum(latencies) / len(latencies), 1) if latencies else None,
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+            },
+        }
+
+# ============== REGISTRY ==============
+
+class UpstreamClientRegistry:
+    """Lazily creates one long-lived AsyncClient per registered upstream.
+
+    Created at import time, closed from the application lifespan via ``aclose``.
+    """
+
+    def __init__(self, dns_ttl: float = 300):
+        self.dns_cache = DNSCache(dns_ttl)
+        self._configs: Dict[str, UpstreamConfig] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._metrics: Dict[str, UpstreamMetrics] = {}
+
+    def register(self, config: UpstreamConfig) -> None:
+        self._configs[config.name] = config
+        self._metrics.setdefault(config.name, UpstreamMetrics())
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            config = self._configs[name]
+            metrics = self._metrics[name]
+
+            async def trace(event: str, info: dict):
+                if event == "connection.connect_tcp.complete":
+                    metrics.new_connections += 1
+
+            async def on_request(request: httpx.Request):
+                request.extensions["trace"] = trace
+                request.extensions["started_at"] = time.perf_counter()
+
+            async def on_response(response: httpx.Response):
+                started = response.request.extensions.get("started_at")
+                metrics.requests += 1
+                metrics.record_status(response.status_code)
+                if started is not None:
+                    metrics.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+            client = httpx.AsyncClient(
+                base_url=config.base_url,
+                headers=config.headers,
+                timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+                transport=_build_transport(config, self.dns_cache),
+                event_hooks={"request": [on_request], "response": [on_response]},
+            )
+            self._clients[name] = client
+        return client
+
+    async def request(self, name: str, method: str, url: str, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """Send a request with the upstream's retry/backoff policy.
+
+        Retries transport errors and ``retry_statuses``; the last response (or
+        error) is returned/raised unchanged so callers keep their status handling.
+        """
+        config = self._configs[name]
+        metrics = self._metrics[name]
+        attempts = (config.retries if retries is None else retries) + 1
+        client = self.client(name)
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                metrics.errors += 1
+                if last_attempt:
+                    raise
+                delay = config.backoff(attempt)
+                logger.warning(f"Upstream {name} {type(e).__name__}, retry in {delay:.1f}s")
+            else:
+                if response.status_code not in config.retry_statuses or last_attempt:
+                    return response
+                delay = config.backoff(attempt, response.headers.get("Retry-After"))
+                logger.warning(f"Upstream {name} HTTP {response.status_code}, retry in {delay:.1f}s")
+            metrics.retries += 1
+            await asyncio.sleep(delay)
+        raise RuntimeError("unreachable")
+
+    async def get(self, name: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(name, "GET", url, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "http2_available": HTTP2_AVAILABLE,
+            "dns_cache": {"hits": self.dns_cache.hits, "misses": self.dns_cache.misses},
+            "upstreams": {name: m.snapshot() for name, m in self._metrics.items()},
+        }
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        logger.info("Outbound HTTP clients closed")
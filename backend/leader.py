@@ -0,0 +1,246 @@
+"""
+LEADER - Mongo lease based leader election
+Exactly one process per deployment runs the registered singleton tasks
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger("api")
+
+Hook = Callable[[], Union[None, Awaitable[None]]]
+
+# ============== LEADER ELECTION ==============
+
+class LeaderElection:
+    """Elects one leader among all processes sharing a Mongo collection.
+
+    The leader holds the lease document ``{"id": name, "holder", "expires_at"}``
+    and renews it every ``renew_interval`` seconds; the other processes retry at
+    the same pace and take over once the lease expires (at most ``ttl`` after the
+    leader died, right away after a clean ``stop``). A leader that cannot renew
+    steps down on its own once its lease would have expired.
+
+    Singletons registered with ``register`` are started when this process
+    becomes leader and stopped when it loses the lease.
+    """
+
+    def __init__(self, name: str, holder_id: str, ttl: float = 15, renew_interval: float = 5):
+        self.name = name
+        self.holder_id = holder_id
+        self.ttl = ttl
+        self.renew_interval = renew_interval
+        self.collection = None
+        self.is_running = False
+        self.task = None
+        self.is_leader = False
+        self.leader: Optional[str] = None
+        self.term: Optional[int] = None
+        self.elected_at: Optional[str] = None
+        self.transitions = 0
+        self._lease_deadline = 0.0
+        self._singletons: List[tuple] = []
+        self._background: set = set()
+
+    def register(self, name: str, start: Hook, stop: Optional[Hook] = None) -> None:
+        """Run ``start`` whenever this process becomes leader and ``stop`` when it steps down"""
+        self._singletons.append((name, start, stop))
+
+    async def start(self, collection) -> None:
+        if self.is_running:
+            return
+        self.collection = collection
+        self.is_running = True
+        # The unique id turns a competing upsert into DuplicateKeyError instead of a second lease
+        await collection.create_index("id", unique=True)
+        await self._campaign()
+        self.task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        """Stop campaigning and hand the lease over immediately"""
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        if self.is_leader:
+            await self._step_down()
+            try:
+                await self.collection.update_one(
+                    {"id": self.name, "holder": self.holder_id},
+                    {"$set": {"expires_at": datetime.now(timezone.utc)}},
+                )
+            except Exception as e:
+                logger.warning(f"Leader {self.name}: resign failed: {e}")
+
+    async def _run_loop(self):
+        while self.is_running:
+            try:
+                await asyncio.sleep(self.renew_interval)
+                await self._campaign()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Leader {self.name} election error: {e}")
+                if self.is_leader and time.monotonic() >= self._lease_deadline:
+                    # Someone else may hold the lease by now
+                    await self._step_down()
+
+    async def _campaign(self):
+        now = datetime.now(timezone.utc)
+        try:
+            lease = await self.collection.find_one_and_update(
+                {"id": self.name, "$or": [{"holder": self.holder_id}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"holder": self.holder_id, "expires_at": now + timedelta(seconds=self.ttl), "renewed_at": now}},
+                upsert=True, projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            lease = None  # lost the upsert race for a new lease document
+        if lease:
+            self._lease_deadline = time.monotonic() + self.ttl
+            self.leader = self.holder_id
+            if not self.is_leader:
+                lease = await self.collection.find_one_and_update(
+                    {"id": self.name, "holder": self.holder_id},
+                    {"$set": {"elected_at": now}, "$inc": {"term": 1}},
+                    projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+                )
+                self.term = lease["term"] if lease else None
+                await self._become_leader()
+            return
+        current = await self.collection.find_one({"id": self.name, "expires_at": {"$gte": now}}, {"_id": 0})
+        self.leader = current["holder"] if current else None
+        self.term = current.get("term") if current else None
+        if self.is_leader:
+            await self._step_down()
+
+    async def _become_leader(self):
+        self.is_leader = True
+        self.elected_at = datetime.now(timezone.utc).isoformat()
+        self.transitions += 1
+        logger.info(f"Leader {self.name}: {self.holder_id} elected (term {self.term})")
+        for name, start, _ in self._singletons:
+            # Own task per singleton, so a slow one (index builds) never delays lease renewal
+            task = asyncio.create_task(self._call(name, "start", start))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _step_down(self):
+        self.is_leader = False
+        self.elected_at = None
+        self.transitions += 1
+        logger.warning(f"Leader {self.name}: {self.holder_id} stepped down")
+        for name, _, stop in reversed(self._singletons):
+            if stop:
+                await self._call(name, "stop", stop)
+
+    @staticmethod
+    async def _call(name: str, action: str, hook: Hook):
+        try:
+            result = hook()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"Singleton {name} {action} failed: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "process": self.holder_id,
+            "is_leader": self.is_leader,
+            "leader": self.leader,
+            "term": self.term,
+            "elected_at": self.elected_at,
+            "ttl_seconds": self.ttl,
+            "renew_interval_seconds": self.renew_interval,
+            "transitions": self.transitions,
+            "singletons": [name for name, _, _ in self._singletons],
+        }
+
+
+# ============== RUN REQUESTS ==============
+
+class RunRequest:
+    """Cross-process "run now" flag for a leader singleton.
+
+    Any process may ``request`` a run; only the leader's loop ``claim``s it,
+    runs the job and ``finish``es it, so ad-hoc triggers are serialized with the
+    scheduled runs no matter which worker served the HTTP call. The document
+    ``{"id": name, "status", "requested_at", "worker", "last_result", ...}``
+    also carries the latest run outcome for every worker to report.
+    A claim whose holder died is taken over after ``stale_after`` seconds.
+    """
+
+    ACTIVE = ("requested", "running")
+
+    def __init__(self, name: str, stale_after: float = 900):
+        self.name = name
+        self.stale_after = stale_after
+        self.collection = None
+
+    async def bind(self, collection) -> None:
+        self.collection = collection
+        # One document per name, so a second concurrent request upsert fails instead of duplicating
+        await collection.create_index("id", unique=True)
+
+    def _stale(self, now: datetime) -> Dict[str, Any]:
+        return {"status": "running", "claimed_at": {"$lt": now - timedelta(seconds=self.stale_after)}}
+
+    async def request(self) -> bool:
+        """Flag a run; False when one is already requested or running"""
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.update_one(
+                {"id": self.name, "$or": [{"status": {"$nin": list(self.ACTIVE)}}, self._stale(now)]},
+                {"$set": {"status": "requested", "requested_at": now, "worker": None}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False  # an active request exists (the upsert collided with its document)
+        return True
+
+    async def claim(self, holder_id: str) -> bool:
+        now = datetime.now(timezone.utc)
+        doc = await self.collection.find_one_and_update(
+            {"id": self.name, "$or": [{"status": "requested"}, self._stale(now)]},
+            {"$set": {"status": "running", "worker": holder_id, "claimed_at": now}},
+            projection={"_id": 1},
+        )
+        return doc is not None
+
+    async def release(self, holder_id: str) -> None:
+        """Hand a claimed request back (shutdown) for the next leader"""
+        await self.collection.update_one(
+            {"id": self.name, "status": "running", "worker": holder_id},
+            {"$set": {"status": "requested", "worker": None}},
+        )
+
+    async def finish(self, holder_id: str, result: Optional[Dict[str, Any]], error: Optional[str]) -> None:
+        """Record a run's outcome; completes the request if ``holder_id`` claimed it"""
+        now = datetime.now(timezone.utc)
+        outcome = {"last_run": now, "last_result": result, "last_error": error}
+        done = await self.collection.update_one(
+            {"id": self.name, "status": "running", "worker": holder_id},
+            {"$set": {**outcome, "status": "failed" if error else "done", "finished_at": now}},
+        )
+        if not done.matched_count:
+            await self.collection.update_one({"id": self.name}, {"$set": outcome}, upsert=True)
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"id": self.name}, {"_id": 0})
+
+    async def wait(self, timeout: float, poll: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Poll until the request is no longer active; returns the document, or None on timeout"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            doc = await self.get()
+            if doc and doc.get("status") not in self.ACTIVE:
+                return doc
+            await asyncio.sleep(poll)
+        return None
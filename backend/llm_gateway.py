@@ -0,0 +1,558 @@
+"""
+LLM GATEWAY - Shared entry point for every LLM call
+Adaptive (AIMD) concurrency per provider, priority classes, per-model circuit breakers,
+hedged requests, error classification and metrics
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+logger = logging.getLogger("api")
+
+# ============== ERROR CLASSIFICATION ==============
+
+_RATE_LIMIT_MARKERS = ("429", "rate limit", "rate_limit", "too many requests", "quota")
+_SERVER_MARKERS = ("500", "502", "503", "504", "529", "overloaded", "internal server error", "bad gateway", "service unavailable")
+_TIMEOUT_MARKERS = ("timeout", "timed out")
+
+
+def classify_error(error: BaseException) -> str:
+    """``rate_limit``, ``server``, ``timeout``, ``circuit_open`` or ``other`` (the provider SDK only gives us messages)"""
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status == 429:
+        return "rate_limit"
+    if isinstance(status, int) and status >= 500:
+        return "server"
+    text = f"{type(error).__name__} {error}".lower()
+    if any(marker in text for marker in _RATE_LIMIT_MARKERS):
+        return "rate_limit"
+    if any(marker in text for marker in _TIMEOUT_MARKERS):
+        return "timeout"
+    if any(marker in text for marker in _SERVER_MARKERS):
+        return "server"
+    return "other"
+
+
+OVERLOAD_ERRORS = ("rate_limit", "server", "timeout")
+
+
+def _percentile(values, p: float) -> Optional[float]:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else None
+
+
+def _consume(task: asyncio.Task) -> None:
+    # Losing hedge calls have no awaiter; retrieve the exception so it is not logged as lost
+    if not task.cancelled():
+        task.exception()
+
+# ============== CIRCUIT BREAKER ==============
+
+class CircuitOpenError(Exception):
+    """The model's breaker is open; the call was not sent"""
+
+
+class CircuitBreaker:
+    """Per-model breaker shared by every caller in the process.
+
+    - closed: calls pass; once at least ``min_calls`` calls finished in the last
+      ``window`` seconds and ``threshold`` of them failed with an overload error, it opens
+    - open: calls are rejected right away for ``cooldown`` seconds
+    - half_open: one probe call at a time; success closes the breaker, failure
+      reopens it with the cooldown doubled (up to ``max_cooldown``)
+    """
+
+    def __init__(self, name: str, window: float = 60, min_calls: int = 5, threshold: float = 0.5,
+                 cooldown: float = 30, max_cooldown: float = 300):
+        self.name = name
+        self.window = window
+        self.min_calls = int(min_calls)
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.opens = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+        self._results: deque = deque(maxlen=200)  # (time.monotonic(), failed)
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _recent(self) -> list:
+        cutoff = time.monotonic() - self.window
+        while self._results and self._results[0][0] < cutoff:
+            self._results.popleft()
+        return [failed for _, failed in self._results]
+
+    @property
+    def available(self) -> bool:
+        """Whether ``allow`` could let a call through now (without taking the probe)"""
+        if self.state == "open":
+            return time.monotonic() - self._opened_at >= self.cooldown
+        return not (self.state == "half_open" and self._probing)
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+            self.state = "half_open"
+            logger.info(f"LLM breaker {self.name} half-open, probing")
+        if self.state == "open" or (self.state == "half_open" and self._probing):
+            self.rejected += 1
+            return False
+        if self.state == "half_open":
+            self._probing = True
+        return True
+
+    def abandon(self):
+        """An allowed call never got an answer (cancelled / dropped): free the probe"""
+        self._probing = False
+
+    def record(self, outcome: str):
+        if outcome not in OVERLOAD_ERRORS and outcome not in ("ok", "other"):
+            self.abandon()
+            return
+        failed = outcome in OVERLOAD_ERRORS
+        if failed:
+            self.last_error = outcome
+        if self.state == "half_open":
+            self._probing = False
+            if failed:
+                self._open(min(self.max_cooldown, self.cooldown * 2))
+            else:
+                self.state = "closed"
+                self.cooldown = self.base_cooldown
+                self._results.clear()
+                logger.info(f"LLM breaker {self.name} closed")
+            return
+        if self.state == "open":
+            return  # answer to a call sent before the breaker opened
+        self._results.append((time.monotonic(), failed))
+        recent = self._recent()
+        if len(recent) >= self.min_calls and sum(recent) / len(recent) >= self.threshold:
+            self._open(self.base_cooldown)
+
+    def _open(self, cooldown: float):
+        self.state = "open"
+        self.cooldown = cooldown
+        self._opened_at = time.monotonic()
+        self.opens += 1
+        logger.warning(f"LLM breaker {self.name} open for {cooldown:.0f}s ({self.last_error})")
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = self._recent()
+        return {
+            "state": self.state,
+            "error_rate": round(sum(recent) / len(recent), 2) if recent else 0.0,
+            "recent_calls": len(recent),
+            "cooldown_seconds": self.cooldown,
+            "retry_in_seconds": round(max(0.0, self.cooldown - (time.monotonic() - self._opened_at)), 1) if self.state == "open" else 0.0,
+            "opens": self.opens,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
+
+# ============== PRIORITIES ==============
+
+# Highest first: admin tools someone is waiting on, public page enrichment, bulk/background jobs
+PRIORITIES = ("interactive", "public", "background")
+
+
+class LLMDeadlineExceeded(Exception):
+    """The call was dropped before reaching the provider: its answer could no longer arrive in time"""
+
+
+class _Waiter:
+    __slots__ = ("priority", "future", "deadline", "expected", "enqueued")
+
+    def __init__(self, priority: str, future: asyncio.Future, deadline: Optional[float], expected: float):
+        self.priority = priority
+        self.future = future
+        self.deadline = deadline
+        self.expected = expected
+        self.enqueued = time.monotonic()
+
+# ============== AIMD LIMITER ==============
+
+class AIMDLimiter:
+    """Adaptive concurrency limit for one provider (additive increase, multiplicative decrease).
+
+    - a healthy call made while the limit was saturated raises it by ``1/limit``,
+      i.e. by one per full window of successes, up to ``max_limit``
+    - a call slower than ``slow_factor`` x its typical latency holds the limit
+    - a rate-limit / 5xx / timeout error multiplies it by ``backoff``; errors from calls
+      started before the last cut are ignored, so one burst counts as one signal
+
+    Free slots go to waiters in ``PRIORITIES`` order (FIFO within a class). A class
+    never holds more than its ``shares`` fraction of the limit, so lower classes
+    always leave room for higher ones. A call that finds a free slot is always sent;
+    one that had to queue is dropped once its deadline can no longer be met (now + the
+    typical latency of that model *for that class*, since an interactive article prompt
+    and a short public prompt on the same model take very different times).
+    """
+
+    def __init__(self, name: str, initial: int = 4, min_limit: int = 1, max_limit: int = 16,
+                 backoff: float = 0.5, slow_factor: float = 2.0, shares: Optional[Dict[str, float]] = None):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.slow_factor = slow_factor
+        self.shares = {priority: 1.0 for priority in PRIORITIES}
+        self.shares.update(shares or {})
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.outcomes: Dict[str, int] = {}
+        self.active = {priority: 0 for priority in PRIORITIES}
+        self.admitted = {priority: 0 for priority in PRIORITIES}
+        self.dropped = {priority: 0 for priority in PRIORITIES}
+        self.queue_waits = {priority: deque(maxlen=200) for priority in PRIORITIES}
+        self._baseline: Dict[Tuple[str, str], float] = {}  # (model, priority) -> EWMA of healthy latency
+        self._last_decrease = float("-inf")
+        self._queue: list = []  # heap of (rank, seq, _Waiter)
+        self._seq = itertools.count()
+
+    @property
+    def capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    @property
+    def waiting(self) -> int:
+        return len(self._queue)
+
+    def share_limit(self, priority: str) -> int:
+        """Slots ``priority`` may hold at the current limit"""
+        return max(1, int(self.capacity * self.shares[priority]))
+
+    def typical_latency(self, model: Optional[str], priority: str = "background") -> float:
+        return self._baseline.get((model, priority), 0.0) if model else 0.0
+
+    async def acquire(self, priority: str = "background", deadline: Optional[float] = None, model: Optional[str] = None) -> bool:
+        """Wait for a slot; returns whether the limit was saturated (only those calls may grow it).
+
+        ``deadline`` is the ``time.monotonic()`` by which the caller needs the answer;
+        raises ``LLMDeadlineExceeded`` once waiting longer could not meet it.
+        """
+        if not self._queue and self.in_flight < self.capacity and self.active[priority] < self.share_limit(priority):
+            return self._admit(priority, 0.0)  # free slot: never dropped, so latencies keep being learned
+        waiter = _Waiter(priority, asyncio.get_running_loop().create_future(), deadline, self.typical_latency(model, priority))
+        entry = (PRIORITIES.index(priority), next(self._seq), waiter)
+        heapq.heappush(self._queue, entry)
+        self._dispatch()
+        timeout = None if deadline is None else max(0.0, deadline - waiter.expected - time.monotonic())
+        try:
+            return await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            self._discard(entry)
+            self.dropped[priority] += 1
+            raise LLMDeadlineExceeded(f"LLM {self.name}: {priority} call dropped after {time.monotonic() - waiter.enqueued:.1f}s in queue") from None
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                self._free(priority)  # granted just as the caller went away
+            else:
+                self._discard(entry)
+            raise
+
+    def _discard(self, entry: tuple):
+        try:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+        except ValueError:
+            pass  # already popped by _dispatch
+
+    def _dispatch(self):
+        """Hand free slots to waiters, highest priority first"""
+        now = time.monotonic()
+        blocked = []
+        while self._queue and self.in_flight < self.capacity:
+            entry = heapq.heappop(self._queue)
+            waiter = entry[2]
+            if waiter.future.done():
+                continue
+            if waiter.deadline is not None and now + waiter.expected > waiter.deadline:
+                self.dropped[waiter.priority] += 1
+                waiter.future.set_exception(LLMDeadlineExceeded(
+                    f"LLM {self.name}: {waiter.priority} call dropped, deadline cannot be met"
+                ))
+                continue
+            if self.active[waiter.priority] >= self.share_limit(waiter.priority):
+                blocked.append(entry)  # class is at its share; lower classes may still fit
+                continue
+            waiter.future.set_result(self._admit(waiter.priority, now - waiter.enqueued) or bool(blocked))
+        for entry in blocked:
+            heapq.heappush(self._queue, entry)
+
+    def _admit(self, priority: str, waited: float) -> bool:
+        """Take a slot for ``priority``; returns whether the limit is now saturated"""
+        self.in_flight += 1
+        self.active[priority] += 1
+        self.admitted[priority] += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.queue_waits[priority].append(waited)
+        return self.in_flight >= self.capacity or bool(self._queue)
+
+    def _free(self, priority: str):
+        self.in_flight -= 1
+        self.active[priority] -= 1
+        self._dispatch()
+
+    def release(self, outcome: str, started: float, model: str, saturated: bool = True, priority: str = "background"):
+        """Record a finished call; ``started`` is its ``time.monotonic()`` start"""
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        latency = time.monotonic() - started
+        if started < self._last_decrease:
+            pass  # sent under the previous limit, its signal is already accounted for
+        elif outcome in OVERLOAD_ERRORS:
+            self._decrease(outcome)
+        elif outcome == "ok":
+            key = (model, priority)
+            baseline = self._baseline.get(key)
+            slow = baseline is not None and latency > baseline * self.slow_factor
+            # EWMA of healthy latency per model and class; slow calls do not move the baseline much
+            self._baseline[key] = latency if baseline is None else baseline * 0.9 + min(latency, baseline * self.slow_factor) * 0.1
+            if saturated and not slow and self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self.increases += 1
+        self._free(priority)
+
+    def _decrease(self, reason: str):
+        self._last_decrease = time.monotonic()
+        before = self.capacity
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        self.decreases += 1
+        logger.warning(f"LLM {self.name} concurrency {before} -> {self.capacity} ({reason})")
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        queued = {priority: 0 for priority in PRIORITIES}
+        oldest = {priority: 0.0 for priority in PRIORITIES}
+        for _, _, waiter in self._queue:
+            queued[waiter.priority] += 1
+            oldest[waiter.priority] = max(oldest[waiter.priority], now - waiter.enqueued)
+
+        return {
+            "limit": self.capacity,
+            "limit_exact": round(self.limit, 2),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_in_flight": self.peak_in_flight,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "outcomes": dict(self.outcomes),
+            "typical_latency_seconds": {f"{model}/{priority}": round(v, 2) for (model, priority), v in self._baseline.items()},
+            "classes": {
+                priority: {
+                    "share": self.shares[priority],
+                    "max_slots": self.share_limit(priority),
+                    "in_flight": self.active[priority],
+                    "queued": queued[priority],
+                    "oldest_wait_seconds": round(oldest[priority], 2),
+                    "queue_wait_p95_seconds": round(_percentile(self.queue_waits[priority], 0.95) or 0.0, 2),
+                    "admitted": self.admitted[priority],
+                    "dropped": self.dropped[priority],
+                }
+                for priority in PRIORITIES
+            },
+        }
+
+# ============== GATEWAY ==============
+
+class LLMGateway:
+    """Runs chat completions through a per-provider ``AIMDLimiter``.
+
+    Every LLM caller goes through ``complete``, so the limiter sees the real
+    load on each provider and its error / latency signals, and orders callers
+    by ``priority``. ``deadlines`` gives each class a default time budget
+    (seconds, None = no deadline). Each provider/model also has a
+    ``CircuitBreaker`` (options in ``breaker``); an open one fails calls with
+    ``CircuitOpenError`` before they queue.
+
+    ``complete_hedged`` races a fallback model once the primary is slower than
+    its ``hedge_percentile`` latency for the call's priority class, so slow
+    background calls never delay interactive hedges; ``hedge_budget`` is the
+    fraction of hedgeable calls that may actually be hedged (None percentile = off).
+    """
+
+    HEDGE_MIN_SAMPLES = 20  # latencies needed before the percentile is trusted
+    HEDGE_BURST = 10  # unused hedge budget that may accumulate
+
+    def __init__(self, api_key: str, initial_concurrency: int = 4, max_concurrency: int = 16, call_timeout: float = 180,
+                 shares: Optional[Dict[str, float]] = None, deadlines: Optional[Dict[str, Optional[float]]] = None,
+                 breaker: Optional[Dict[str, float]] = None, hedge_percentile: Optional[float] = None,
+                 hedge_budget: float = 0.1):
+        self.api_key = api_key
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.call_timeout = call_timeout
+        self.shares = shares or {}
+        self.deadlines = deadlines or {}
+        self.breaker_options = breaker or {}
+        self.limiters: Dict[str, AIMDLimiter] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.latencies: Dict[str, deque] = {}  # "provider/model/priority" -> healthy call durations
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self.hedge_tokens = 0.0
+        self.hedge_eligible = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def deadline_for(self, priority: str) -> Optional[float]:
+        """Absolute deadline for a call of ``priority`` starting now (None = no deadline)"""
+        budget = self.deadlines.get(priority)
+        return None if budget is None else time.monotonic() + budget
+
+    def limiter(self, provider: str) -> AIMDLimiter:
+        limiter = self.limiters.get(provider)
+        if limiter is None:
+            limiter = self.limiters[provider] = AIMDLimiter(
+                provider, initial=self.initial_concurrency, max_limit=self.max_concurrency, shares=self.shares,
+            )
+        return limiter
+
+    def breaker(self, provider: str, model: str) -> CircuitBreaker:
+        key = f"{provider}/{model}"
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = self.breakers[key] = CircuitBreaker(key, **self.breaker_options)
+        return breaker
+
+    def available(self, provider: str, model: str) -> bool:
+        return self.breaker(provider, model).available
+
+    async def complete(self, prompt: str, system_message: str, provider: str, model: str,
+                       session_id: Optional[str] = None, timeout: Optional[float] = None,
+                       priority: str = "background", deadline: Optional[float] = None) -> str:
+        """``deadline`` is an absolute ``time.monotonic()``; defaults to the class budget from now"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown LLM priority: {priority}")
+        if deadline is None:
+            deadline = self.deadline_for(priority)
+        breaker = self.breaker(provider, model)
+        if not breaker.allow():
+            raise CircuitOpenError(f"LLM {provider}/{model} circuit open")
+        limiter = self.limiter(provider)
+        try:
+            saturated = await limiter.acquire(priority, deadline, model)
+        except BaseException:
+            breaker.abandon()
+            raise
+        started = time.monotonic()
+        outcome = "ok"
+        timeout = timeout or self.call_timeout
+        if deadline is not None:
+            timeout = max(1.0, min(timeout, deadline - started))
+        try:
+            chat = LlmChat(
+                api_key=self.api_key,
+                session_id=session_id or str(uuid.uuid4()),
+                system_message=system_message,
+            ).with_model(provider, model)
+            return await asyncio.wait_for(chat.send_message(UserMessage(text=prompt)), timeout)
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            outcome = classify_error(e)
+            raise
+        finally:
+            if outcome == "ok":
+                self.latencies.setdefault(f"{provider}/{model}/{priority}", deque(maxlen=200)).append(time.monotonic() - started)
+            limiter.release(outcome, started, model, saturated, priority)
+            breaker.record(outcome)
+
+    def hedge_delay(self, provider: str, model: str, priority: str = "interactive") -> Optional[float]:
+        """Seconds to wait on ``model`` before hedging a ``priority`` call, None while hedging is off or unmeasured"""
+        samples = self.latencies.get(f"{provider}/{model}/{priority}")
+        if not self.hedge_percentile or not samples or len(samples) < self.HEDGE_MIN_SAMPLES:
+            return None
+        return _percentile(samples, self.hedge_percentile)
+
+    async def complete_hedged(self, prompt: str, system_message: str, primary: Tuple[str, str], fallback: Tuple[str, str],
+                              session_id: Optional[str] = None, priority: str = "interactive",
+                              deadline: Optional[float] = None) -> str:
+        """``complete`` on ``primary``, racing ``fallback`` if primary is still running after ``hedge_delay``.
+
+        The first answer wins and the other call is cancelled; if both fail the first
+        error is raised. An open primary breaker goes straight to ``fallback``.
+        """
+        if deadline is None:
+            deadline = self.deadline_for(priority)
+
+        def call(target: Tuple[str, str]) -> asyncio.Task:
+            task = asyncio.ensure_future(self.complete(
+                prompt, system_message, *target, session_id=session_id, priority=priority, deadline=deadline,
+            ))
+            task.add_done_callback(_consume)
+            return task
+
+        if not self.available(*primary):
+            return await self.complete(prompt, system_message, *fallback, session_id=session_id, priority=priority, deadline=deadline)
+        self.hedge_eligible += 1
+        self.hedge_tokens = min(self.HEDGE_BURST, self.hedge_tokens + self.hedge_budget)
+        tasks = [call(primary)]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(*primary, priority))
+            if not done and self.hedge_tokens >= 1 and self.available(*fallback):
+                self.hedge_tokens -= 1
+                self.hedged += 1
+                tasks.append(call(fallback))
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        def pct(values, p):
+            value = _percentile(values, p)
+            return round(value, 2) if value is not None else None
+
+        return {
+            "call_timeout_seconds": self.call_timeout,
+            "priorities": list(PRIORITIES),
+            "deadline_seconds": {priority: self.deadlines.get(priority) for priority in PRIORITIES},
+            "providers": {name: limiter.snapshot() for name, limiter in self.limiters.items()},
+            "breakers": {name: breaker.snapshot() for name, breaker in self.breakers.items()},
+            "hedging": {
+                "enabled": bool(self.hedge_percentile),
+                "percentile": self.hedge_percentile,
+                "budget": self.hedge_budget,
+                "tokens": round(self.hedge_tokens, 2),
+                "eligible": self.hedge_eligible,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "delay_seconds": {
+                    key: pct(values, self.hedge_percentile)
+                    for key, values in self.latencies.items() if self.hedge_percentile and len(values) >= self.HEDGE_MIN_SAMPLES
+                },
+            },
+            "latency_seconds": {
+                key: {"p50": pct(values, 0.5), "p95": pct(values, 0.95), "samples": len(values)}
+                for key, values in self.latencies.items()
+            },
+        }
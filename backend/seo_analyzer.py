@@ -0,0 +1,379 @@
+"""
+SEO ANALYZER - Deterministic content scoring without an LLM
+Keyword density/placement, heading outline, tables/lists, paragraph and sentence
+length, Turkish readability (Ateşman), meta lengths and the article prompt rules
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+
+# ============== TEXT ==============
+
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?…])\s+")
+_VOWELS = frozenset("aeıioöuüâîû")
+
+
+def turkish_lower(text: str) -> str:
+    """``str.lower`` maps I to i and İ to i + combining dot; Turkish wants ı and i"""
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def words(text: str) -> List[str]:
+    return _WORD_RE.findall(turkish_lower(text))
+
+
+def sentences(text: str) -> List[str]:
+    return [s for s in _SENTENCE_SPLIT_RE.split(text.strip()) if _WORD_RE.search(s)]
+
+
+def syllables(word: str) -> int:
+    # One vowel per syllable in Turkish
+    return max(1, sum(ch in _VOWELS for ch in word))
+
+
+def keyword_hits(tokens: List[str], keyword: List[str]) -> int:
+    """Occurrences of the keyword phrase; a word matches a keyword word it starts with (Turkish suffixes)"""
+    n = len(keyword)
+    if not n:
+        return 0
+    hits = i = 0
+    while i <= len(tokens) - n:
+        if all(tokens[i + j].startswith(keyword[j]) for j in range(n)):
+            hits += 1
+            i += n
+        else:
+            i += 1
+    return hits
+
+# ============== HTML ==============
+
+_HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+_COUNTED = _HEADINGS + ("p", "table", "ul", "ol", "li", "strong", "em", "blockquote", "a", "img")
+# Block-level tags whose start (or, for containers, end) implicitly closes an open <p>
+_CLOSES_P = frozenset(_HEADINGS + (
+    "address", "article", "aside", "blockquote", "details", "div", "dl", "fieldset", "figcaption", "figure",
+    "footer", "form", "header", "hr", "main", "nav", "ol", "p", "pre", "section", "table", "ul",
+    "body", "html", "li", "td", "th",
+))
+
+
+class _Document(HTMLParser):
+    """Collects tag counts, the heading outline, paragraphs and the paragraphs under each h2"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags: Dict[str, int] = {tag: 0 for tag in _COUNTED}
+        self.headings: List[tuple] = []  # (level, text)
+        self.paragraphs: List[str] = []
+        self.sections: List[int] = []  # paragraph count per h2 section
+        self.text: List[str] = []
+        self._capture: Optional[tuple] = None  # (tag, parts)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.tags:
+            self.tags[tag] += 1
+        if tag in _CLOSES_P and self._capture and self._capture[0] == "p":
+            self._finish()  # LLM HTML often leaves <p> open before the next block
+        if tag in _HEADINGS or tag == "p":
+            self._capture = (tag, [])
+        self.text.append(" ")
+
+    def handle_endtag(self, tag):
+        self.text.append(" ")
+        if not self._capture:
+            return
+        if self._capture[0] == tag or (self._capture[0] == "p" and tag in _CLOSES_P):
+            self._finish()
+
+    def close(self):
+        super().close()
+        if self._capture and self._capture[0] == "p":
+            self._finish()
+
+    def _finish(self):
+        tag, parts = self._capture
+        text = " ".join("".join(parts).split())
+        self._capture = None
+        if not text:
+            return
+        if tag == "p":
+            self.paragraphs.append(text)
+            if self.sections:
+                self.sections[-1] += 1
+        else:
+            self.headings.append((int(tag[1]), text))
+            if tag == "h2":
+                self.sections.append(0)
+
+    def handle_data(self, data):
+        self.text.append(data)
+        if self._capture:
+            self._capture[1].append(data)
+
+
+def parse(content: str) -> _Document:
+    doc = _Document()
+    doc.feed(content or "")
+    doc.close()
+    if not doc.paragraphs and not doc.headings:
+        # Plain text: blank lines separate paragraphs
+        doc.paragraphs = [" ".join(block.split()) for block in re.split(r"\n\s*\n", content or "") if block.strip()]
+    return doc
+
+# ============== READABILITY ==============
+
+def atesman(text: str) -> Optional[float]:
+    """Ateşman readability for Turkish: 100 = very easy, 0 = very hard"""
+    tokens = words(text)
+    sentence_count = len(sentences(text))
+    if not tokens or not sentence_count:
+        return None
+    score = 198.825 - 40.175 * (sum(syllables(w) for w in tokens) / len(tokens)) - 2.610 * (len(tokens) / sentence_count)
+    return round(max(0.0, min(100.0, score)), 1)
+
+
+def readability_level(score: Optional[float]) -> str:
+    if score is None:
+        return "bilinmiyor"
+    if score >= 90:
+        return "çok kolay"
+    if score >= 70:
+        return "kolay"
+    if score >= 50:
+        return "orta güçlükte"
+    if score >= 30:
+        return "zor"
+    return "çok zor"
+
+# ============== RULES ==============
+
+# Measurable rules from ContentScheduler._build_article_prompt ("ZORUNLU KURALLAR"); keep in sync.
+# Tone, freshness and the CTA are left to the optional LLM advice.
+MIN_WORDS = 2000
+MIN_H2 = 5
+MIN_PARAGRAPHS_PER_H2 = 3
+MIN_TABLES = 2
+MIN_LISTS = 3
+MIN_KEYWORD_H2 = 2
+KEYWORD_DENSITY_RANGE = (1.0, 2.0)  # percent
+MAX_PARAGRAPH_SENTENCES = 4
+SHORT_PARAGRAPH_SHARE = 0.9  # share of paragraphs that must stay within MAX_PARAGRAPH_SENTENCES
+META_TITLE_RANGE = (30, 60)
+META_DESCRIPTION_RANGE = (120, 160)
+LONG_SENTENCE_WORDS = 25
+
+
+def _rule(rule_id: str, label: str, passed: Optional[bool], actual: Any, expected: str, fix: str) -> Dict[str, Any]:
+    return {"id": rule_id, "rule": label, "passed": passed, "actual": actual, "expected": expected, "fix": fix}
+
+
+def check_rules(m: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Article prompt rules against the metrics from ``analyze``; keyword rules are skipped (None) without a keyword"""
+    kw = m["keyword"]
+    has_kw = bool(kw["keyword"])
+    low, high = KEYWORD_DENSITY_RANGE
+    return [
+        _rule("min_words", f"En az {MIN_WORDS} kelime", m["word_count"] >= MIN_WORDS, m["word_count"], f">= {MIN_WORDS}",
+              f"İçeriği en az {MIN_WORDS} kelimeye genişlet"),
+        _rule("html", "HTML formatında (h2, p etiketleri)", m["is_html"], m["is_html"], "true",
+              "İçeriği h2/p etiketleriyle HTML olarak yapılandır"),
+        _rule("h2_count", f"En az {MIN_H2} adet h2 başlık", m["headings"]["counts"]["h2"] >= MIN_H2,
+              m["headings"]["counts"]["h2"], f">= {MIN_H2}", f"En az {MIN_H2} h2 başlık kullan"),
+        _rule("paragraphs_per_h2", f"Her h2 altında en az {MIN_PARAGRAPHS_PER_H2} paragraf",
+              bool(m["sections"]) and min(m["sections"]) >= MIN_PARAGRAPHS_PER_H2,
+              min(m["sections"]) if m["sections"] else 0, f">= {MIN_PARAGRAPHS_PER_H2}",
+              f"Kısa kalan h2 bölümlerini en az {MIN_PARAGRAPHS_PER_H2} paragrafa tamamla"),
+        _rule("tables", f"En az {MIN_TABLES} tablo", m["tables"] >= MIN_TABLES, m["tables"], f">= {MIN_TABLES}",
+              "Karşılaştırma tablosu ekle"),
+        _rule("lists", f"En az {MIN_LISTS} sıralı/sırasız liste", m["lists"] >= MIN_LISTS, m["lists"], f">= {MIN_LISTS}",
+              "Madde listeleri ekle"),
+        _rule("keyword_first_paragraph", "Anahtar kelime ilk paragrafta", kw["in_first_paragraph"] if has_kw else None,
+              kw["in_first_paragraph"], "true", "Anahtar kelimeyi ilk paragrafta kullan"),
+        _rule("keyword_h2", f"Anahtar kelime en az {MIN_KEYWORD_H2} h2 başlıkta", kw["in_h2"] >= MIN_KEYWORD_H2 if has_kw else None,
+              kw["in_h2"], f">= {MIN_KEYWORD_H2}", f"Anahtar kelimeyi en az {MIN_KEYWORD_H2} h2 başlıkta geçir"),
+        _rule("keyword_last_paragraph", "Anahtar kelime son paragrafta", kw["in_last_paragraph"] if has_kw else None,
+              kw["in_last_paragraph"], "true", "Anahtar kelimeyi sonuç paragrafında kullan"),
+        _rule("keyword_density", f"Anahtar kelime yoğunluğu %{low:g}-{high:g}", low <= kw["density"] <= high if has_kw else None,
+              kw["density"], f"{low:g}-{high:g}",
+              "Anahtar kelimeyi daha sık kullan" if kw["density"] < low else "Keyword stuffing yapma, anahtar kelimeyi azalt"),
+        _rule("short_paragraphs", f"Paragraflar en fazla {MAX_PARAGRAPH_SENTENCES} cümle",
+              m["paragraphs"]["short_share"] >= SHORT_PARAGRAPH_SHARE, m["paragraphs"]["short_share"],
+              f">= {SHORT_PARAGRAPH_SHARE:g}", f"{MAX_PARAGRAPH_SENTENCES} cümleden uzun paragrafları böl"),
+    ]
+
+# ============== ANALYZE ==============
+
+def _meta_check(text: str, bounds: tuple) -> Dict[str, Any]:
+    length = len(text.strip())
+    low, high = bounds
+    return {"length": length, "ok": low <= length <= high, "recommended": f"{low}-{high}"}
+
+
+def _ratio_score(actual: float, target: float) -> float:
+    return min(actual / target, 1.0) * 100 if target else 100.0
+
+
+def _density_score(density: float) -> float:
+    low, high = KEYWORD_DENSITY_RANGE
+    if density < low:
+        return density / low * 100
+    if density > high:
+        return max(0.0, 100 - (density - high) * 50)
+    return 100.0
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def analyze(content: str, title: str = "", keyword: str = "", meta_title: str = "", meta_description: str = "") -> Dict[str, Any]:
+    """Score one article; the result keeps the shape of the former LLM score (overall_score, scores, ...)"""
+    doc = parse(content)
+    tokens = words("".join(doc.text) if doc.text else content)
+    word_count = len(tokens)
+    kw_tokens = words(keyword)
+
+    # Paragraphs and sentences
+    paragraph_sentences = [sentences(p) for p in doc.paragraphs]
+    sentence_words = [len(words(s)) for group in paragraph_sentences for s in group]
+    short_share = (
+        sum(len(group) <= MAX_PARAGRAPH_SENTENCES for group in paragraph_sentences) / len(paragraph_sentences)
+        if paragraph_sentences else 0.0
+    )
+    body = " ".join(doc.paragraphs) or content
+    readability = atesman(body)
+
+    # Headings
+    counts = {tag: doc.tags[tag] for tag in _HEADINGS}
+    issues = []
+    if counts["h1"] > 1:
+        issues.append(f"{counts['h1']} adet h1 var; sayfa başlığı tek h1 olmalı")
+    previous = 1  # the page title is the h1
+    for level, text in doc.headings:
+        if level > previous + 1:
+            issues.append(f"h{previous} sonrası h{level} ('{text[:40]}'): h{previous + 1} atlanıyor")
+        previous = level
+
+    # Keyword
+    hits = keyword_hits(tokens, kw_tokens)
+    h2_texts = [text for level, text in doc.headings if level == 2]
+    keyword_info = {
+        "keyword": keyword,
+        "occurrences": hits,
+        "density": round(hits * len(kw_tokens) / word_count * 100, 2) if word_count and kw_tokens else 0.0,
+        "in_title": keyword_hits(words(title), kw_tokens) > 0,
+        "in_first_paragraph": bool(doc.paragraphs) and keyword_hits(words(doc.paragraphs[0]), kw_tokens) > 0,
+        "in_last_paragraph": bool(doc.paragraphs) and keyword_hits(words(doc.paragraphs[-1]), kw_tokens) > 0,
+        "in_h2": sum(keyword_hits(words(text), kw_tokens) > 0 for text in h2_texts),
+        "in_meta_title": keyword_hits(words(meta_title), kw_tokens) > 0,
+        "in_meta_description": keyword_hits(words(meta_description), kw_tokens) > 0,
+    }
+
+    metrics: Dict[str, Any] = {
+        "word_count": word_count,
+        "is_html": counts["h2"] > 0 and doc.tags["p"] > 0,
+        "keyword": keyword_info,
+        "headings": {
+            "counts": counts,
+            "outline": [{"level": level, "text": text[:80]} for level, text in doc.headings],
+            "issues": issues,
+        },
+        "sections": doc.sections,
+        "tables": doc.tags["table"],
+        "lists": doc.tags["ul"] + doc.tags["ol"],
+        "list_items": doc.tags["li"],
+        "paragraphs": {
+            "count": len(doc.paragraphs),
+            "avg_words": round(_mean([len(words(p)) for p in doc.paragraphs]), 1),
+            "avg_sentences": round(_mean([len(group) for group in paragraph_sentences]), 1),
+            "max_sentences": max((len(group) for group in paragraph_sentences), default=0),
+            "short_share": round(short_share, 2),
+        },
+        "sentences": {
+            "count": len(sentence_words),
+            "avg_words": round(_mean(sentence_words), 1),
+            "long_share": round(sum(n > LONG_SENTENCE_WORDS for n in sentence_words) / len(sentence_words), 2) if sentence_words else 0.0,
+        },
+        "readability": {"atesman": readability, "level": readability_level(readability)},
+        "meta": {
+            "title": _meta_check(meta_title, META_TITLE_RANGE) if meta_title else {"length": 0, "ok": False, "recommended": "%d-%d" % META_TITLE_RANGE},
+            "description": _meta_check(meta_description, META_DESCRIPTION_RANGE) if meta_description else {"length": 0, "ok": False, "recommended": "%d-%d" % META_DESCRIPTION_RANGE},
+        },
+    }
+    rules = check_rules(metrics)
+
+    # Scores (0-100), same categories as the former LLM score
+    scores: Dict[str, Optional[int]] = {
+        "keyword_usage": round(_mean([
+            _density_score(keyword_info["density"]),
+            100.0 * keyword_info["in_title"],
+            100.0 * keyword_info["in_first_paragraph"],
+            100.0 * keyword_info["in_last_paragraph"],
+            _ratio_score(keyword_info["in_h2"], MIN_KEYWORD_H2),
+        ])) if kw_tokens else None,
+        "readability": round(0.7 * (readability or 0.0) + 30 * short_share),
+        "structure": round(_mean([
+            _ratio_score(counts["h2"], MIN_H2),
+            _ratio_score(min(doc.sections) if doc.sections else 0, MIN_PARAGRAPHS_PER_H2),
+            _ratio_score(metrics["tables"], MIN_TABLES),
+            _ratio_score(metrics["lists"], MIN_LISTS),
+            100.0 if not issues else 50.0,
+        ])),
+        "meta_quality": round(_mean([
+            100.0 if check["ok"] else (50.0 if check["length"] else 0.0) for check in metrics["meta"].values()
+        ])),
+        "content_depth": round(_ratio_score(word_count, MIN_WORDS)),
+    }
+    weights = {"keyword_usage": 0.25, "readability": 0.2, "structure": 0.25, "meta_quality": 0.1, "content_depth": 0.2}
+    scored = {name: weight for name, weight in weights.items() if scores[name] is not None}
+    overall = round(sum(scores[name] * weight for name, weight in scored.items()) / sum(scored.values()))
+
+    checked = [r for r in rules if r["passed"] is not None]
+    failed = [r for r in checked if not r["passed"]]
+    improvements = [r["fix"] for r in failed] + issues
+    for name, check in metrics["meta"].items():
+        if not check["ok"]:
+            label = "Meta başlık" if name == "title" else "Meta açıklama"
+            improvements.append(f"{label} {check['recommended']} karakter olmalı (şu an {check['length']})")
+
+    return {
+        **metrics,
+        "overall_score": overall,
+        "scores": scores,
+        "rules": rules,
+        "rules_passed": len(checked) - len(failed),
+        "rules_checked": len(checked),
+        "strengths": [r["rule"] for r in checked if r["passed"]],
+        "weaknesses": [f"{r['rule']} (şu an: {r['actual']})" for r in failed],
+        "improvements": improvements,
+        "keyword_density": keyword_info["density"],
+        "recommended_word_count": max(MIN_WORDS, word_count),
+        "summary": (
+            f"{word_count} kelime, {len(checked) - len(failed)}/{len(checked)} kural sağlandı, "
+            f"okunabilirlik {metrics['readability']['level']}."
+        ),
+    }
+
+
+def analyze_many(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Compact scores for a batch of article documents (runs in a worker process)"""
+    results = []
+    for doc in docs:
+        title = doc.get("title", "")
+        analysis = analyze(
+            doc.get("content", ""), title=title, keyword=doc.get("keyword", title),
+            meta_title=doc.get("seo_title", ""), meta_description=doc.get("seo_description", ""),
+        )
+        results.append({
+            "id": doc.get("id"),
+            "title": title,
+            "slug": doc.get("slug", ""),
+            "overall_score": analysis["overall_score"],
+            "scores": analysis["scores"],
+            "word_count": analysis["word_count"],
+            "keyword_density": analysis["keyword_density"],
+            "failed_rules": [r["id"] for r in analysis["rules"] if r["passed"] is False],
+        })
+    return results
@@ -4,12 +4,15 @@ Production-Ready Backend with Hardening
 Version: 3.0.0
 """
 
-from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Depends, status, BackgroundTasks
-from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Depends, status
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
-from contextlib import asynccontextmanager
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 import os
 import sys
 import logging
@@ -19,16 +22,23 @@ import uuid
 import hashlib
 import subprocess
 import asyncio
+import random
+import socket
+import multiprocessing
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Awaitable, Callable, Tuple
 from pydantic import BaseModel, Field, ConfigDict
-from collections import defaultdict
-import httpx
+from collections import defaultdict, deque
 import re
 from passlib.context import CryptContext
 import jwt as pyjwt
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+from ttl_cache import AsyncTTLCache, cached, cache_stats
+from http_clients import UpstreamClientRegistry, UpstreamConfig
+from sse import SSE_HEADERS, SnapshotBroadcaster, stream_result
+from leader import LeaderElection, RunRequest
+from seo_analyzer import analyze as analyze_seo_content, analyze_many as analyze_seo_batch
+from llm_gateway import CircuitOpenError, LLMGateway, LLMDeadlineExceeded, OVERLOAD_ERRORS, classify_error
 
 # ============== CONFIGURATION ==============
 
@@ -71,10 +81,30 @@ GODADDY_API_SECRET = get_optional_env("GODADDY_API_SECRET", "")
 
 # ============== SPORTS CACHE ==============
 
-_scores_cache: Dict[str, Any] = {"data": None, "ts": 0, "error_count": 0, "last_error": None}
-_CACHE_TTL = 120  # seconds
+_scores_cache: Dict[str, Any] = {"data": None, "ts": 0, "error_count": 0, "last_error": None, "leagues": {}, "by_id": {}, "by_slug": {}}
+_SCORES_MAX_BACKOFF = 1800  # seconds, upper bound for error backoff
+_SCORES_TICK = 15  # seconds between scheduler checks for due leagues
+_SCORES_FOLLOW_INTERVAL = 5  # seconds between checks for a newer shared snapshot
+SCORES_REFRESH_WAIT = 30  # seconds /admin/refresh-scores waits for the leader's refresh
+# Per-league polling interval by match state (seconds)
+SCORES_INTERVAL_LIVE = int(get_optional_env("SCORES_INTERVAL_LIVE", "60"))
+SCORES_INTERVAL_SOON = int(get_optional_env("SCORES_INTERVAL_SOON", "300"))
+SCORES_INTERVAL_IDLE = int(get_optional_env("SCORES_INTERVAL_IDLE", "1800"))
+SCORES_SOON_WINDOW = 2 * 3600  # kickoff within this many seconds counts as "soon"
+_SCORES_LIVE_WINDOW = 4 * 3600  # started but unfinished for longer than this is not treated as live
+SSE_HEARTBEAT_SECONDS = int(get_optional_env("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_MAX_CLIENTS = int(get_optional_env("SSE_MAX_CLIENTS", "1000"))  # per worker
+ODDS_DAILY_BUDGET = int(get_optional_env("ODDS_DAILY_BUDGET", "0"))  # credits/day, 0 = spread remaining quota over the month
 _featured_match_override: Optional[str] = None  # match id override from admin
 _ai_insight_enabled: bool = True
+AI_INSIGHT_PROMPT_VERSION = "v1"  # bump when the insight prompt changes
+AI_INSIGHT_TTL = int(get_optional_env("AI_INSIGHT_TTL", "21600"))  # seconds
+AI_INSIGHT_WAIT_SECONDS = float(get_optional_env("AI_INSIGHT_WAIT_SECONDS", "0.5"))
+MATCH_ANALYSIS_PROMPT_VERSION = "v1"
+LLM_CACHE_TTL = int(get_optional_env("LLM_CACHE_TTL", "86400"))  # seconds, SEO tool answers
+SEO_ANALYZER_WORKERS = int(get_optional_env("SEO_ANALYZER_WORKERS", "2"))  # processes for corpus scoring
+MATCH_ANALYSIS_CONCURRENCY = int(get_optional_env("MATCH_ANALYSIS_CONCURRENCY", "2"))
+MATCH_RETENTION_DAYS = int(get_optional_env("MATCH_RETENTION_DAYS", "730"))  # 0 keeps matches forever
 
 SPORT_KEYS = [
     "soccer_turkey_super_league",
@@ -85,6 +115,26 @@ SPORT_KEYS = [
     "soccer_uefa_champs_league",
 ]
 
+ODDS_API_BASE_URL = "https://api.the-odds-api.com/v4"
+ODDS_API_CONCURRENCY = int(get_optional_env("ODDS_API_CONCURRENCY", "3"))
+ODDS_API_LEAGUE_TIMEOUT = float(get_optional_env("ODDS_API_LEAGUE_TIMEOUT", "10"))  # seconds, per league incl. retry
+
+# ============== OUTBOUND HTTP ==============
+
+http_clients = UpstreamClientRegistry(dns_ttl=int(get_optional_env("DNS_CACHE_TTL", "300")))
+http_clients.register(UpstreamConfig(
+    "odds", ODDS_API_BASE_URL, timeout=8, connect_timeout=4,
+    max_connections=10, max_keepalive=ODDS_API_CONCURRENCY, retries=1,
+))
+http_clients.register(UpstreamConfig(
+    "godaddy", "https://api.godaddy.com", timeout=60, connect_timeout=5,
+    max_connections=4, max_keepalive=2, retries=2, backoff_base=1,
+))
+http_clients.register(UpstreamConfig(
+    "perigon", "https://api.goperigon.com", timeout=10, connect_timeout=4,
+    max_connections=6, max_keepalive=3, retries=1,
+))
+
 # CORS configuration
 CORS_ORIGINS = get_optional_env("CORS_ORIGINS", "*")
 CORS_ALLOW_CREDENTIALS = get_optional_env("CORS_ALLOW_CREDENTIALS", "false").lower() == "true"
@@ -93,6 +143,39 @@ CORS_ALLOW_CREDENTIALS = get_optional_env("CORS_ALLOW_CREDENTIALS", "false").low
 RATE_LIMIT_REQUESTS = int(get_optional_env("RATE_LIMIT_REQUESTS", "200"))
 RATE_LIMIT_WINDOW = int(get_optional_env("RATE_LIMIT_WINDOW", "60"))
 
+# ============== LLM GATEWAY ==============
+
+llm_gateway = LLMGateway(
+    EMERGENT_LLM_KEY,
+    initial_concurrency=int(get_optional_env("LLM_CONCURRENCY_INITIAL", "4")),  # per provider, per process
+    max_concurrency=int(get_optional_env("LLM_CONCURRENCY_MAX", "16")),
+    call_timeout=float(get_optional_env("LLM_CALL_TIMEOUT", "180")),
+    # Lower classes leave part of the limit free for higher ones (interactive > public > background)
+    shares={
+        "public": float(get_optional_env("LLM_SHARE_PUBLIC", "0.75")),
+        "background": float(get_optional_env("LLM_SHARE_BACKGROUND", "0.75")),
+    },
+    # Time budget per call (seconds); calls that cannot finish in time are dropped while queued
+    deadlines={
+        "interactive": float(get_optional_env("LLM_DEADLINE_INTERACTIVE", "120")),
+        "public": float(get_optional_env("LLM_DEADLINE_PUBLIC", "60")),
+    },
+    # Per provider/model: open after this failure rate (rate limit / 5xx / timeout) over a minute
+    breaker={
+        "threshold": float(get_optional_env("LLM_BREAKER_THRESHOLD", "0.5")),
+        "min_calls": int(get_optional_env("LLM_BREAKER_MIN_CALLS", "5")),
+        "cooldown": float(get_optional_env("LLM_BREAKER_COOLDOWN", "30")),
+    },
+    # Interactive endpoints race the fallback model once the primary is slower than this
+    # latency percentile (0 = off), for at most LLM_HEDGE_BUDGET of their calls
+    hedge_percentile=float(get_optional_env("LLM_HEDGE_PERCENTILE", "0.9")) or None,
+    hedge_budget=float(get_optional_env("LLM_HEDGE_BUDGET", "0.1")),
+)
+LLM_RETRY_AFTER = 30  # seconds, sent with the 503 when a call is dropped for its deadline
+# Read cache configuration (seconds)
+READ_CACHE_TTL = int(get_optional_env("READ_CACHE_TTL", "60"))
+READ_CACHE_STALE_TTL = int(get_optional_env("READ_CACHE_STALE_TTL", "300"))
+
 # Build info
 GIT_COMMIT = get_optional_env("GIT_COMMIT", "")
 BUILD_TIME = get_optional_env("BUILD_TIME", datetime.now(timezone.utc).isoformat())
@@ -100,6 +183,15 @@ BUILD_TIME = get_optional_env("BUILD_TIME", datetime.now(timezone.utc).isoformat
 # Production mode
 DEBUG_MODE = get_optional_env("DEBUG_MODE", "false").lower() == "true"
 
+# Process identity and singleton leader lease (seconds)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+LEADER_LEASE_TTL = int(get_optional_env("LEADER_LEASE_TTL", "15"))
+leader_election = LeaderElection("singletons", WORKER_ID, ttl=LEADER_LEASE_TTL, renew_interval=max(1, LEADER_LEASE_TTL / 3))
+RUN_REQUEST_POLL = 5  # seconds between the leader loops' checks for ad-hoc run requests
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.replace(tzinfo=timezone.utc).isoformat() if value else None
+
 # ============== STRUCTURED LOGGING ==============
 
 class JSONFormatter(logging.Formatter):
@@ -167,6 +259,28 @@ class InMemoryRateLimiter:
 
 rate_limiter = InMemoryRateLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
 
+# ============== READ CACHES ==============
+# Per-process caches for public read endpoints. Admin writes invalidate them
+# explicitly; other workers converge within READ_CACHE_TTL.
+
+categories_cache = AsyncTTLCache("categories", READ_CACHE_TTL, maxsize=8, stale_ttl=READ_CACHE_STALE_TTL)
+bonus_sites_cache = AsyncTTLCache("bonus_sites", READ_CACHE_TTL, maxsize=64, stale_ttl=READ_CACHE_STALE_TTL)
+latest_articles_cache = AsyncTTLCache("latest_articles", READ_CACHE_TTL, maxsize=64, stale_ttl=READ_CACHE_STALE_TTL)
+firma_cache = AsyncTTLCache("firma_detail", READ_CACHE_TTL, maxsize=512, stale_ttl=READ_CACHE_STALE_TTL)
+site_data_cache = AsyncTTLCache("site_data", READ_CACHE_TTL, maxsize=256, stale_ttl=READ_CACHE_STALE_TTL)
+
+def invalidate_bonus_site_caches():
+    """Call after any bonus site create/update/delete/reorder"""
+    bonus_sites_cache.invalidate()
+    firma_cache.invalidate()
+    site_data_cache.invalidate()
+
+def invalidate_article_caches():
+    """Call after any article create/update/delete"""
+    latest_articles_cache.invalidate()
+    firma_cache.invalidate()
+    site_data_cache.invalidate()
+
 # ============== DATABASE ==============
 
 client: AsyncIOMotorClient = None
@@ -208,25 +322,8 @@ async def ping_mongo() -> tuple[bool, float]:
 
 # ============== LIFESPAN ==============
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan handler"""
-    # Startup
-    logger.info("Starting application...")
-    
-    connected = await connect_to_mongo()
-    if not connected:
-        logger.error("[FATAL] Cannot start without database connection")
-        sys.exit(1)
-    
-    logger.info("Application started successfully", extra={
-        "extra_data": {
-            "version": get_git_commit(),
-            "build_time": BUILD_TIME,
-            "debug_mode": DEBUG_MODE
-        }
-    })
-    
+async def bootstrap_database():
+    """Indexes and seed data; runs on the leader only"""
     # Create MongoDB indexes for performance
     try:
         await db.domains.create_index("domain_name", unique=True)
@@ -244,12 +341,55 @@ async def lifespan(app: FastAPI):
         await db.domain_performance.create_index("domain_id")
         await db.domain_performance.create_index([("domain_id", 1), ("site_id", 1)])
         await db.categories.create_index("slug", unique=True)
-        await db.content_queue.create_index("status")
+        await db.content_queue.create_index("id")
+        await db.content_queue.create_index([("status", 1), ("created_at", 1)])
+        await db.content_queue.create_index([("status", 1), ("lease_expires_at", 1)])
+        await db.scheduler_state.create_index("id", unique=True)
+        await db.content_workers.create_index("id", unique=True)
+        await db.content_workers.create_index("heartbeat_at", expireAfterSeconds=3600)
         await db.seo_reports.create_index("domain_id")
+        await db.seo_article_scores.create_index([("report_id", 1), ("overall_score", 1)])
+        await db.ai_insights.create_index("key", unique=True)
+        await db.ai_insights.create_index("expires_at", expireAfterSeconds=0)
+        await db.llm_cache.create_index("key", unique=True)
+        await db.llm_cache.create_index("expires_at", expireAfterSeconds=0)
+        await db.match_analyses.create_index("match_id", unique=True)
+        await db.matches.create_index("id", unique=True)
+        await db.matches.create_index("slug", unique=True)
+        await db.matches.create_index([("sport_key", 1), ("commence_time", -1)])
+        await db.matches.create_index("commence_time")
+        if MATCH_RETENTION_DAYS > 0:
+            await db.matches.create_index("commence_at", expireAfterSeconds=MATCH_RETENTION_DAYS * 86400)
+        await db.godaddy_domains.create_index("domain", unique=True)
+        await db.godaddy_domains.create_index([("ns_class", 1), ("domain", 1)])
+        await db.godaddy_domains.create_index("expires_at")
+        await db.domain_jobs.create_index("id", unique=True)
+        await db.domain_jobs.create_index([("status", 1), ("run_after", 1), ("created_at", 1)])
+        await db.domain_jobs.create_index([("domain_id", 1), ("status", 1)])
+        await db.import_jobs.create_index("id", unique=True)
+        await db.import_jobs.create_index([("status", 1), ("created_at", -1)])
+        await db.scores_snapshot.create_index("id", unique=True)
+        await db.news.create_index("id", unique=True)
+        await db.news.create_index("slug", unique=True)
+        await db.news.create_index([("topics", 1), ("published_dt", -1)])
+        await db.news.create_index("published_dt", expireAfterSeconds=NEWS_RETENTION_DAYS * 86400)
         logger.info("MongoDB indexes created/verified")
     except Exception as e:
         logger.warning(f"Index creation warning: {e}")
-    
+    # Uniqueness guards for job dedupe; kept apart so legacy duplicates can't block the indexes above
+    try:
+        await db.articles.create_index(
+            [("domain_id", 1), ("slug", 1)], unique=True, name="auto_article_slug",
+            partialFilterExpression={"is_auto_generated": True},
+        )
+        # $in in a partial filter needs MongoDB 6.0+
+        await db.domain_jobs.create_index(
+            [("kind", 1), ("domain_id", 1)], unique=True, name="active_domain_job",
+            partialFilterExpression={"status": {"$in": _DOMAIN_JOB_ACTIVE}},
+        )
+    except Exception as e:
+        logger.warning(f"Unique index creation warning (remove duplicates and restart): {e}")
+
     # Ensure "En İyi Firmalar" category exists
     existing_cat = await db.categories.find_one({"slug": "en-iyi-firmalar"})
     if not existing_cat:
@@ -263,12 +403,56 @@ async def lifespan(app: FastAPI):
             "is_active": True,
         })
         logger.info("Created 'En İyi Firmalar' category")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan handler"""
+    # Startup
+    logger.info("Starting application...")
+    
+    connected = await connect_to_mongo()
+    if not connected:
+        logger.error("[FATAL] Cannot start without database connection")
+        sys.exit(1)
+    
+    logger.info("Application started successfully", extra={
+        "extra_data": {
+            "version": get_git_commit(),
+            "build_time": BUILD_TIME,
+            "debug_mode": DEBUG_MODE
+        }
+    })
+    
+    # Singletons run on the elected leader only; the other workers follow its state in Mongo
+    leader_election.register("bootstrap_database", bootstrap_database)
+    if ODDS_API_KEY:
+        leader_election.register("scores_refresher", scores_refresher.start, scores_refresher.stop)
+    if PERIGON_API_KEY:
+        leader_election.register("news_ingestor", news_ingestor.start, news_ingestor.stop)
+    if GODADDY_API_KEY and GODADDY_API_SECRET:
+        leader_election.register("godaddy_sync", godaddy_sync.start, godaddy_sync.stop)
+    leader_election.register("resume_import_jobs", resume_import_jobs)
+    # Ad-hoc runs are flagged in Mongo by any worker and picked up by the leader's loop
+    await godaddy_sync.requests.bind(db.leader_requests)
+    await news_ingestor.requests.bind(db.leader_requests)
+    await scores_refresher.requests.bind(db.leader_requests)
+    await leader_election.start(db.leader_leases)
+    if ODDS_API_KEY:
+        scores_refresher.start_following()
+    if CONTENT_WORKER_EMBEDDED:
+        await content_scheduler.start()
+        domain_job_supervisor.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    await leader_election.stop()
+    await scores_refresher.stop_following()
+    await domain_job_supervisor.stop()
+    await http_clients.aclose()
     await content_scheduler.stop()
+    shutdown_seo_analyzer_pool()
     await disconnect_from_mongo()
     logger.info("Application shutdown complete")
 
@@ -426,6 +610,21 @@ async def global_exception_handler(request: Request, exc: Exception):
         headers={"X-Request-ID": request_id}
     )
 
+@app.exception_handler(LLMDeadlineExceeded)
+async def llm_deadline_handler(request: Request, exc: LLMDeadlineExceeded):
+    """LLM queue too long to answer in time: tell the client to come back later"""
+    request_id = getattr(request.state, 'request_id', 'unknown')
+    logger.warning(f"LLM call dropped: {exc}", extra={"request_id": request_id, "extra_data": {"path": request.url.path}})
+    return JSONResponse(
+        status_code=503,
+        content={
+            "error": "AI servisi şu anda yoğun, lütfen biraz sonra tekrar deneyin",
+            "retry_after": LLM_RETRY_AFTER,
+            "request_id": request_id
+        },
+        headers={"Retry-After": str(LLM_RETRY_AFTER), "X-Request-ID": request_id}
+    )
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """HTTP exception handler"""
@@ -610,42 +809,206 @@ class ContentQueueItem(BaseModel):
     error: Optional[str] = None
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     completed_at: Optional[str] = None
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    attempts: int = 0
 
 # ============== CONTENT SCHEDULER ==============
 
+CONTENT_LEASE_SECONDS = int(get_optional_env("CONTENT_LEASE_SECONDS", "300"))  # processing items without a renewal for this long are requeued
+CONTENT_MAX_ATTEMPTS = int(get_optional_env("CONTENT_MAX_ATTEMPTS", "3"))
+_CONTENT_LEASE_RENEW = 60
+CONTENT_WORKER_EMBEDDED = get_optional_env("CONTENT_WORKER_EMBEDDED", "true").lower() == "true"  # false: only worker.py consumes
+CONTENT_CONCURRENCY = int(get_optional_env("CONTENT_CONCURRENCY", "5"))  # articles generated in parallel per batch
+_CONTENT_POLL = 5
+_CONTENT_WORKER_TTL = 60  # consumers without a heartbeat for this long are considered gone
+_SCHEDULER_STATE = {"id": "content"}
+CONTENT_PERSIST_CONCURRENCY = 2  # article inserts running at once per pipeline
+_PIPELINE_RATE_WINDOW = 20  # recent completions used for the throughput estimate
+
+def _lease_deadline() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=CONTENT_LEASE_SECONDS)
+
+async def get_scheduler_state() -> dict:
+    """Shared scheduler settings in `scheduler_state`, created with defaults on first read"""
+    return await db.scheduler_state.find_one_and_update(_SCHEDULER_STATE, {"$setOnInsert": {
+        "enabled": False,
+        "interval_minutes": 2,
+        "batch_size": CONTENT_CONCURRENCY,
+        "next_run_at": datetime.now(timezone.utc),
+        "run_once": False,
+        "bulk": None,
+        "total_generated": 0,
+        "last_run": None,
+    }}, upsert=True, projection={"_id": 0}, return_document=ReturnDocument.AFTER)
+
+async def update_scheduler_state(fields: Dict[str, Any]) -> dict:
+    await get_scheduler_state()
+    return await db.scheduler_state.find_one_and_update(
+        _SCHEDULER_STATE, {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}},
+        projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+    )
+
+class PipelineStats:
+    """Progress of one generation run: in-flight per stage, throughput and ETA"""
+
+    def __init__(self, label: str, target: int, window: int):
+        self.label = label
+        self.target = target
+        self.window = window
+        self.started_at = time.time()
+        self.claimed = 0
+        self.completed = 0
+        self.failed = 0
+        self.stages = {"prompt": 0, "llm": 0, "post_process": 0, "persist": 0}
+        self._finished_at: deque = deque(maxlen=_PIPELINE_RATE_WINDOW)
+
+    @property
+    def in_flight(self) -> int:
+        return self.claimed - self.completed - self.failed
+
+    @contextmanager
+    def stage(self, name: str):
+        self.stages[name] += 1
+        try:
+            yield
+        finally:
+            self.stages[name] -= 1
+
+    def record(self, success: bool):
+        if success:
+            self.completed += 1
+        else:
+            self.failed += 1
+        self._finished_at.append(time.time())
+
+    def throughput_per_minute(self) -> float:
+        done = len(self._finished_at)
+        if not done:
+            return 0.0
+        # Full window: rate over its span; otherwise since the run started
+        since = self._finished_at[0] if done == _PIPELINE_RATE_WINDOW else self.started_at
+        span = max(time.time() - since, 1.0)
+        return (done - 1 if done == _PIPELINE_RATE_WINDOW else done) / span * 60
+
+    def snapshot(self) -> Dict[str, Any]:
+        rate = self.throughput_per_minute()
+        remaining = max(0, self.target - self.completed - self.failed)
+        return {
+            "label": self.label,
+            "target": self.target,
+            "window": self.window,
+            "claimed": self.claimed,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "stages": dict(self.stages),
+            "throughput_per_minute": round(rate, 2),
+            "eta_seconds": round(remaining / rate * 60) if rate else None,
+            "elapsed_seconds": round(time.time() - self.started_at),
+        }
+
+    def summary(self) -> str:
+        return f"{self.completed} success, {self.failed} failed in {round(time.time() - self.started_at)}s ({self.throughput_per_minute():.1f}/min)"
+
 class ContentScheduler:
+    """Generates articles from `content_queue`.
+
+    Items are claimed one at a time with ``find_one_and_update`` and carry a
+    lease (``lease_owner`` / ``lease_expires_at``) that is renewed while the
+    LLM call runs. Expired leases are requeued by ``reap_expired_leases``, so
+    any number of processes can consume the queue without duplicates.
+
+    Settings (enabled, interval, batch size, bulk requests) live in the shared
+    `scheduler_state` document written by the `/scheduler/*` endpoints. Every
+    consumer (``worker.py``, or the web workers when ``CONTENT_WORKER_EMBEDDED``)
+    polls it; the batch tick is claimed atomically, so one batch runs per
+    interval across all consumers.
+
+    Batches and bulk runs go through ``_run_pipeline``, a sliding window that
+    keeps ``batch_size`` items in flight and claims the next one as soon as one
+    finishes; each item passes prompt → LLM → post-process → persist, with
+    persistence bounded separately.
+    """
+
     def __init__(self):
         self.is_running = False
+        self.mode = None
         self.interval_minutes = 2
-        self.batch_size = 5
+        self.batch_size = CONTENT_CONCURRENCY
         self.task = None
+        self.bulk_task = None
+        self.batch_task = None
         self.last_run = None
         self.total_generated = 0
         self.is_bulk_running = False
+        self.leased: set = set()
+        self._lost: set = set()
+        self.pipelines: Dict[str, PipelineStats] = {}
+        self._persist_slots = asyncio.Semaphore(CONTENT_PERSIST_CONCURRENCY)
     
-    async def start(self):
+    async def start(self, mode: str = "embedded"):
+        """Start consuming in this process (``mode`` is reported in the status)"""
         if self.is_running:
             return
         self.is_running = True
+        self.mode = mode
         self.task = asyncio.create_task(self._run_loop())
-        logger.info(f"Content scheduler started (interval: {self.interval_minutes}min, batch: {self.batch_size})")
+        logger.info(f"Content consumer started (mode: {mode}, worker: {WORKER_ID})")
     
     async def stop(self):
         self.is_running = False
-        if self.task:
-            self.task.cancel()
-            self.task = None
-        logger.info("Content scheduler stopped")
+        # Cancelled generations hand their leased items back to the queue
+        tasks = [t for t in (self.task, self.batch_task, self.bulk_task) if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.task = None
+        if tasks:
+            await db.content_workers.delete_one({"id": WORKER_ID})
+        logger.info("Content consumer stopped")
     
     async def _run_loop(self):
         while self.is_running:
             try:
-                await self._process_batch()
+                state = await get_scheduler_state()
+                self.interval_minutes = state["interval_minutes"]
+                self.batch_size = state["batch_size"]
+                await self._heartbeat()
+                await self._maybe_start_bulk()
+                if (self.batch_task is None or self.batch_task.done()) and await self._claim_tick():
+                    self.batch_task = asyncio.create_task(self._process_batch())
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
-            await asyncio.sleep(self.interval_minutes * 60)
+            await asyncio.sleep(_CONTENT_POLL)
+
+    async def _claim_tick(self) -> bool:
+        """Take the next batch slot; only one consumer wins it per interval"""
+        now = datetime.now(timezone.utc)
+        state = await db.scheduler_state.find_one_and_update(
+            {**_SCHEDULER_STATE, "next_run_at": {"$lte": now}, "$or": [{"enabled": True}, {"run_once": True}]},
+            {"$set": {"next_run_at": now + timedelta(minutes=self.interval_minutes), "run_once": False, "last_tick_by": WORKER_ID}},
+            projection={"_id": 0, "id": 1},
+        )
+        return state is not None
+
+    async def _heartbeat(self):
+        await db.content_workers.update_one({"id": WORKER_ID}, {"$set": {
+            "mode": self.mode,
+            "heartbeat_at": datetime.now(timezone.utc),
+            "leases_held": len(self.leased),
+            "bulk_running": self.is_bulk_running,
+            "pipelines": {label: stats.snapshot() for label, stats in self.pipelines.items()},
+            "total_generated": self.total_generated,
+            "last_run": self.last_run,
+        }}, upsert=True)
+
+    @staticmethod
+    async def live_workers() -> List[dict]:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=_CONTENT_WORKER_TTL)
+        return await db.content_workers.find({"heartbeat_at": {"$gte": cutoff}}, {"_id": 0}).to_list(100)
     
     async def _build_article_prompt(self, subject: str, sites_info: str) -> str:
         return f"""'{subject}' konusunda profesyonel, SEO uyumlu, benzersiz ve kapsamlı bir makale yaz.
@@ -684,111 +1047,240 @@ Makale içinde uygun yerlere şu placeholder'ları ekle:
 - Google'ın E-E-A-T (Deneyim, Uzmanlık, Otorite, Güvenilirlik) standartlarına uygun olmalı
 - Kopyala-yapıştır içerik üretme, her cümle yeni ve özgün olmalı"""
 
-    async def _generate_single_article(self, item: dict, sites_info: str) -> bool:
-        """Generate a single article from queue item. Returns True on success."""
+    async def claim(self, limit: int) -> List[dict]:
+        """Atomically lease up to ``limit`` pending items to this worker"""
+        items = []
+        for _ in range(limit):
+            item = await db.content_queue.find_one_and_update(
+                {"status": "pending"},
+                {"$set": {"status": "processing", "lease_owner": WORKER_ID, "lease_expires_at": _lease_deadline(), "error": None},
+                 "$inc": {"attempts": 1}},
+                sort=[("created_at", 1)], projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+            )
+            if not item:
+                break
+            items.append(item)
+        return items
+
+    async def reap_expired_leases(self) -> int:
+        """Requeue items whose worker stopped renewing the lease (failed after the last attempt)"""
+        now = datetime.now(timezone.utc)
+        # Items without a lease were marked processing before leases existed
+        expired = {"status": "processing", "$or": [{"lease_expires_at": {"$lt": now}}, {"lease_expires_at": None}]}
+        await db.content_queue.update_many(
+            {**expired, "attempts": {"$gte": CONTENT_MAX_ATTEMPTS}},
+            {"$set": {"status": "failed", "error": "lease expired", "lease_owner": None, "lease_expires_at": None}},
+        )
+        result = await db.content_queue.update_many(
+            expired,
+            {"$set": {"status": "pending", "error": "lease expired", "lease_owner": None, "lease_expires_at": None}},
+        )
+        if result.modified_count:
+            logger.warning(f"Requeued {result.modified_count} content item(s) with an expired lease")
+        return result.modified_count
+
+    async def _renew_lease(self, item_id: str, task: asyncio.Task):
+        while True:
+            await asyncio.sleep(_CONTENT_LEASE_RENEW)
+            result = await db.content_queue.update_one(
+                {"id": item_id, "status": "processing", "lease_owner": WORKER_ID},
+                {"$set": {"lease_expires_at": _lease_deadline()}},
+            )
+            if not result.matched_count:
+                # Reaped after a stall; another worker owns the item now
+                logger.warning(f"Lease lost for content item {item_id}")
+                self._lost.add(item_id)
+                task.cancel()
+                return
+
+    @staticmethod
+    def _build_article(subject: str, content: str) -> Article:
+        title_clean = subject.title()
+        seo_title = f"{title_clean} - Detaylı Rehber 2026"[:60]
+        seo_desc = f"{title_clean} hakkında kapsamlı ve güncel uzman rehberi. En iyi fırsatlar, karşılaştırmalar ve stratejiler."[:160]
+        
+        return Article(
+            title=title_clean,
+            slug=slugify(subject),
+            excerpt=f"{title_clean} hakkında uzman görüşleri, karşılaştırmalar ve güncel rehber.",
+            content=content,
+            category="en-iyi-firmalar",
+            tags=[slugify(t) for t in subject.split()[:5]],
+            seo_title=seo_title,
+            seo_description=seo_desc,
+            is_ai_generated=True,
+            is_auto_generated=True,
+            is_published=True,
+            author="Uzman Editör",
+            content_hash=hashlib.md5(content.encode()).hexdigest(),
+            content_updated_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+    async def _generate_single_article(self, item: dict, sites_info: str, stats: PipelineStats) -> bool:
+        """Generate a single article from a claimed queue item. Returns True on success."""
         item_id = item["id"]
         company = item.get("company", "")
         topic = item.get("topic", "")
         subject = f"{company} {topic}".strip() if company and topic else (company or topic)
+        mine = {"id": item_id, "status": "processing", "lease_owner": WORKER_ID}
+        release = {"lease_owner": None, "lease_expires_at": None}
         
-        await db.content_queue.update_one({"id": item_id}, {"$set": {"status": "processing"}})
-        
+        self.leased.add(item_id)
+        renewer = asyncio.create_task(self._renew_lease(item_id, asyncio.current_task()))
         try:
-            prompt = await self._build_article_prompt(subject, sites_info)
-            content = await generate_ai_content(prompt, "Sen Türkiye'nin en iyi bonus ve bahis uzmanısın. 10 yıllık deneyiminle sektörü yakından takip ediyorsun. Makalelerini gerçek deneyimler ve güncel bilgilerle yazıyorsun. Sadece HTML formatında yanıt ver, markdown kullanma.")
-            
-            title_clean = subject.title()
-            seo_title = f"{title_clean} - Detaylı Rehber 2026"[:60]
-            seo_desc = f"{title_clean} hakkında kapsamlı ve güncel uzman rehberi. En iyi fırsatlar, karşılaştırmalar ve stratejiler."[:160]
-            
-            article = Article(
-                title=title_clean,
-                slug=slugify(subject),
-                excerpt=f"{title_clean} hakkında uzman görüşleri, karşılaştırmalar ve güncel rehber.",
-                content=content,
-                category="en-iyi-firmalar",
-                tags=[slugify(t) for t in subject.split()[:5]],
-                seo_title=seo_title,
-                seo_description=seo_desc,
-                is_ai_generated=True,
-                is_auto_generated=True,
-                is_published=True,
-                author="Uzman Editör",
-                content_hash=hashlib.md5(content.encode()).hexdigest(),
-                content_updated_at=datetime.now(timezone.utc).isoformat(),
-            )
-            
-            await db.articles.insert_one(article.model_dump())
-            await db.content_queue.update_one({"id": item_id}, {"$set": {
-                "status": "completed",
-                "article_id": article.id,
-                "completed_at": datetime.now(timezone.utc).isoformat(),
-            }})
+            with stats.stage("prompt"):
+                prompt = await self._build_article_prompt(subject, sites_info)
+            with stats.stage("llm"):
+                content = await generate_ai_content(prompt, "Sen Türkiye'nin en iyi bonus ve bahis uzmanısın. 10 yıllık deneyiminle sektörü yakından takip ediyorsun. Makalelerini gerçek deneyimler ve güncel bilgilerle yazıyorsun. Sadece HTML formatında yanıt ver, markdown kullanma.", priority="background")
+            with stats.stage("post_process"):
+                article = self._build_article(subject, content)
             
-            self.total_generated += 1
-            self.last_run = datetime.now(timezone.utc).isoformat()
+            with stats.stage("persist"):
+                async with self._persist_slots:
+                    renewer.cancel()
+                    try:
+                        await db.articles.insert_one(article.model_dump())
+                    except DuplicateKeyError:
+                        # Every retry would collide too, so fail the item whoever holds it
+                        logger.warning(f"Article slug for '{subject}' already exists, marking item failed")
+                        await db.content_queue.update_one({"id": item_id}, {"$set": {
+                            "status": "failed",
+                            "error": f"article slug '{article.slug}' already exists",
+                            **release,
+                        }})
+                        return False
+                    # Complete under the lease; a reaped item drops its article so it never yields two
+                    result = await db.content_queue.update_one(mine, {"$set": {
+                        "status": "completed",
+                        "article_id": article.id,
+                        "completed_at": datetime.now(timezone.utc).isoformat(),
+                        **release,
+                    }})
+                    if not result.modified_count:
+                        logger.warning(f"Lease lost for '{subject}', discarding generated article")
+                        await db.articles.delete_one({"id": article.id})
+                        return False
+                    invalidate_article_caches()
+                    
+                    self.total_generated += 1
+                    self.last_run = datetime.now(timezone.utc).isoformat()
+                    await db.scheduler_state.update_one(_SCHEDULER_STATE, {"$inc": {"total_generated": 1}, "$set": {"last_run": self.last_run}})
             logger.info(f"Scheduler generated: {article.title} (#{self.total_generated})")
             return True
             
+        except asyncio.CancelledError:
+            if item_id in self._lost:
+                return False
+            # Shutdown: hand the item back to the queue right away
+            await asyncio.shield(db.content_queue.update_one(mine, {"$set": {"status": "pending", **release}}))
+            raise
         except Exception as e:
             logger.error(f"Article generation failed for '{subject}': {e}")
-            await db.content_queue.update_one({"id": item_id}, {"$set": {
+            await db.content_queue.update_one({"id": item_id, "lease_owner": WORKER_ID}, {"$set": {
                 "status": "failed",
                 "error": str(e),
+                **release,
             }})
             return False
+        finally:
+            renewer.cancel()
+            self.leased.discard(item_id)
+            self._lost.discard(item_id)
+
+    async def _sites_info(self) -> str:
+        bonus_sites = await db.bonus_sites.find({"is_active": True}, {"_id": 0, "name": 1, "bonus_amount": 1, "bonus_type": 1, "affiliate_url": 1, "rating": 1, "features": 1}).to_list(20)
+        return "\n".join([f"- {s['name']}: {s.get('bonus_amount','')} bonus, {s.get('rating',4.5)} puan, Özellikler: {', '.join(s.get('features',[]))}" for s in bonus_sites])
+
+    async def _run_pipeline(self, label: str, target: int) -> PipelineStats:
+        """Generate up to ``target`` items, keeping ``batch_size`` in flight.
+
+        A finished item is replaced by a newly claimed one right away, so one
+        slow LLM call never holds back the rest of the window.
+        """
+        await self.reap_expired_leases()
+        sites_info = await self._sites_info()
+        stats = PipelineStats(label, target, self.batch_size)
+        self.pipelines[label] = stats
+        in_flight: set = set()
+        try:
+            while True:
+                # Window size follows the shared setting, so it can be changed mid-run
+                stats.window = self.batch_size
+                while stats.claimed < target and len(in_flight) < stats.window:
+                    items = await self.claim(1)
+                    if not items:
+                        break
+                    stats.claimed += 1
+                    in_flight.add(asyncio.create_task(self._generate_single_article(items[0], sites_info, stats)))
+                if not in_flight:
+                    return stats
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stats.record(not task.cancelled() and task.exception() is None and task.result() is True)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            self.pipelines.pop(label, None)
 
     async def _process_batch(self):
-        """Process a batch of pending items concurrently."""
-        items = await db.content_queue.find({"status": "pending"}, {"_id": 0}).limit(self.batch_size).to_list(self.batch_size)
-        if not items:
+        """Process one scheduled batch of ``batch_size`` items."""
+        stats = await self._run_pipeline("scheduled", self.batch_size)
+        if not stats.claimed:
             logger.info("Content queue empty, scheduler waiting...")
             return
-        
-        bonus_sites = await db.bonus_sites.find({"is_active": True}, {"_id": 0, "name": 1, "bonus_amount": 1, "bonus_type": 1, "affiliate_url": 1, "rating": 1, "features": 1}).to_list(20)
-        sites_info = "\n".join([f"- {s['name']}: {s.get('bonus_amount','')} bonus, {s.get('rating',4.5)} puan, Özellikler: {', '.join(s.get('features',[]))}" for s in bonus_sites])
-        
-        logger.info(f"Processing batch of {len(items)} articles...")
-        tasks = [self._generate_single_article(item, sites_info) for item in items]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        success = sum(1 for r in results if r is True)
-        failed = len(results) - success
-        logger.info(f"Batch complete: {success} success, {failed} failed")
+        logger.info(f"Batch complete: {stats.summary()}")
 
     async def bulk_generate(self, count: int = 20):
-        """Start bulk generation in background."""
-        if self.is_bulk_running:
+        """Request bulk generation; the next polling consumer picks it up."""
+        state = await get_scheduler_state()
+        bulk = state.get("bulk") or {}
+        if bulk.get("status") == "requested" or (bulk.get("status") == "running" and await self._bulk_owner_alive(bulk)):
             return {"error": "Bulk generation already running"}
-        self.is_bulk_running = True
-        asyncio.create_task(self._bulk_generate_task(count))
+        await update_scheduler_state({"bulk": {
+            "id": str(uuid.uuid4()),
+            "count": count,
+            "status": "requested",
+            "worker": None,
+            "requested_at": datetime.now(timezone.utc),
+        }})
         return {"status": "started", "target_count": count, "message": f"{count} makale arka planda uretiliyor"}
 
-    async def _bulk_generate_task(self, count: int):
+    async def _bulk_owner_alive(self, bulk: dict) -> bool:
+        return any(w["id"] == bulk.get("worker") for w in await self.live_workers())
+
+    async def _maybe_start_bulk(self):
+        if self.is_bulk_running:
+            return
+        state = await db.scheduler_state.find_one_and_update(
+            {**_SCHEDULER_STATE, "bulk.status": "requested"},
+            {"$set": {"bulk.status": "running", "bulk.worker": WORKER_ID, "bulk.started_at": datetime.now(timezone.utc)}},
+            projection={"_id": 0, "bulk": 1}, return_document=ReturnDocument.AFTER,
+        )
+        if state:
+            self.is_bulk_running = True
+            self.bulk_task = asyncio.create_task(self._bulk_generate_task(state["bulk"]["count"], state["bulk"]["id"]))
+
+    async def _bulk_generate_task(self, count: int, bulk_id: Optional[str] = None):
         """Background task for bulk article generation."""
+        outcome = "done"
         try:
-            bonus_sites = await db.bonus_sites.find({"is_active": True}, {"_id": 0, "name": 1, "bonus_amount": 1, "bonus_type": 1, "affiliate_url": 1, "rating": 1, "features": 1}).to_list(20)
-            sites_info = "\n".join([f"- {s['name']}: {s.get('bonus_amount','')} bonus, {s.get('rating',4.5)} puan, Özellikler: {', '.join(s.get('features',[]))}" for s in bonus_sites])
-            
-            items = await db.content_queue.find({"status": "pending"}, {"_id": 0}).limit(count).to_list(count)
-            if not items:
-                logger.info("Bulk generate: queue empty")
-                return
-            
-            logger.info(f"Bulk generate started: {len(items)} articles")
-            for i in range(0, len(items), 3):
-                batch = items[i:i+3]
-                tasks = [self._generate_single_article(item, sites_info) for item in batch]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                success = sum(1 for r in results if r is True)
-                logger.info(f"Bulk batch {i//3 + 1}/{(len(items)+2)//3}: {success}/{len(batch)} success")
-                await asyncio.sleep(2)
-            
-            logger.info(f"Bulk generate complete. Total generated this session: {self.total_generated}")
+            logger.info(f"Bulk generate started: up to {count} articles, {self.batch_size} in flight")
+            stats = await self._run_pipeline("bulk", count)
+            logger.info(f"Bulk generate complete: {stats.summary()}")
+        except asyncio.CancelledError:
+            outcome = "requested"  # shutdown: leave the request for another consumer
+            raise
         except Exception as e:
             logger.error(f"Bulk generate error: {e}")
         finally:
             self.is_bulk_running = False
+            self.bulk_task = None
+            if bulk_id:
+                await asyncio.shield(db.scheduler_state.update_one(
+                    {**_SCHEDULER_STATE, "bulk.id": bulk_id, "bulk.worker": WORKER_ID},
+                    {"$set": {"bulk.status": outcome, "bulk.finished_at": datetime.now(timezone.utc)}},
+                ))
 
 content_scheduler = ContentScheduler()
 
@@ -811,26 +1303,121 @@ def calculate_performance_score(perf: dict) -> float:
     score += min(perf.get('avg_scroll_depth', 0) / 4, 25)
     return score
 
-async def generate_ai_content(prompt: str, system_message: str = "Sen profesyonel bir Türkçe içerik yazarısın.") -> str:
-    """Generate AI content using Emergent integrations with retry"""
-    from emergentintegrations.llm.chat import LlmChat, UserMessage
-    
-    models = [("openai", "gpt-4o"), ("openai", "gpt-4o-mini")]
+AI_CONTENT_MODELS = [("openai", "gpt-4o"), ("openai", "gpt-4o-mini")]  # preferred first
+DEFAULT_AI_SYSTEM_MESSAGE = "Sen profesyonel bir Türkçe içerik yazarısın."
+
+async def generate_ai_content(prompt: str, system_message: str = DEFAULT_AI_SYSTEM_MESSAGE,
+                              priority: str = "interactive", hedge: bool = False) -> str:
+    """Generate AI content through the LLM gateway, falling back to the smaller model.
+
+    ``priority`` is the gateway class: admin tools are interactive, queue/bulk jobs background.
+    A model whose circuit breaker is open, or whose queue cannot serve the call within
+    its deadline, is skipped without waiting. ``hedge`` races the smaller model when the
+    first one is slow (someone is waiting on the answer). Raises ``LLMDeadlineExceeded``
+    when every model was skipped for time (mapped to 503 + Retry-After).
+    """
+    models = AI_CONTENT_MODELS
     max_retries = 3
+    deadline = llm_gateway.deadline_for(priority)  # one budget for all retries
+    dropped: Optional[LLMDeadlineExceeded] = None
+    
+    if hedge:
+        try:
+            return await llm_gateway.complete_hedged(prompt, system_message, models[0], models[1], priority=priority, deadline=deadline)
+        except LLMDeadlineExceeded as e:
+            dropped = e
+        except Exception as e:
+            logger.warning(f"AI hedged attempt failed ({classify_error(e)}): {e}")
     
     for provider, model in models:
         for attempt in range(max_retries):
             try:
-                chat = LlmChat(api_key=EMERGENT_LLM_KEY, session_id=str(uuid.uuid4()), system_message=system_message).with_model(provider, model)
-                result = await chat.send_message(UserMessage(text=prompt))
-                return result
+                return await llm_gateway.complete(prompt, system_message, provider, model, priority=priority, deadline=deadline)
+            except LLMDeadlineExceeded as e:
+                dropped = e
+                break  # this model's queue is too slow; the next one may still make it
+            except CircuitOpenError:
+                break  # known unhealthy, go straight to the next model
             except Exception as e:
-                logger.warning(f"AI attempt {attempt+1}/{max_retries} ({model}): {e}")
+                kind = classify_error(e)
+                logger.warning(f"AI attempt {attempt+1}/{max_retries} ({model}, {kind}): {e}")
+                if kind not in OVERLOAD_ERRORS or not llm_gateway.available(provider, model):
+                    break  # not a capacity problem, or the breaker just opened
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(5 * (attempt + 1))
+                    # The gateway already cut the provider's concurrency; jitter spreads the retries
+                    await asyncio.sleep(random.uniform(1, 4 * 2 ** attempt))
     
+    if dropped:
+        raise dropped
     raise Exception("All AI models failed after retries")
 
+# Two-tier response cache for the SEO tools: in-process (single-flight) in front of
+# the shared `llm_cache` collection, keyed by a hash of models + system message + prompt
+# + template version. Bump a template's version when its post-processing changes.
+# Entries are (text, cache_hit, expires_at) and live in memory only until their
+# Mongo document expires, so no worker serves an answer the shared tier has dropped.
+llm_response_cache = AsyncTTLCache("llm_responses", LLM_CACHE_TTL, maxsize=512)
+
+SEO_TOOL_TEMPLATES = {
+    "keyword_research": "keyword_research:v1",
+    "competitor_deep": "competitor_deep:v1",
+    "meta_generator": "meta_generator:v1",
+    "internal_links": "internal_links:v1",
+    "competitor_analysis": "competitor_analysis:v1",
+    "keyword_gap": "keyword_gap:v1",
+    "content_score_advice": "content_score_advice:v1",
+}
+
+def _llm_cache_remaining(entry: tuple) -> float:
+    """In-process TTL of an llm_response_cache entry: what is left of its Mongo TTL"""
+    return max(0.0, (entry[2] - datetime.now(timezone.utc)).total_seconds())
+
+def _llm_cache_key(template: str, system_message: str, prompt: str) -> str:
+    payload = json.dumps([template, AI_CONTENT_MODELS, system_message, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+async def cached_ai_content(prompt: str, system_message: str, template: str,
+                            refresh: bool = False, hedge: bool = False) -> Tuple[str, bool]:
+    """``generate_ai_content`` through the response cache; returns ``(text, cache_hit)``.
+
+    ``refresh`` skips both tiers and stores the new answer. Failures are not cached.
+    """
+    key = _llm_cache_key(template, system_message, prompt)
+    if not refresh:
+        entry = llm_response_cache.get(key)
+        if entry is not None:
+            return entry[0], True
+
+    async def generate() -> Tuple[str, bool, datetime]:
+        text = await generate_ai_content(prompt, system_message, hedge=hedge)
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=LLM_CACHE_TTL)
+        await db.llm_cache.update_one({"key": key}, {"$set": {
+            "key": key,
+            "template": template,
+            "text": text,
+            "created_at": now,
+            "expires_at": expires_at,
+        }}, upsert=True)
+        return text, False, expires_at
+
+    async def load() -> Tuple[str, bool, datetime]:
+        doc = await db.llm_cache.find_one({"key": key, "expires_at": {"$gt": datetime.now(timezone.utc)}}, {"_id": 0, "text": 1, "expires_at": 1})
+        if doc:
+            return doc["text"], True, doc["expires_at"].replace(tzinfo=timezone.utc)
+        return await generate()
+
+    if refresh:
+        # Own call, never joined to an in-flight load: that one may return the answer being replaced.
+        # Invalidating first also keeps such a load from storing its answer over this one.
+        llm_response_cache.invalidate(key)
+        entry = await generate()
+        llm_response_cache.set(key, entry, _llm_cache_remaining(entry))
+        return entry[0], False
+    # Coalesced callers share the loader's hit flag
+    text, hit, _ = await llm_response_cache.get_or_load(key, load, _llm_cache_remaining)
+    return text, hit
+
 # ============== API ROUTES ==============
 
 @api_router.get("/")
@@ -842,9 +1429,24 @@ async def api_root():
         "status": "operational"
     }
 
+async def provision_domain_sites(domain_ids: List[str]) -> int:
+    """Copy active global sites (with heuristic performance rows) to the given domains using bulk inserts"""
+    if not domain_ids:
+        return 0
+    global_sites = await db.bonus_sites.find({"is_global": True, "is_active": True}, {"_id": 0}).to_list(100)
+    site_rows, perf_rows = [], []
+    for domain_id in domain_ids:
+        for site in global_sites:
+            site_rows.append(DomainSite(domain_id=domain_id, site_id=site["id"]).model_dump())
+            perf_rows.append(DomainPerformance(domain_id=domain_id, site_id=site["id"], performance_score=calculate_heuristic_score(site)).model_dump())
+    if site_rows:
+        await db.domain_sites.insert_many(site_rows, ordered=False)
+        await db.domain_performance.insert_many(perf_rows, ordered=False)
+    return len(site_rows)
+
 # Domain Management
 @api_router.post("/domains", response_model=Domain)
-async def create_domain(domain: DomainCreate, background_tasks: BackgroundTasks):
+async def create_domain(domain: DomainCreate):
     """Create a new domain with auto-generated content"""
     existing = await db.domains.find_one({"domain_name": domain.domain_name})
     if existing:
@@ -852,17 +1454,13 @@ async def create_domain(domain: DomainCreate, background_tasks: BackgroundTasks)
     
     domain_obj = Domain(**domain.model_dump())
     await db.domains.insert_one(domain_obj.model_dump())
+    site_data_cache.invalidate()
     
     # Copy global sites to domain
-    global_sites = await db.bonus_sites.find({"is_global": True, "is_active": True}, {"_id": 0}).to_list(100)
-    for site in global_sites:
-        domain_site = DomainSite(domain_id=domain_obj.id, site_id=site["id"])
-        await db.domain_sites.insert_one(domain_site.model_dump())
-        perf = DomainPerformance(domain_id=domain_obj.id, site_id=site["id"], performance_score=calculate_heuristic_score(site))
-        await db.domain_performance.insert_one(perf.model_dump())
+    await provision_domain_sites([domain_obj.id])
     
-    # Auto-generate starter content in background
-    background_tasks.add_task(auto_generate_domain_content, domain_obj.id, domain_obj.domain_name, domain_obj.focus)
+    # Auto-generate starter content via the domain job queue
+    await domain_job_supervisor.enqueue(domain_obj.id, domain_obj.domain_name, domain_obj.focus)
     
     logger.info(f"Domain created: {domain.domain_name} - auto content generation started")
     return domain_obj
@@ -893,11 +1491,12 @@ async def auto_generate_domain_content(domain_id: str, domain_name: str, focus:
         ],
     }
     topics = topic_map.get(focus, topic_map["bonus"])
+    failed = []
     
     for topic in topics:
         try:
-            existing = await db.articles.find_one({"domain_id": domain_id, "title": {"$regex": topic[:20], "$options": "i"}})
-            if existing:
+            slug = slugify(topic)
+            if await db.articles.find_one({"domain_id": domain_id, "slug": slug}, {"_id": 1}):
                 continue
             
             prompt = f"""'{domain_name}' sitesi için '{topic}' konusunda profesyonel, SEO uyumlu ve özgün bir makale yaz.
@@ -917,7 +1516,7 @@ KURALLAR:
 - Paragraflar kısa ve okunabilir olsun (3-4 cümle)
 - Keyword stuffing yapma, doğal yaz"""
             
-            content = await generate_ai_content(prompt)
+            content = await generate_ai_content(prompt, priority="background")
             
             title_clean = topic.replace("Guncel", "Güncel").replace("Yuksek", "Yüksek").replace("Sarti", "Şartı").replace("Nasil", "Nasıl").replace("Hesaplanir", "Hesaplanır").replace("Yatirimsiz", "Yatırımsız").replace("Canli", "Canlı").replace("Istatistikleri", "İstatistikleri").replace("Ile", "İle").replace("Taktikleri", "Taktikleri")
             seo_title = f"{title_clean} - {domain_name} Rehberi"[:60]
@@ -926,7 +1525,7 @@ KURALLAR:
             article = Article(
                 domain_id=domain_id,
                 title=title_clean,
-                slug=slugify(topic),
+                slug=slug,
                 excerpt=f"{title_clean} hakkında kapsamlı ve güncel rehber.",
                 content=content,
                 category="bonus" if "bonus" in topic.lower() or "cevrim" in topic.lower() else "spor",
@@ -939,14 +1538,274 @@ KURALLAR:
                 content_hash=hashlib.md5(content.encode()).hexdigest(),
                 content_updated_at=datetime.now(timezone.utc).isoformat(),
             )
-            await db.articles.insert_one(article.model_dump())
+            try:
+                await db.articles.insert_one(article.model_dump())
+            except DuplicateKeyError:
+                continue  # a concurrent attempt stored it first
+            invalidate_article_caches()
             logger.info(f"Auto article for {domain_name}: {topic}")
             await asyncio.sleep(2)
         except Exception as e:
+            failed.append(topic)
             logger.error(f"Auto content failed for {domain_name}/{topic}: {e}")
+    
+    # Raise so the job is retried; topics that already have an article are skipped
+    if failed:
+        raise Exception(f"{len(failed)}/{len(topics)} starter articles failed")
+
+# ── domain jobs ──────────────────────────────────────────────────────
+
+DOMAIN_JOB_CONCURRENCY = int(get_optional_env("DOMAIN_JOB_CONCURRENCY", "2"))  # running jobs across all workers
+DOMAIN_JOB_MIN_INTERVAL = float(get_optional_env("DOMAIN_JOB_MIN_INTERVAL", "10"))  # seconds between job starts per process
+DOMAIN_JOB_MAX_ATTEMPTS = int(get_optional_env("DOMAIN_JOB_MAX_ATTEMPTS", "3"))
+DOMAIN_JOB_RETRY_BASE = 60  # seconds, doubled per attempt
+DOMAIN_JOB_STALE_SECONDS = 300  # running jobs without a heartbeat for this long are requeued
+_DOMAIN_JOB_HEARTBEAT = 30
+_DOMAIN_JOB_ACTIVE = ["queued", "running"]
+_DOMAIN_JOB_SLOTS = {"id": "domain_job_slots"}  # `scheduler_state` doc holding the reserved run slots
+_DOMAIN_JOB_SLOT_GRACE = 60  # seconds before an orphaned slot reservation is reclaimed
+
+_DOMAIN_JOB_HANDLERS: Dict[str, Callable] = {
+    "starter_content": lambda job: auto_generate_domain_content(job["domain_id"], job["domain_name"], job["focus"]),
+}
+
+class DomainJobSupervisor:
+    """Runs domain jobs from the durable `domain_jobs` collection.
+
+    - global cap: a job only starts after atomically reserving one of
+      ``DOMAIN_JOB_CONCURRENCY`` slots in a shared `scheduler_state` document
+    - per-domain ordering: a domain's next job waits until its earlier one finishes
+    - retry with exponential backoff up to ``DOMAIN_JOB_MAX_ATTEMPTS``
+    - running jobs heartbeat; jobs of a crashed worker are requeued
+    - cancellation of queued jobs, and of running ones via the heartbeat
+    """
+
+    def __init__(self):
+        self.is_running = False
+        self.task = None
+        self.wakeup = asyncio.Event()
+        self.active: Dict[str, asyncio.Task] = {}
+        self._cancelling: set = set()
+        self._last_start = 0.0
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info(f"Domain job supervisor started (concurrency: {DOMAIN_JOB_CONCURRENCY}, worker: {WORKER_ID})")
+
+    async def stop(self):
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        # Running jobs go back to the queue for the next worker
+        tasks = list(self.active.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def enqueue(self, domain_id: str, domain_name: str, focus: str, kind: str = "starter_content", import_job_id: Optional[str] = None) -> dict:
+        """Queue a job unless the same kind is already queued/running for the domain"""
+        now = datetime.now(timezone.utc)
+        active = {"kind": kind, "domain_id": domain_id, "status": {"$in": _DOMAIN_JOB_ACTIVE}}
+        try:
+            await db.domain_jobs.update_one(active, {"$setOnInsert": {
+                "id": str(uuid.uuid4()),
+                "status": "queued",
+                "domain_name": domain_name,
+                "focus": focus,
+                "import_job_id": import_job_id,
+                "attempts": 0,
+                "max_attempts": DOMAIN_JOB_MAX_ATTEMPTS,
+                "run_after": now,
+                "created_at": now,
+                "last_error": None,
+            }}, upsert=True)
+        except DuplicateKeyError:
+            pass  # a concurrent enqueue won; the unique active_domain_job index keeps one
+        self.wakeup.set()
+        return await db.domain_jobs.find_one(active, {"_id": 0})
+
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        job = await db.domain_jobs.find_one_and_update(
+            {"id": job_id, "status": "queued"},
+            {"$set": {"status": "cancelled", "finished_at": now}},
+            projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+        )
+        if job:
+            await self._report(job, "cancelled")
+            return job
+        job = await db.domain_jobs.find_one_and_update(
+            {"id": job_id, "status": "running"},
+            {"$set": {"cancel_requested": True}},
+            projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+        )
+        if job and job_id in self.active:
+            self._cancelling.add(job_id)
+            self.active[job_id].cancel()
+        # Running on another worker: it stops at its next heartbeat
+        return job or await db.domain_jobs.find_one({"id": job_id}, {"_id": 0})
+
+    async def cancel_domain(self, domain_id: str):
+        job_ids = await db.domain_jobs.distinct("id", {"domain_id": domain_id, "status": {"$in": _DOMAIN_JOB_ACTIVE}})
+        for job_id in job_ids:
+            await self.cancel(job_id)
+
+    async def _run_loop(self):
+        while self.is_running:
+            try:
+                await self._requeue_stale()
+                await self._fill()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Domain job supervisor error: {e}")
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                break
+            self.wakeup.clear()
+
+    async def _requeue_stale(self):
+        now = datetime.now(timezone.utc)
+        stale = {"status": "running", "heartbeat_at": {"$lt": now - timedelta(seconds=DOMAIN_JOB_STALE_SECONDS)}}
+        await db.domain_jobs.update_many(
+            {**stale, "cancel_requested": True},
+            {"$set": {"status": "cancelled", "finished_at": now, "worker": None}},
+        )
+        result = await db.domain_jobs.update_many(
+            stale,
+            {"$set": {"status": "queued", "run_after": now, "worker": None, "last_error": "worker lost (heartbeat timeout)"}},
+        )
+        if result.modified_count:
+            logger.warning(f"Requeued {result.modified_count} stale domain job(s)")
+        # Slots of jobs that are no longer running (crashed worker, requeued above) go back to the pool
+        await db.scheduler_state.update_one(_DOMAIN_JOB_SLOTS, {"$setOnInsert": {"holders": []}}, upsert=True)
+        held = await db.domain_jobs.distinct("slot", {"status": "running"})
+        await db.scheduler_state.update_one(_DOMAIN_JOB_SLOTS, {"$pull": {"holders": {
+            "token": {"$nin": held}, "at": {"$lt": now - timedelta(seconds=_DOMAIN_JOB_SLOT_GRACE)},
+        }}})
+
+    @staticmethod
+    async def _reserve_slot() -> Optional[str]:
+        """Atomically take a run slot; None when all ``DOMAIN_JOB_CONCURRENCY`` are held"""
+        token = str(uuid.uuid4())
+        doc = await db.scheduler_state.find_one_and_update(
+            {**_DOMAIN_JOB_SLOTS, "$expr": {"$lt": [{"$size": "$holders"}, DOMAIN_JOB_CONCURRENCY]}},
+            {"$push": {"holders": {"token": token, "at": datetime.now(timezone.utc)}}},
+            projection={"_id": 1},
+        )
+        return token if doc else None
+
+    @staticmethod
+    async def _release_slot(token: Optional[str]):
+        if token:
+            await db.scheduler_state.update_one(_DOMAIN_JOB_SLOTS, {"$pull": {"holders": {"token": token}}})
+
+    async def _fill(self):
+        now = datetime.now(timezone.utc)
+        # Domains with a running job or a job waiting out a retry backoff keep their order
+        blocked = set(await db.domain_jobs.distinct("domain_id", {"status": "running"}))
+        blocked |= set(await db.domain_jobs.distinct("domain_id", {"status": "queued", "run_after": {"$gt": now}}))
+        for _ in range(DOMAIN_JOB_CONCURRENCY):
+            if time.monotonic() - self._last_start < DOMAIN_JOB_MIN_INTERVAL:
+                break
+            slot = await self._reserve_slot()
+            if not slot:
+                break
+            job = await db.domain_jobs.find_one_and_update(
+                {"status": "queued", "run_after": {"$lte": now}, "domain_id": {"$nin": list(blocked)}, "cancel_requested": {"$ne": True}},
+                {"$set": {"status": "running", "started_at": now, "heartbeat_at": now, "worker": WORKER_ID, "slot": slot}, "$inc": {"attempts": 1}},
+                sort=[("created_at", 1)], projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+            )
+            if not job:
+                await self._release_slot(slot)
+                break
+            blocked.add(job["domain_id"])
+            self._last_start = time.monotonic()
+            self.active[job["id"]] = asyncio.create_task(self._execute(job))
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(_DOMAIN_JOB_HEARTBEAT)
+            job = await db.domain_jobs.find_one_and_update(
+                {"id": job_id, "status": "running", "worker": WORKER_ID},
+                {"$set": {"heartbeat_at": datetime.now(timezone.utc)}},
+                projection={"_id": 0, "cancel_requested": 1},
+            )
+            if job is None or job.get("cancel_requested"):
+                # Cancelled, or requeued for another worker after a stall
+                self._cancelling.add(job_id)
+                self.active[job_id].cancel()
+                return
+
+    async def _execute(self, job: dict):
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            await _DOMAIN_JOB_HANDLERS[job["kind"]](job)
+        except asyncio.CancelledError:
+            if job["id"] in self._cancelling:
+                await self._finish(job, "cancelled", "cancelled")
+            else:
+                await self._finish(job, "requeue", "worker shutdown")
+        except Exception as e:
+            retry = job["attempts"] < job.get("max_attempts", DOMAIN_JOB_MAX_ATTEMPTS)
+            logger.warning(f"Domain job {job['kind']} for {job['domain_name']} failed (attempt {job['attempts']}): {e}")
+            await self._finish(job, "retry" if retry else "failed", str(e))
+        else:
+            await self._finish(job, "done")
+        finally:
+            heartbeat.cancel()
+            self.active.pop(job["id"], None)
+            self._cancelling.discard(job["id"])
+            self.wakeup.set()
+
+    async def _finish(self, job: dict, outcome: str, error: Optional[str] = None):
+        now = datetime.now(timezone.utc)
+        mine = {"id": job["id"], "worker": WORKER_ID}
+        try:
+            if outcome in ("retry", "requeue"):
+                delay = DOMAIN_JOB_RETRY_BASE * (2 ** (job["attempts"] - 1)) if outcome == "retry" else 0
+                await db.domain_jobs.update_one(mine, {"$set": {
+                    "status": "queued", "run_after": now + timedelta(seconds=delay), "worker": None, "slot": None, "last_error": error,
+                }})
+                return
+            result = await db.domain_jobs.update_one(mine, {"$set": {"status": outcome, "finished_at": now, "slot": None, "last_error": error}})
+            if result.modified_count:
+                await self._report(job, outcome)
+        finally:
+            await self._release_slot(job.get("slot"))
+
+    @staticmethod
+    async def _report(job: dict, outcome: str):
+        if job.get("import_job_id"):
+            await _mark_import_domain(job["import_job_id"], job["domain_name"], "done" if outcome == "done" else "failed")
+
+    async def counts(self) -> Dict[str, int]:
+        counts = {k: 0 for k in ["queued", "running", "done", "failed", "cancelled"]}
+        async for row in db.domain_jobs.aggregate([{"$group": {"_id": "$status", "n": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["n"]
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker": WORKER_ID,
+            "running_here": len(self.active),
+            "concurrency": DOMAIN_JOB_CONCURRENCY,
+            "min_interval_seconds": DOMAIN_JOB_MIN_INTERVAL,
+            "max_attempts": DOMAIN_JOB_MAX_ATTEMPTS,
+        }
+
+domain_job_supervisor = DomainJobSupervisor()
 
 # Public Site API - domain bazlı içerik sunma
 @api_router.get("/site/{domain_name}")
+@cached(site_data_cache)
 async def get_site_data(domain_name: str):
     """Get complete site data for a domain - used by frontend to render the site"""
     domain = await db.domains.find_one({"domain_name": domain_name}, {"_id": 0})
@@ -1007,10 +1866,13 @@ async def get_domain_by_name(domain_name: str):
 @api_router.delete("/domains/{domain_id}")
 async def delete_domain(domain_id: str):
     """Delete a domain"""
+    await domain_job_supervisor.cancel_domain(domain_id)
     await db.domains.delete_one({"id": domain_id})
     await db.domain_sites.delete_many({"domain_id": domain_id})
     await db.domain_performance.delete_many({"domain_id": domain_id})
     await db.articles.delete_many({"domain_id": domain_id})
+    site_data_cache.invalidate()
+    invalidate_article_caches()
     logger.info(f"Domain deleted: {domain_id}")
     return {"message": "Domain deleted"}
 
@@ -1020,6 +1882,7 @@ async def update_domain(domain_id: str, data: Dict[str, Any]):
     data.pop("id", None)
     data.pop("_id", None)
     await db.domains.update_one({"id": domain_id}, {"$set": data})
+    site_data_cache.invalidate()
     updated = await db.domains.find_one({"id": domain_id}, {"_id": 0})
     return updated
 
@@ -1052,118 +1915,261 @@ async def get_domain_sites(domain_id: str):
 
 # ============== GODADDY API INTEGRATION ==============
 
-@api_router.get("/godaddy/domains")
-async def list_godaddy_domains():
-    """Fetch all domains from GoDaddy account with hosting status"""
-    if not GODADDY_API_KEY or not GODADDY_API_SECRET:
-        raise HTTPException(status_code=500, detail="GoDaddy API credentials not configured")
-    
-    headers = {
+GODADDY_SYNC_INTERVAL = int(get_optional_env("GODADDY_SYNC_INTERVAL", "21600"))  # 6 saat
+GODADDY_PAGE_LIMIT = 500  # GoDaddy max page size for marker pagination
+GODADDY_FIRST_SYNC_WAIT = 60  # seconds the first listing waits for the leader's sync
+PARKED_NS_PATTERNS = ["domaincontrol.com", "parking", "godaddy", "sedoparking", "bodis"]
+
+def classify_hosting(nameservers: List[str]) -> str:
+    if not nameservers:
+        return "parked"
+    ns_str = " ".join(nameservers).lower()
+    for pattern in PARKED_NS_PATTERNS:
+        if pattern in ns_str:
+            return "parked"
+    return "hosted"
+
+def _godaddy_headers() -> Dict[str, str]:
+    return {
         "Authorization": f"sso-key {GODADDY_API_KEY}:{GODADDY_API_SECRET}",
         "Content-Type": "application/json",
         "Accept": "application/json"
     }
-    
-    all_domains = []
-    marker = None
-    
-    try:
-        async with httpx.AsyncClient(timeout=60) as client:
+
+class GoDaddySync:
+    """Mirrors the GoDaddy account's ACTIVE domains into `godaddy_domains`.
+
+    Walks the account with marker pagination, upserting each page; domains not
+    seen in a completed, non-empty sync (expired, transferred out) are removed afterwards.
+    Admin listing reads only the collection, never GoDaddy.
+
+    Runs on the leader only: on its interval, or when any worker flags a run
+    through ``requests``. The outcome is stored there for every worker to report.
+    """
+
+    def __init__(self):
+        self.is_running = False
+        self.task = None
+        self.lock = asyncio.Lock()
+        self.requests = RunRequest("godaddy_sync")
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info(f"GoDaddy sync started (interval: {GODADDY_SYNC_INTERVAL}s)")
+
+    async def stop(self):
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self) -> Dict[str, Any]:
+        """Full sync; concurrent callers wait for the running one. Raises HTTPException on auth errors."""
+        async with self.lock:
+            sync_id = str(uuid.uuid4())
+            synced = pages = 0
+            marker = None
             while True:
-                params = {"statuses": "ACTIVE", "limit": 500, "includes": "nameServers"}
+                params = {"statuses": "ACTIVE", "limit": GODADDY_PAGE_LIMIT, "includes": "nameServers"}
                 if marker:
                     params["marker"] = marker
-                
-                response = await client.get(
-                    "https://api.godaddy.com/v1/domains",
-                    headers=headers,
-                    params=params
-                )
-                
+                response = await http_clients.get("godaddy", "/v1/domains", headers=_godaddy_headers(), params=params)
                 if response.status_code == 401:
                     raise HTTPException(status_code=401, detail="GoDaddy API kimlik doğrulama hatası")
                 if response.status_code == 403:
                     raise HTTPException(status_code=403, detail="GoDaddy API erişim reddedildi. Hesabınızda yeterli domain olmalı.")
-                
                 response.raise_for_status()
                 batch = response.json()
-                
                 if not batch:
                     break
-                
-                all_domains.extend(batch)
-                
-                if len(batch) < 500:
+                pages += 1
+                synced += await self._store_page(batch, sync_id)
+                if len(batch) < GODADDY_PAGE_LIMIT:
                     break
                 marker = batch[-1].get("domain")
-        
-        # Check which domains are already in our platform
-        existing_domains = await db.domains.find({}, {"_id": 0, "domain_name": 1}).to_list(500)
-        existing_names = {d["domain_name"] for d in existing_domains}
-        
-        PARKED_NS_PATTERNS = ["domaincontrol.com", "parking", "godaddy", "sedoparking", "bodis"]
-        
-        def classify_hosting(nameservers):
-            if not nameservers:
-                return "parked"
-            ns_str = " ".join(nameservers).lower()
-            for pattern in PARKED_NS_PATTERNS:
-                if pattern in ns_str:
-                    return "parked"
-            return "hosted"
-        
-        result = []
-        stats = {"total": 0, "parked": 0, "hosted": 0, "platform": 0}
-        
-        for d in all_domains:
-            ns = d.get("nameServers") or []
+            removed = 0
+            if pages and synced:
+                # Only a walk that actually returned domains may prune; an empty answer
+                # (API hiccup, wrong account) must not wipe the mirror
+                removed = (await db.godaddy_domains.delete_many({"sync_id": {"$ne": sync_id}})).deleted_count
+            else:
+                logger.warning("GoDaddy sync returned no domains; keeping the existing mirror")
+            logger.info(f"GoDaddy sync: {synced} domains in {pages} pages, {removed} removed")
+            return {"synced": synced, "removed": removed, "pages": pages}
+
+    @staticmethod
+    async def _store_page(batch: list, sync_id: str) -> int:
+        now = datetime.now(timezone.utc)
+        ops = []
+        for d in batch:
             domain_name = d.get("domain", "")
-            already_added = domain_name in existing_names
-            hosting_status = "platform" if already_added else classify_hosting(ns)
-            
-            stats["total"] += 1
-            stats[hosting_status] += 1
-            
-            result.append({
+            if not domain_name:
+                continue
+            ns = d.get("nameServers") or []
+            expires = d.get("expires", "")
+            try:
+                expires_at = datetime.fromisoformat(expires.replace("Z", "+00:00")) if expires else None
+            except ValueError:
+                expires_at = None
+            ops.append(UpdateOne({"domain": domain_name}, {"$set": {
                 "domain": domain_name,
                 "status": d.get("status", "UNKNOWN"),
-                "expires": d.get("expires", ""),
+                "expires": expires,
+                "expires_at": expires_at,
                 "renewable": d.get("renewable", False),
                 "renew_auto": d.get("renewAuto", False),
                 "locked": d.get("locked", False),
                 "privacy": d.get("privacy", False),
                 "nameServers": ns,
+                "ns_class": classify_hosting(ns),
                 "created_at": d.get("createdAt", ""),
-                "already_added": already_added,
-                "hosting_status": hosting_status
-            })
-        
-        return {"total": len(result), "stats": stats, "domains": result}
-    
-    except HTTPException:
-        raise
-    except httpx.HTTPStatusError as e:
-        logger.error(f"GoDaddy API error: {e.response.status_code} - {e.response.text}")
-        raise HTTPException(status_code=502, detail=f"GoDaddy API hatası: {e.response.status_code}")
-    except Exception as e:
-        logger.error(f"GoDaddy request error: {e}")
-        raise HTTPException(status_code=500, detail="GoDaddy API'ye bağlanılamadı")
+                "sync_id": sync_id,
+                "synced_at": now,
+            }}, upsert=True))
+        if ops:
+            await db.godaddy_domains.bulk_write(ops, ordered=False)
+        return len(ops)
+
+    async def _run_quietly(self) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            return await self.run(), None
+        except Exception as e:
+            error = str(getattr(e, "detail", e))
+            logger.error(f"GoDaddy sync failed: {error}")
+            return None, error
 
+    async def _run_loop(self):
+        next_run = 0.0
+        while self.is_running:
+            requested = False
+            try:
+                requested = await self.requests.claim(WORKER_ID)
+                if requested or time.monotonic() >= next_run:
+                    result, error = await self._run_quietly()
+                    next_run = time.monotonic() + GODADDY_SYNC_INTERVAL
+                    await self.requests.finish(WORKER_ID, result, error)
+                await asyncio.sleep(RUN_REQUEST_POLL)
+            except asyncio.CancelledError:
+                if requested:
+                    await asyncio.shield(self.requests.release(WORKER_ID))
+                break
+            except Exception as e:
+                logger.error(f"GoDaddy sync loop error: {e}")
+                await asyncio.sleep(RUN_REQUEST_POLL)
 
-@api_router.post("/godaddy/import")
-async def import_godaddy_domain(data: Dict[str, Any], background_tasks: BackgroundTasks):
-    """Import a domain from GoDaddy into the platform"""
-    domain_name = data.get("domain_name", "").strip()
-    if not domain_name:
-        raise HTTPException(status_code=400, detail="Domain adı gerekli")
-    
-    existing = await db.domains.find_one({"domain_name": domain_name})
-    if existing:
-        raise HTTPException(status_code=400, detail="Bu domain zaten platformda mevcut")
-    
-    display_name = data.get("display_name", domain_name.split(".")[0].capitalize())
-    focus = data.get("focus", "bonus")
-    
+    async def status(self) -> Dict[str, Any]:
+        shared = await self.requests.get() or {}
+        return {
+            "in_progress": shared.get("status") == "running",
+            "requested": shared.get("status") == "requested",
+            "last_sync": _iso(shared.get("last_run")),
+            "last_result": shared.get("last_result"),
+            "last_error": shared.get("last_error"),
+            "interval_seconds": GODADDY_SYNC_INTERVAL,
+        }
+
+godaddy_sync = GoDaddySync()
+
+_GODADDY_PROJECTION = {"_id": 0, "sync_id": 0, "synced_at": 0, "expires_at": 0}
+
+@api_router.get("/godaddy/domains")
+async def list_godaddy_domains(
+    hosting_status: Optional[str] = None,
+    expires_within_days: Optional[int] = None,
+    search: Optional[str] = None,
+    page: int = 1,
+    limit: int = 100,
+):
+    """List synced GoDaddy domains with hosting status (filtered and paged server-side)"""
+    sync_status = await godaddy_sync.status()
+    if sync_status["last_sync"] is None and not await db.godaddy_domains.estimated_document_count():
+        if not GODADDY_API_KEY or not GODADDY_API_SECRET:
+            raise HTTPException(status_code=500, detail="GoDaddy API credentials not configured")
+        # First use: nothing synced yet, ask the leader for a sync and wait for it
+        await godaddy_sync.requests.request()
+        done = await godaddy_sync.requests.wait(GODADDY_FIRST_SYNC_WAIT)
+        if done is None:
+            raise HTTPException(status_code=503, detail="GoDaddy senkronizasyonu sürüyor, lütfen biraz sonra tekrar deneyin")
+        if done.get("last_error"):
+            raise HTTPException(status_code=502, detail=f"GoDaddy API hatası: {done['last_error']}")
+        sync_status = await godaddy_sync.status()
+
+    page = max(1, page)
+    limit = max(1, min(limit, 500))
+    platform_names = await db.domains.distinct("domain_name")
+    on_platform = {"domain": {"$in": platform_names}}
+    off_platform = {"domain": {"$nin": platform_names}}
+
+    stats = {
+        "total": await db.godaddy_domains.count_documents({}),
+        "platform": await db.godaddy_domains.count_documents(on_platform),
+        "parked": await db.godaddy_domains.count_documents({"ns_class": "parked", **off_platform}),
+        "hosted": await db.godaddy_domains.count_documents({"ns_class": "hosted", **off_platform}),
+    }
+
+    query: Dict[str, Any] = {}
+    if hosting_status == "platform":
+        query.update(on_platform)
+    elif hosting_status in ("parked", "hosted"):
+        query.update({"ns_class": hosting_status, **off_platform})
+    if search:
+        query["domain"] = {**query.get("domain", {}), "$regex": re.escape(search.strip().lower())}
+    if expires_within_days is not None:
+        query["expires_at"] = {"$lte": datetime.now(timezone.utc) + timedelta(days=expires_within_days)}
+
+    total = await db.godaddy_domains.count_documents(query)
+    sort = [("expires_at", 1), ("domain", 1)] if expires_within_days is not None else [("domain", 1)]
+    docs = await db.godaddy_domains.find(query, _GODADDY_PROJECTION).sort(sort).skip((page - 1) * limit).limit(limit).to_list(limit)
+
+    # already_added only needs the names on this page
+    page_names = [d["domain"] for d in docs]
+    added = set(await db.domains.distinct("domain_name", {"domain_name": {"$in": page_names}})) if page_names else set()
+    for d in docs:
+        ns_class = d.pop("ns_class", "parked")
+        d["already_added"] = d["domain"] in added
+        d["hosting_status"] = "platform" if d["already_added"] else ns_class
+
+    return {
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "has_more": page * limit < total,
+        "stats": stats,
+        "sync": sync_status,
+        "domains": docs,
+    }
+
+@api_router.post("/godaddy/sync")
+async def trigger_godaddy_sync():
+    """Ask the leader for a GoDaddy inventory sync (runs in the background)"""
+    if not GODADDY_API_KEY or not GODADDY_API_SECRET:
+        raise HTTPException(status_code=500, detail="GoDaddy API credentials not configured")
+    started = await godaddy_sync.requests.request()
+    return {"started": started, **await godaddy_sync.status()}
+
+@api_router.get("/godaddy/sync-status")
+async def get_godaddy_sync_status():
+    """GoDaddy inventory sync state and stored domain count"""
+    return {"stored_count": await db.godaddy_domains.estimated_document_count(), **await godaddy_sync.status(), "leader": leader_election.status()}
+
+
+@api_router.post("/godaddy/import")
+async def import_godaddy_domain(data: Dict[str, Any]):
+    """Import a domain from GoDaddy into the platform"""
+    domain_name = data.get("domain_name", "").strip()
+    if not domain_name:
+        raise HTTPException(status_code=400, detail="Domain adı gerekli")
+    
+    existing = await db.domains.find_one({"domain_name": domain_name})
+    if existing:
+        raise HTTPException(status_code=400, detail="Bu domain zaten platformda mevcut")
+    
+    display_name = data.get("display_name", domain_name.split(".")[0].capitalize())
+    focus = data.get("focus", "bonus")
+    
     domain_create = DomainCreate(
         domain_name=domain_name,
         display_name=display_name,
@@ -1173,23 +2179,248 @@ async def import_godaddy_domain(data: Dict[str, Any], background_tasks: Backgrou
     
     domain_obj = Domain(**domain_create.model_dump())
     await db.domains.insert_one(domain_obj.model_dump())
+    site_data_cache.invalidate()
     
     # Copy global sites to domain
-    global_sites = await db.bonus_sites.find({"is_global": True, "is_active": True}, {"_id": 0}).to_list(100)
-    for site in global_sites:
-        domain_site = DomainSite(domain_id=domain_obj.id, site_id=site["id"])
-        await db.domain_sites.insert_one(domain_site.model_dump())
-        perf = DomainPerformance(domain_id=domain_obj.id, site_id=site["id"], performance_score=calculate_heuristic_score(site))
-        await db.domain_performance.insert_one(perf.model_dump())
+    await provision_domain_sites([domain_obj.id])
     
-    background_tasks.add_task(auto_generate_domain_content, domain_obj.id, domain_obj.domain_name, domain_obj.focus)
+    await domain_job_supervisor.enqueue(domain_obj.id, domain_obj.domain_name, domain_obj.focus)
     
     logger.info(f"GoDaddy domain imported: {domain_name}")
     return {"message": f"{domain_name} başarıyla eklendi!", "domain": domain_obj.model_dump()}
 
 
+# ── bulk import ──────────────────────────────────────────────────────
+
+BULK_IMPORT_MAX_DOMAINS = int(get_optional_env("BULK_IMPORT_MAX_DOMAINS", "1000"))
+_DOMAIN_NAME_RE = re.compile(r"^(?=.{4,253}$)([a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63}$")
+
+class BulkImportRequest(BaseModel):
+    domain_names: List[str]
+    focus: str = "bonus"
+
+async def _mark_import_domain(job_id: str, domain_name: str, outcome: str):
+    counter = "content_done" if outcome == "done" else "content_failed"
+    job = await db.import_jobs.find_one_and_update(
+        {"id": job_id},
+        {"$set": {"domains.$[d].status": outcome, "updated_at": datetime.now(timezone.utc).isoformat()}, "$inc": {counter: 1}},
+        array_filters=[{"d.domain": domain_name}],
+        projection={"_id": 0, "content_total": 1, "content_done": 1, "content_failed": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if job and job["content_done"] + job["content_failed"] >= job["content_total"]:
+        await db.import_jobs.update_one({"id": job_id, "status": "generating"}, {"$set": {
+            "status": "completed", "finished_at": datetime.now(timezone.utc).isoformat(),
+        }})
+
+async def run_bulk_import(job_id: str):
+    """Provision all pending domains of an import job, then queue their starter content.
+
+    Idempotent, so unfinished jobs are simply re-run after a restart.
+    """
+    job = await db.import_jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job or job["status"] in ("completed", "failed"):
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    try:
+        await db.import_jobs.update_one({"id": job_id}, {"$set": {"status": "provisioning", "updated_at": now}})
+        entries = job["domains"]
+        pending = [e["domain"] for e in entries if e["status"] == "pending"]
+
+        # Domains inserted by this job before a restart still need their site rows
+        existing = await db.domains.find({"domain_name": {"$in": pending}}, {"_id": 0, "id": 1, "domain_name": 1, "import_job_id": 1}).to_list(None)
+        ours = {d["domain_name"]: d["id"] for d in existing if d.get("import_job_id") == job_id}
+        taken = {d["domain_name"] for d in existing if d.get("import_job_id") != job_id}
+
+        new_docs = []
+        for name in pending:
+            if name in ours or name in taken:
+                continue
+            display_name = name.split(".")[0].capitalize()
+            domain_obj = Domain(**DomainCreate(
+                domain_name=name, display_name=display_name, focus=job["focus"],
+                meta_title=f"{display_name} - En Güncel Rehber",
+            ).model_dump())
+            new_docs.append({**domain_obj.model_dump(), "import_job_id": job_id})
+        if new_docs:
+            try:
+                await db.domains.insert_many(new_docs, ordered=False)
+            except BulkWriteError as e:
+                # Lost a race with another import: those names are skipped below
+                for err in e.details.get("writeErrors", []):
+                    taken.add(new_docs[err["index"]]["domain_name"])
+            ours.update({d["domain_name"]: d["id"] for d in new_docs if d["domain_name"] not in taken})
+            site_data_cache.invalidate()
+
+        if ours:
+            await db.domain_sites.delete_many({"domain_id": {"$in": list(ours.values())}})
+            await db.domain_performance.delete_many({"domain_id": {"$in": list(ours.values())}})
+            await provision_domain_sites(list(ours.values()))
+
+        for e in entries:
+            if e["status"] != "pending":
+                continue
+            if e["domain"] in ours:
+                e.update(status="queued", domain_id=ours[e["domain"]])
+            else:
+                e.update(status="skipped", reason="already_exists")
+        queued = [e for e in entries if e["status"] == "queued"]
+        await db.import_jobs.update_one({"id": job_id}, {"$set": {
+            "domains": entries,
+            "status": "generating" if queued else "completed",
+            "provisioned": sum(1 for e in entries if e.get("domain_id")),
+            "content_total": sum(1 for e in entries if e.get("domain_id")),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            **({} if queued else {"finished_at": datetime.now(timezone.utc).isoformat()}),
+        }})
+        for e in queued:
+            await domain_job_supervisor.enqueue(e["domain_id"], e["domain"], job["focus"], import_job_id=job_id)
+        logger.info(f"Bulk import {job_id}: {len(ours)} domains provisioned, {len(queued)} queued for content")
+    except Exception as e:
+        logger.error(f"Bulk import {job_id} failed: {e}")
+        await db.import_jobs.update_one({"id": job_id}, {"$set": {"status": "failed", "error": str(e), "updated_at": datetime.now(timezone.utc).isoformat()}})
+
+_import_tasks: set = set()
+
+def _spawn_bulk_import(job_id: str):
+    task = asyncio.create_task(run_bulk_import(job_id))
+    _import_tasks.add(task)
+    task.add_done_callback(_import_tasks.discard)
+
+async def resume_import_jobs():
+    """Re-run import jobs interrupted by a restart"""
+    jobs = await db.import_jobs.find({"status": {"$in": ["queued", "provisioning", "generating"]}}, {"_id": 0}).to_list(100)
+    for job in jobs:
+        if job["status"] == "generating":
+            # enqueue is a no-op for domains whose content job is already queued/running
+            for e in job["domains"]:
+                if e["status"] == "queued":
+                    await domain_job_supervisor.enqueue(e["domain_id"], e["domain"], job["focus"], import_job_id=job["id"])
+        else:
+            _spawn_bulk_import(job["id"])
+    if jobs:
+        logger.info(f"Resumed {len(jobs)} import job(s)")
+
+@api_router.post("/godaddy/import-bulk")
+async def import_godaddy_domains_bulk(req: BulkImportRequest):
+    """Import many GoDaddy domains as one persistent job (poll /godaddy/import-jobs/{id})"""
+    names: List[str] = []
+    skipped: List[Dict[str, str]] = []
+    seen = set()
+    for raw in req.domain_names:
+        name = raw.strip().lower()
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        if not _DOMAIN_NAME_RE.match(name):
+            skipped.append({"domain": name, "reason": "invalid"})
+        else:
+            names.append(name)
+    if not names:
+        raise HTTPException(status_code=400, detail="Geçerli domain adı yok")
+    if len(names) > BULK_IMPORT_MAX_DOMAINS:
+        raise HTTPException(status_code=400, detail=f"Tek seferde en fazla {BULK_IMPORT_MAX_DOMAINS} domain eklenebilir")
+
+    # One query each for duplicates and (when synced) GoDaddy ownership
+    existing = set(await db.domains.distinct("domain_name", {"domain_name": {"$in": names}}))
+    owned = None
+    if await db.godaddy_domains.estimated_document_count():
+        owned = set(await db.godaddy_domains.distinct("domain", {"domain": {"$in": names}}))
+    entries = []
+    for name in names:
+        if name in existing:
+            skipped.append({"domain": name, "reason": "already_exists"})
+        elif owned is not None and name not in owned:
+            skipped.append({"domain": name, "reason": "not_in_godaddy"})
+        else:
+            entries.append({"domain": name, "status": "pending"})
+
+    now = datetime.now(timezone.utc).isoformat()
+    job = {
+        "id": str(uuid.uuid4()),
+        "type": "godaddy_bulk_import",
+        "status": "queued" if entries else "completed",
+        "focus": req.focus,
+        "requested": len(req.domain_names),
+        "accepted": len(entries),
+        "skipped": skipped,
+        "domains": entries,
+        "provisioned": 0,
+        "content_total": 0,
+        "content_done": 0,
+        "content_failed": 0,
+        "created_at": now,
+        "updated_at": now,
+    }
+    await db.import_jobs.insert_one(dict(job))
+    if entries:
+        _spawn_bulk_import(job["id"])
+    logger.info(f"Bulk import job {job['id']}: {len(entries)} accepted, {len(skipped)} skipped")
+    return {k: v for k, v in job.items() if k != "domains"}
+
+def _import_job_progress(job: dict) -> dict:
+    total = job.get("content_total") or 0
+    done = job.get("content_done", 0) + job.get("content_failed", 0)
+    return {**job, "progress": round(done / total * 100, 1) if total else (100.0 if job["status"] == "completed" else 0.0)}
+
+@api_router.get("/godaddy/import-jobs")
+async def list_import_jobs(limit: int = 20):
+    """Recent bulk import jobs (without per-domain detail)"""
+    jobs = await db.import_jobs.find({}, {"_id": 0, "domains": 0}).sort("created_at", -1).limit(limit).to_list(limit)
+    return {"jobs": [_import_job_progress(j) for j in jobs], "queue": await domain_job_supervisor.counts()}
+
+@api_router.get("/godaddy/import-jobs/{job_id}")
+async def get_import_job(job_id: str):
+    """Bulk import job progress with per-domain status"""
+    job = await db.import_jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return {**_import_job_progress(job), "queue": await domain_job_supervisor.counts()}
+
+# ── domain job endpoints ─────────────────────────────────────────────
+
+@api_router.get("/domain-jobs")
+async def list_domain_jobs(status_filter: Optional[str] = Query(None, alias="status"), domain_id: Optional[str] = None, limit: int = 50):
+    """Domain job queue: recent jobs, counts per status and supervisor settings"""
+    query: Dict[str, Any] = {}
+    if status_filter:
+        query["status"] = status_filter
+    if domain_id:
+        query["domain_id"] = domain_id
+    jobs = await db.domain_jobs.find(query, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
+    return {"jobs": jobs, "counts": await domain_job_supervisor.counts(), "supervisor": domain_job_supervisor.stats()}
+
+@api_router.get("/domain-jobs/{job_id}")
+async def get_domain_job(job_id: str):
+    job = await db.domain_jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@api_router.post("/domain-jobs/{job_id}/cancel")
+async def cancel_domain_job(job_id: str):
+    """Cancel a queued job now, or a running one at its next heartbeat"""
+    job = await domain_job_supervisor.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@api_router.post("/domain-jobs/{job_id}/retry")
+async def retry_domain_job(job_id: str):
+    """Requeue a failed or cancelled job with a fresh attempt budget"""
+    job = await db.domain_jobs.find_one_and_update(
+        {"id": job_id, "status": {"$in": ["failed", "cancelled"]}},
+        {"$set": {"status": "queued", "attempts": 0, "run_after": datetime.now(timezone.utc), "cancel_requested": False, "last_error": None}},
+        projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+    )
+    if not job:
+        raise HTTPException(status_code=400, detail="Only failed or cancelled jobs can be retried")
+    domain_job_supervisor.wakeup.set()
+    return job
+
 # Bonus Sites
 @api_router.get("/bonus-sites")
+@cached(bonus_sites_cache)
 async def get_all_bonus_sites(limit: int = 500, category: str = None):
     """Get all global bonus sites sorted by sort_order"""
     query = {"is_active": True}
@@ -1200,6 +2431,7 @@ async def get_all_bonus_sites(limit: int = 500, category: str = None):
 
 
 @api_router.get("/firma/{slug}")
+@cached(firma_cache)
 async def get_firma_detail(slug: str):
     """Get firm detail page data by slug"""
     name_query = slug.lower().replace("-", " ").replace(".", "")
@@ -1248,6 +2480,7 @@ async def create_bonus_site(site: Dict[str, Any]):
     site_obj = BonusSite(**site)
     site_obj.bonus_value = extract_bonus_value(site_obj.bonus_amount)
     await db.bonus_sites.insert_one(site_obj.model_dump())
+    invalidate_bonus_site_caches()
     logger.info(f"Bonus site created: {site_obj.name}")
     return site_obj
 
@@ -1255,6 +2488,7 @@ async def create_bonus_site(site: Dict[str, Any]):
 async def delete_bonus_site(site_id: str):
     """Delete a bonus site"""
     await db.bonus_sites.delete_one({"id": site_id})
+    invalidate_bonus_site_caches()
     return {"message": "Site deleted"}
 
 @api_router.put("/bonus-sites/{site_id}")
@@ -1267,6 +2501,7 @@ async def update_bonus_site(site_id: str, data: Dict[str, Any]):
     if "features" in data and isinstance(data["features"], str):
         data["features"] = [f.strip() for f in data["features"].split(",") if f.strip()]
     await db.bonus_sites.update_one({"id": site_id}, {"$set": data})
+    invalidate_bonus_site_caches()
     updated = await db.bonus_sites.find_one({"id": site_id}, {"_id": 0})
     return updated
 
@@ -1348,6 +2583,7 @@ async def create_article(article: Dict[str, Any]):
     article["content_updated_at"] = datetime.now(timezone.utc).isoformat()
     article_obj = Article(**article)
     await db.articles.insert_one(article_obj.model_dump())
+    invalidate_article_caches()
     logger.info(f"Article created: {article_obj.title}")
     return article_obj.model_dump()
 
@@ -1362,6 +2598,7 @@ async def update_article(article_id: str, data: Dict[str, Any]):
     if "title" in data and "slug" not in data:
         data["slug"] = slugify(data["title"])
     await db.articles.update_one({"id": article_id}, {"$set": data})
+    invalidate_article_caches()
     updated = await db.articles.find_one({"id": article_id}, {"_id": 0})
     return updated
 
@@ -1369,9 +2606,11 @@ async def update_article(article_id: str, data: Dict[str, Any]):
 async def delete_article(article_id: str):
     """Delete an article"""
     await db.articles.delete_one({"id": article_id})
+    invalidate_article_caches()
     return {"message": "Makale silindi"}
 
 @api_router.get("/articles/latest")
+@cached(latest_articles_cache)
 async def get_latest_articles(limit: int = 10, category: Optional[str] = None):
     """Get latest published articles"""
     query: Dict[str, Any] = {"is_published": True}
@@ -1417,6 +2656,7 @@ async def create_domain_article(domain_id: str, article: Dict[str, Any]):
     article["content_updated_at"] = datetime.now(timezone.utc).isoformat()
     article_obj = Article(**article)
     await db.articles.insert_one(article_obj.model_dump())
+    invalidate_article_caches()
     logger.info(f"Article created: {article_obj.title}")
     return article_obj
 
@@ -1424,7 +2664,10 @@ async def create_domain_article(domain_id: str, article: Dict[str, Any]):
 @api_router.post("/auto-content/generate-article")
 async def auto_generate_article(domain_id: Optional[str] = None, topic: str = "deneme bonusu rehberi"):
     """Auto generate SEO article"""
-    existing = await db.articles.find_one({"title": {"$regex": topic, "$options": "i"}, "domain_id": domain_id})
+    existing = await db.articles.find_one({"$or": [
+        {"title": {"$regex": topic, "$options": "i"}},
+        {"slug": slugify(topic), "is_auto_generated": True},
+    ], "domain_id": domain_id})
     if existing:
         return {"status": "skipped", "reason": "Similar article exists", "article_id": existing.get("id")}
     
@@ -1459,7 +2702,13 @@ KURALLAR:
         content_updated_at=datetime.now(timezone.utc).isoformat()
     )
     
-    await db.articles.insert_one(article.model_dump())
+    try:
+        await db.articles.insert_one(article.model_dump())
+    except DuplicateKeyError:
+        # Generated concurrently under the same slug (auto_article_slug index)
+        existing = await db.articles.find_one({"domain_id": domain_id, "slug": article.slug, "is_auto_generated": True}, {"_id": 0, "id": 1})
+        return {"status": "skipped", "reason": "Similar article exists", "article_id": (existing or {}).get("id")}
+    invalidate_article_caches()
     logger.info(f"Auto article generated: {article.title}")
     return {"status": "created", "article_id": article.id, "title": article.title}
 
@@ -1550,29 +2799,45 @@ async def clear_content_queue(status: str = "completed"):
 
 @api_router.post("/scheduler/start")
 async def start_scheduler():
-    """Start the content scheduler"""
-    await content_scheduler.start()
-    return {"status": "started", "interval_minutes": content_scheduler.interval_minutes, "batch_size": content_scheduler.batch_size}
+    """Start the content scheduler (on every consumer, via the shared state)"""
+    state = await update_scheduler_state({"enabled": True, "next_run_at": datetime.now(timezone.utc)})
+    return {"status": "started", "interval_minutes": state["interval_minutes"], "batch_size": state["batch_size"]}
 
 @api_router.post("/scheduler/stop")
 async def stop_scheduler():
-    """Stop the content scheduler"""
-    await content_scheduler.stop()
+    """Stop the content scheduler; batches already running finish"""
+    await update_scheduler_state({"enabled": False})
     return {"status": "stopped"}
 
 @api_router.get("/scheduler/status")
 async def get_scheduler_status():
     """Get scheduler status"""
+    state = await get_scheduler_state()
+    workers = await content_scheduler.live_workers()
+    bulk = state.get("bulk") or {}
     pending = await db.content_queue.count_documents({"status": "pending"})
     completed = await db.content_queue.count_documents({"status": "completed"})
     failed = await db.content_queue.count_documents({"status": "failed"})
+    pipelines = [p for w in workers for p in (w.get("pipelines") or {}).values()]
+    throughput = sum(p["throughput_per_minute"] for p in pipelines)
+    in_flight = sum(p["in_flight"] for p in pipelines)
     return {
-        "is_running": content_scheduler.is_running,
-        "is_bulk_running": content_scheduler.is_bulk_running,
-        "interval_minutes": content_scheduler.interval_minutes,
-        "batch_size": content_scheduler.batch_size,
-        "last_run": content_scheduler.last_run,
-        "total_generated": content_scheduler.total_generated,
+        "is_running": state["enabled"],
+        "is_bulk_running": bulk.get("status") == "requested" or any(w.get("bulk_running") for w in workers),
+        "interval_minutes": state["interval_minutes"],
+        "batch_size": state["batch_size"],
+        "next_run_at": state["next_run_at"],
+        "last_run": state.get("last_run"),
+        "total_generated": state.get("total_generated", 0),
+        "bulk": bulk or None,
+        "embedded": CONTENT_WORKER_EMBEDDED,
+        "worker": WORKER_ID,
+        "workers": workers,
+        "leases_held": sum(w.get("leases_held", 0) for w in workers),
+        "pipelines": pipelines,
+        "in_flight": in_flight,
+        "throughput_per_minute": round(throughput, 2),
+        "backlog_eta_seconds": round((pending + in_flight) / throughput * 60) if throughput else None,
         "pending_items": pending,
         "completed_items": completed,
         "failed_items": failed,
@@ -1593,13 +2858,18 @@ async def set_scheduler_interval(data: Dict[str, Any]):
     minutes = data.get("minutes", 5)
     if minutes < 1:
         raise HTTPException(status_code=400, detail="Minimum 1 dakika")
-    content_scheduler.interval_minutes = minutes
-    # Restart if running
-    if content_scheduler.is_running:
-        await content_scheduler.stop()
-        await content_scheduler.start()
+    await update_scheduler_state({"interval_minutes": minutes, "next_run_at": datetime.now(timezone.utc) + timedelta(minutes=minutes)})
     return {"interval_minutes": minutes}
 
+@api_router.put("/scheduler/concurrency")
+async def set_scheduler_concurrency(data: Dict[str, Any]):
+    """Set how many articles a batch generates in parallel"""
+    concurrency = data.get("concurrency", CONTENT_CONCURRENCY)
+    if not isinstance(concurrency, int) or not 1 <= concurrency <= 20:
+        raise HTTPException(status_code=400, detail="Eşzamanlılık 1-20 arasında olmalı")
+    await update_scheduler_state({"batch_size": concurrency})
+    return {"batch_size": concurrency}
+
 @api_router.post("/scheduler/run-now")
 async def run_scheduler_now():
     """Run scheduler immediately once (async in background)"""
@@ -1607,32 +2877,64 @@ async def run_scheduler_now():
     if pending == 0:
         return {"status": "empty", "message": "Kuyrukta bekleyen konu yok"}
     
-    # Run in background without awaiting
-    loop = asyncio.get_event_loop()
-    loop.create_task(content_scheduler._process_next())
+    # The next polling consumer takes the tick (within a few seconds), even while the scheduler is stopped
+    await update_scheduler_state({"run_once": True, "next_run_at": datetime.now(timezone.utc)})
     return {"status": "started", "message": "Makale üretimi arka planda başlatıldı", "pending": pending}
 
 
 # AI Tools
+def ai_stream_response(work: Callable[[], Awaitable[Any]]) -> StreamingResponse:
+    """SSE variant of an AI endpoint: start/progress events while the LLM runs, then the result"""
+    return StreamingResponse(
+        stream_result(work, heartbeat=SSE_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+def parse_ai_json(result: str) -> Optional[Dict[str, Any]]:
+    """JSON object from an LLM answer (optionally fenced in ```json), None when it is not valid"""
+    try:
+        cleaned = result.strip()
+        if "```json" in cleaned:
+            cleaned = cleaned.split("```json")[1].split("```")[0].strip()
+        elif "```" in cleaned:
+            cleaned = cleaned.split("```")[1].split("```")[0].strip()
+        parsed = json.loads(cleaned)
+    except Exception:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+async def _generate_content(topic: str) -> Dict[str, Any]:
+    content = await generate_ai_content(f"Konu: {topic}\nSEO uyumlu makale yaz.", hedge=True)
+    return {"content": content, "generated_at": datetime.now(timezone.utc).isoformat()}
+
 @api_router.post("/ai/generate-content")
 async def generate_content(request: Dict[str, Any]):
     """Generate AI content"""
+    return await _generate_content(request.get("topic", ""))
+
+@api_router.post("/ai/generate-content/stream")
+async def generate_content_stream(request: Dict[str, Any]):
+    """Generate AI content (SSE: start → progress → result → done)"""
     topic = request.get("topic", "")
-    content = await generate_ai_content(f"Konu: {topic}\nSEO uyumlu makale yaz.")
-    return {"content": content, "generated_at": datetime.now(timezone.utc).isoformat()}
+    return ai_stream_response(lambda: _generate_content(topic))
 
 @api_router.post("/ai/competitor-analysis")
-async def competitor_analysis(request: Dict[str, Any]):
-    """Analyze competitor"""
+async def competitor_analysis(request: Dict[str, Any], refresh: bool = False):
+    """Analyze competitor (cached; refresh=true regenerates)"""
     url = request.get("competitor_url", "")
-    content = await generate_ai_content(f"Rakip site analizi: {url}")
-    return {"analysis": content, "url": url}
+    content, cached = await cached_ai_content(
+        f"Rakip site analizi: {url}", DEFAULT_AI_SYSTEM_MESSAGE, SEO_TOOL_TEMPLATES["competitor_analysis"], refresh=refresh,
+    )
+    return {"analysis": content, "url": url, "cached": cached}
 
 @api_router.post("/ai/keyword-gap-analysis")
-async def keyword_gap_analysis(request: KeywordGapRequest):
-    """Keyword gap analysis"""
-    content = await generate_ai_content(f"Anahtar kelime analizi: {', '.join(request.keywords)}")
-    return {"analysis": content, "keywords": request.keywords}
+async def keyword_gap_analysis(request: KeywordGapRequest, refresh: bool = False):
+    """Keyword gap analysis (cached; refresh=true regenerates)"""
+    content, cached = await cached_ai_content(
+        f"Anahtar kelime analizi: {', '.join(request.keywords)}", DEFAULT_AI_SYSTEM_MESSAGE, SEO_TOOL_TEMPLATES["keyword_gap"], refresh=refresh,
+    )
+    return {"analysis": content, "keywords": request.keywords, "cached": cached}
 
 @api_router.get("/ai/weekly-seo-report")
 async def weekly_seo_report(domain_id: Optional[str] = None):
@@ -1661,6 +2963,8 @@ class SeoContentScoreRequest(BaseModel):
     title: str = ""
     content: str = ""
     target_keyword: str = ""
+    meta_title: str = ""
+    meta_description: str = ""
 
 class SeoCompetitorRequest(BaseModel):
     competitor_url: str
@@ -1737,8 +3041,8 @@ async def seo_dashboard(domain_id: Optional[str] = None):
     }
 
 @api_router.post("/seo/keyword-research")
-async def seo_keyword_research(req: SeoKeywordRequest):
-    """AI-powered keyword research with scoring and suggestions"""
+async def seo_keyword_research(req: SeoKeywordRequest, refresh: bool = False):
+    """AI-powered keyword research with scoring and suggestions (cached; refresh=true regenerates)"""
     prompt = f"""Sen bir SEO uzmanısın. Aşağıdaki anahtar kelimeler için detaylı bir analiz yap.
 
 Anahtar Kelimeler: {', '.join(req.keywords)}
@@ -1764,19 +3068,13 @@ Dil: {req.language}
   "summary": "genel değerlendirme"
 }}"""
 
-    result = await generate_ai_content(prompt, "Sen bir SEO ve dijital pazarlama uzmanısın. Sadece JSON formatında yanıt ver.")
-
-    # Try to parse JSON from response
-    parsed = None
-    try:
-        cleaned = result.strip()
-        if "```json" in cleaned:
-            cleaned = cleaned.split("```json")[1].split("```")[0].strip()
-        elif "```" in cleaned:
-            cleaned = cleaned.split("```")[1].split("```")[0].strip()
-        parsed = json.loads(cleaned)
-    except Exception:
-        parsed = {"raw_analysis": result, "keywords": req.keywords}
+    result, cached = await cached_ai_content(
+        prompt, "Sen bir SEO ve dijital pazarlama uzmanısın. Sadece JSON formatında yanıt ver.",
+        SEO_TOOL_TEMPLATES["keyword_research"], refresh=refresh,
+    )
+    parsed = parse_ai_json(result) or {"raw_analysis": result, "keywords": req.keywords}
+    if cached:
+        return {**parsed, "cached": True}  # already saved as a report when it was generated
 
     # Save report
     report = {
@@ -1789,11 +3087,9 @@ Dil: {req.language}
     await db.seo_reports.insert_one({**report})
     report.pop("_id", None)
 
-    return parsed
+    return {**parsed, "cached": False}
 
-@api_router.post("/seo/site-audit")
-async def seo_site_audit(req: SeoAuditRequest):
-    """Comprehensive SEO audit of current site content"""
+async def _site_audit_prompt(req: SeoAuditRequest) -> str:
     articles = await db.articles.find(
         {"domain_id": req.domain_id} if req.domain_id else {},
         {"_id": 0, "title": 1, "seo_title": 1, "seo_description": 1, "content": 1, "slug": 1, "tags": 1, "category": 1}
@@ -1852,19 +3148,11 @@ Site Verileri:
   "priority_actions": ["öncelikli aksiyon 1", "öncelikli aksiyon 2", "öncelikli aksiyon 3"],
   "summary": "genel değerlendirme"
 }}"""
+    return prompt
 
+async def _site_audit(req: SeoAuditRequest, prompt: str) -> Dict[str, Any]:
     result = await generate_ai_content(prompt, "Sen bir SEO denetçisi ve teknik SEO uzmanısın. Sadece JSON formatında yanıt ver.")
-
-    parsed = None
-    try:
-        cleaned = result.strip()
-        if "```json" in cleaned:
-            cleaned = cleaned.split("```json")[1].split("```")[0].strip()
-        elif "```" in cleaned:
-            cleaned = cleaned.split("```")[1].split("```")[0].strip()
-        parsed = json.loads(cleaned)
-    except Exception:
-        parsed = {"raw_analysis": result, "overall_score": 0}
+    parsed = parse_ai_json(result) or {"raw_analysis": result, "overall_score": 0}
 
     report = {
         "id": str(uuid.uuid4()),
@@ -1878,66 +3166,167 @@ Site Verileri:
 
     return parsed
 
+@api_router.post("/seo/site-audit")
+async def seo_site_audit(req: SeoAuditRequest):
+    """Comprehensive SEO audit of current site content"""
+    return await _site_audit(req, await _site_audit_prompt(req))
+
+@api_router.post("/seo/site-audit/stream")
+async def seo_site_audit_stream(req: SeoAuditRequest):
+    """Comprehensive SEO audit (SSE: start → progress → result → done), saved like the plain one"""
+    prompt = await _site_audit_prompt(req)
+    return ai_stream_response(lambda: _site_audit(req, prompt))
+
 @api_router.post("/seo/content-score")
-async def seo_content_score(req: SeoContentScoreRequest):
-    """Score content for SEO quality"""
+async def seo_content_score(req: SeoContentScoreRequest, advice: bool = False, refresh: bool = False):
+    """Score content for SEO quality (local analyzer; advice=true adds cached LLM advice)"""
     content = req.content
     title = req.title
+    meta_title, meta_description = req.meta_title, req.meta_description
 
     if req.article_id and not content:
         article = await db.articles.find_one({"id": req.article_id}, {"_id": 0})
         if article:
             content = article.get("content", "")
             title = article.get("title", "")
+            meta_title = meta_title or article.get("seo_title", "")
+            meta_description = meta_description or article.get("seo_description", "")
 
     if not content:
         raise HTTPException(status_code=400, detail="İçerik gerekli")
 
-    word_count = len(content.split())
+    analysis = analyze_seo_content(content, title=title, keyword=req.target_keyword,
+                                   meta_title=meta_title, meta_description=meta_description)
+    result = {**analysis, "title": title, "analyzer": "local", "advice": None}
+    if not advice:
+        return result
 
-    prompt = f"""Sen bir SEO içerik analisti olarak bu makaleyi değerlendir.
+    metrics = {
+        key: analysis[key]
+        for key in ("word_count", "keyword_density", "scores", "paragraphs", "sentences", "readability", "weaknesses")
+    }
+    prompt = f"""Sen bir SEO içerik editörüsün. Aşağıdaki makale için ölçülmüş metrikler verildi; sayıları yeniden hesaplama.
+Ton, uzmanlık, güncellik (2026), CTA gücü ve okuyucu değeri hakkında niteliksel öneriler ver.
 
 Başlık: {title}
 Hedef Anahtar Kelime: {req.target_keyword or 'belirtilmedi'}
-Kelime Sayısı: {word_count}
+Ölçülen Metrikler: {json.dumps(metrics, ensure_ascii=False)}
 İçerik (ilk 500 kelime): {' '.join(content.split()[:500])}
 
 Şu JSON formatında yanıt ver (sadece JSON):
 {{
-  "overall_score": 75,
-  "scores": {{
-    "keyword_usage": 70,
-    "readability": 80,
-    "structure": 65,
-    "meta_quality": 60,
-    "content_depth": 75
-  }},
   "strengths": ["güçlü yön 1", "güçlü yön 2"],
   "weaknesses": ["zayıf yön 1", "zayıf yön 2"],
   "improvements": ["iyileştirme 1", "iyileştirme 2", "iyileştirme 3"],
-  "keyword_density": "yüzde tahmini",
-  "recommended_word_count": 1200,
   "summary": "özet değerlendirme"
 }}"""
+    text, cached = await cached_ai_content(
+        prompt, "Sen bir SEO içerik analisti ve editörüsün. Sadece JSON formatında yanıt ver.",
+        SEO_TOOL_TEMPLATES["content_score_advice"], refresh=refresh,
+    )
+    return {**result, "advice": parse_ai_json(text) or {"raw_analysis": text}, "cached": cached}
+
+# ── corpus scoring ───────────────────────────────────────────────────
+
+_SEO_BATCH_CHUNK = 100  # articles per worker task
+_SEO_BATCH_REPORT_LOWEST = 100  # weakest articles kept inline in the report; all scores go to seo_article_scores
+_seo_analyzer_pool: Optional[ProcessPoolExecutor] = None
+
+def seo_analyzer_pool() -> ProcessPoolExecutor:
+    """Process pool for corpus scoring, created on first use (spawned: no forked event loop or Mongo client)"""
+    global _seo_analyzer_pool
+    if _seo_analyzer_pool is None:
+        _seo_analyzer_pool = ProcessPoolExecutor(max_workers=SEO_ANALYZER_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _seo_analyzer_pool
+
+def shutdown_seo_analyzer_pool():
+    global _seo_analyzer_pool
+    if _seo_analyzer_pool is not None:
+        _seo_analyzer_pool.shutdown(wait=False, cancel_futures=True)
+        _seo_analyzer_pool = None
+
+async def score_articles(query: Dict[str, Any]) -> List[dict]:
+    """Score every matching article in the analyzer pool, streaming chunks from the cursor"""
+    loop = asyncio.get_running_loop()
+    pool = seo_analyzer_pool()
+    projection = {"_id": 0, "id": 1, "title": 1, "slug": 1, "content": 1, "seo_title": 1, "seo_description": 1}
+    results: List[dict] = []
+    pending: set = set()
+    chunk: List[dict] = []
+
+    async def submit(docs: List[dict]):
+        nonlocal pending
+        pending.add(loop.run_in_executor(pool, analyze_seo_batch, docs))
+        if len(pending) >= SEO_ANALYZER_WORKERS * 2:  # bound the articles held in memory
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                results.extend(future.result())
+
+    async for doc in db.articles.find(query, projection).batch_size(_SEO_BATCH_CHUNK):
+        chunk.append(doc)
+        if len(chunk) >= _SEO_BATCH_CHUNK:
+            await submit(chunk)
+            chunk = []
+    if chunk:
+        await submit(chunk)
+    for future in pending:
+        results.extend(await future)
+    return results
+
+@api_router.post("/seo/content-score/batch")
+async def seo_content_score_batch(domain_id: Optional[str] = None, limit: int = 50):
+    """Score the whole article corpus locally (title as keyword); saves a report and returns the weakest articles.
+
+    The report keeps the summary and the weakest articles; every article's score is
+    stored in `seo_article_scores` under the report id (one report document would
+    outgrow Mongo's 16MB limit on a large corpus).
+    """
+    query = {"domain_id": domain_id} if domain_id else {}
+    started = time.monotonic()
+    results = await score_articles(query)
+    results.sort(key=lambda r: r["overall_score"])
+
+    failed_rules: Dict[str, int] = {}
+    for r in results:
+        for rule_id in r["failed_rules"]:
+            failed_rules[rule_id] = failed_rules.get(rule_id, 0) + 1
+    summary = {
+        "articles": len(results),
+        "avg_score": round(sum(r["overall_score"] for r in results) / len(results), 1) if results else None,
+        "failed_rules": dict(sorted(failed_rules.items(), key=lambda item: -item[1])),
+        "duration_seconds": round(time.monotonic() - started, 2),
+    }
 
-    result = await generate_ai_content(prompt, "Sen bir SEO içerik analisti ve editörüsün. Sadece JSON formatında yanıt ver.")
-
-    parsed = None
-    try:
-        cleaned = result.strip()
-        if "```json" in cleaned:
-            cleaned = cleaned.split("```json")[1].split("```")[0].strip()
-        elif "```" in cleaned:
-            cleaned = cleaned.split("```")[1].split("```")[0].strip()
-        parsed = json.loads(cleaned)
-    except Exception:
-        parsed = {"raw_analysis": result, "overall_score": 0}
-
-    return {**parsed, "word_count": word_count, "title": title}
+    report = {
+        "id": str(uuid.uuid4()),
+        "type": "content_score_batch",
+        "domain_id": domain_id,
+        "input": {"domain_id": domain_id},
+        "result": {**summary, "lowest": results[:_SEO_BATCH_REPORT_LOWEST]},
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    for offset in range(0, len(results), 1000):
+        await db.seo_article_scores.insert_many(
+            [{**r, "report_id": report["id"]} for r in results[offset:offset + 1000]], ordered=False,
+        )
+    await db.seo_reports.insert_one({**report})
+    return {**summary, "report_id": report["id"], "lowest": results[:limit]}
+
+@api_router.get("/seo/reports/{report_id}/scores")
+async def get_seo_report_scores(report_id: str, page: int = 1, limit: int = 100):
+    """Per-article scores of a content score batch report, weakest first"""
+    page = max(1, page)
+    limit = max(1, min(limit, 500))
+    query = {"report_id": report_id}
+    total = await db.seo_article_scores.count_documents(query)
+    scores = await db.seo_article_scores.find(query, {"_id": 0, "report_id": 0}).sort(
+        [("overall_score", 1), ("id", 1)]
+    ).skip((page - 1) * limit).limit(limit).to_list(limit)
+    return {"scores": scores, "total": total, "page": page, "limit": limit, "has_more": page * limit < total}
 
 @api_router.post("/seo/competitor-deep")
-async def seo_competitor_deep(req: SeoCompetitorRequest):
-    """Deep competitor analysis with structured insights"""
+async def seo_competitor_deep(req: SeoCompetitorRequest, refresh: bool = False):
+    """Deep competitor analysis with structured insights (cached; refresh=true regenerates)"""
     prompt = f"""Sen bir SEO rakip analiz uzmanısın. Aşağıdaki rakip siteyi analiz et.
 
 Rakip Site: {req.competitor_url}
@@ -1964,18 +3353,13 @@ Niş: Bonus/Bahis/Spor içerik sitesi
   "summary": "genel değerlendirme"
 }}"""
 
-    result = await generate_ai_content(prompt, "Sen bir SEO ve dijital pazarlama rakip analiz uzmanısın. Sadece JSON formatında yanıt ver.")
-
-    parsed = None
-    try:
-        cleaned = result.strip()
-        if "```json" in cleaned:
-            cleaned = cleaned.split("```json")[1].split("```")[0].strip()
-        elif "```" in cleaned:
-            cleaned = cleaned.split("```")[1].split("```")[0].strip()
-        parsed = json.loads(cleaned)
-    except Exception:
-        parsed = {"raw_analysis": result}
+    result, cached = await cached_ai_content(
+        prompt, "Sen bir SEO ve dijital pazarlama rakip analiz uzmanısın. Sadece JSON formatında yanıt ver.",
+        SEO_TOOL_TEMPLATES["competitor_deep"], refresh=refresh,
+    )
+    parsed = parse_ai_json(result) or {"raw_analysis": result}
+    if cached:
+        return {**parsed, "cached": True}  # already saved as a report when it was generated
 
     report = {
         "id": str(uuid.uuid4()),
@@ -1987,11 +3371,11 @@ Niş: Bonus/Bahis/Spor içerik sitesi
     await db.seo_reports.insert_one({**report})
     report.pop("_id", None)
 
-    return parsed
+    return {**parsed, "cached": False}
 
 @api_router.post("/seo/meta-generator")
-async def seo_meta_generator(req: SeoMetaRequest):
-    """Generate SEO-optimized meta titles and descriptions"""
+async def seo_meta_generator(req: SeoMetaRequest, refresh: bool = False):
+    """Generate SEO-optimized meta titles and descriptions (cached; refresh=true regenerates)"""
     prompt = f"""Sen bir SEO meta etiket uzmanısın. Aşağıdaki konu için optimize edilmiş meta etiketler oluştur.
 
 Konu: {req.topic}
@@ -2023,24 +3407,15 @@ Niş: Bonus/Bahis/Spor
   "schema_suggestion": "Article/FAQPage/HowTo"
 }}"""
 
-    result = await generate_ai_content(prompt, "Sen bir SEO ve meta etiket optimizasyon uzmanısın. Sadece JSON formatında yanıt ver.")
-
-    parsed = None
-    try:
-        cleaned = result.strip()
-        if "```json" in cleaned:
-            cleaned = cleaned.split("```json")[1].split("```")[0].strip()
-        elif "```" in cleaned:
-            cleaned = cleaned.split("```")[1].split("```")[0].strip()
-        parsed = json.loads(cleaned)
-    except Exception:
-        parsed = {"raw_result": result}
-
-    return parsed
+    result, cached = await cached_ai_content(
+        prompt, "Sen bir SEO ve meta etiket optimizasyon uzmanısın. Sadece JSON formatında yanıt ver.",
+        SEO_TOOL_TEMPLATES["meta_generator"], refresh=refresh, hedge=True,
+    )
+    return {**(parse_ai_json(result) or {"raw_result": result}), "cached": cached}
 
 @api_router.post("/seo/internal-links")
-async def seo_internal_links(req: SeoInternalLinkRequest):
-    """Suggest internal links based on content and existing articles"""
+async def seo_internal_links(req: SeoInternalLinkRequest, refresh: bool = False):
+    """Suggest internal links based on content and existing articles (cached; refresh=true regenerates)"""
     content = req.content
     if req.article_id and not content:
         article = await db.articles.find_one({"id": req.article_id}, {"_id": 0})
@@ -2075,24 +3450,13 @@ Mevcut Makaleler:
   "link_strategy": "genel iç bağlantı stratejisi önerisi"
 }}"""
 
-    result = await generate_ai_content(prompt, "Sen bir SEO iç bağlantı ve site mimarisi uzmanısın. Sadece JSON formatında yanıt ver.")
-
-    parsed = None
-    try:
-        cleaned = result.strip()
-        if "```json" in cleaned:
-            cleaned = cleaned.split("```json")[1].split("```")[0].strip()
-        elif "```" in cleaned:
-            cleaned = cleaned.split("```")[1].split("```")[0].strip()
-        parsed = json.loads(cleaned)
-    except Exception:
-        parsed = {"raw_result": result}
-
-    return parsed
+    result, cached = await cached_ai_content(
+        prompt, "Sen bir SEO iç bağlantı ve site mimarisi uzmanısın. Sadece JSON formatında yanıt ver.",
+        SEO_TOOL_TEMPLATES["internal_links"], refresh=refresh,
+    )
+    return {**(parse_ai_json(result) or {"raw_result": result}), "cached": cached}
 
-@api_router.post("/seo/content-optimizer")
-async def seo_content_optimizer(req: SeoContentOptimizeRequest):
-    """AI-powered content optimization suggestions"""
+async def _content_optimizer_prompt(req: SeoContentOptimizeRequest) -> str:
     content = req.content
     title = req.title
     if req.article_id and not content:
@@ -2124,21 +3488,22 @@ Hedef Anahtar Kelime: {req.target_keyword or 'belirtilmedi'}
   "readability_tips": ["okunabilirlik ipucu 1", "okunabilirlik ipucu 2"],
   "estimated_improvement": "tahmini SEO etkisi açıklaması"
 }}"""
+    return prompt
 
+async def _content_optimizer(prompt: str) -> Dict[str, Any]:
     result = await generate_ai_content(prompt, "Sen bir SEO içerik optimizasyon uzmanısın. Sadece JSON formatında yanıt ver.")
+    return parse_ai_json(result) or {"raw_result": result}
 
-    parsed = None
-    try:
-        cleaned = result.strip()
-        if "```json" in cleaned:
-            cleaned = cleaned.split("```json")[1].split("```")[0].strip()
-        elif "```" in cleaned:
-            cleaned = cleaned.split("```")[1].split("```")[0].strip()
-        parsed = json.loads(cleaned)
-    except Exception:
-        parsed = {"raw_result": result}
+@api_router.post("/seo/content-optimizer")
+async def seo_content_optimizer(req: SeoContentOptimizeRequest):
+    """AI-powered content optimization suggestions"""
+    return await _content_optimizer(await _content_optimizer_prompt(req))
 
-    return parsed
+@api_router.post("/seo/content-optimizer/stream")
+async def seo_content_optimizer_stream(req: SeoContentOptimizeRequest):
+    """AI-powered content optimization suggestions (SSE: start → progress → result → done)"""
+    prompt = await _content_optimizer_prompt(req)
+    return ai_stream_response(lambda: _content_optimizer(prompt))
 
 @api_router.get("/seo/reports")
 async def get_seo_reports(report_type: Optional[str] = None, limit: int = 20):
@@ -2153,6 +3518,7 @@ async def get_seo_reports(report_type: Optional[str] = None, limit: int = 20):
 async def delete_seo_report(report_id: str):
     """Delete a SEO report"""
     await db.seo_reports.delete_one({"id": report_id})
+    await db.seo_article_scores.delete_many({"report_id": report_id})
     return {"message": "Rapor silindi"}
 
 # Sports
@@ -2184,57 +3550,200 @@ def _normalize_match(m: dict, sport_key: str) -> dict:
         "slug": f"{home_slug}-vs-{away_slug}-{slug_date}",
     }
 
-async def _fetch_scores_from_api() -> list:
-    """Fetch scores from Odds API with retry"""
-    all_matches = []
-    async with httpx.AsyncClient(timeout=12) as client:
-        for sport_key in SPORT_KEYS:
-            for attempt in range(2):
-                try:
-                    resp = await client.get(
-                        f"https://api.the-odds-api.com/v4/sports/{sport_key}/scores",
-                        params={"apiKey": ODDS_API_KEY, "daysFrom": "1", "dateFormat": "iso"},
-                    )
-                    if resp.status_code == 200:
-                        for m in resp.json():
-                            all_matches.append(_normalize_match(m, sport_key))
-                    break
-                except Exception as e:
-                    if attempt == 1:
-                        logger.warning(f"Odds API score error {sport_key}: {e}")
-    return all_matches
+_odds_semaphore = asyncio.Semaphore(ODDS_API_CONCURRENCY)
+
+def _header_int(headers, name: str) -> Optional[int]:
+    try:
+        return int(float(headers[name]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class OddsQuota:
+    """Odds API credit usage, read from the ``x-requests-*`` response headers.
+
+    ``used_today`` is derived from the provider's ``x-requests-used`` counter, so
+    it includes credits spent by other workers sharing the same API key.
+    """
+
+    def __init__(self, daily_budget: int = 0):
+        self.configured_budget = daily_budget
+        self.remaining: Optional[int] = None
+        self.used: Optional[int] = None
+        self.cost_per_call = 2  # /scores with daysFrom costs 2 credits
+        self.updated_at: Optional[float] = None
+        self._day = datetime.now(timezone.utc).date()
+        self._day_start_used: Optional[int] = None
+
+    def record(self, headers, update_cost: bool = True):
+        remaining = _header_int(headers, "x-requests-remaining")
+        used = _header_int(headers, "x-requests-used")
+        last = _header_int(headers, "x-requests-last")
+        if remaining is None and used is None:
+            return
+        today = datetime.now(timezone.utc).date()
+        if today != self._day or (used is not None and self._day_start_used is not None and used < self._day_start_used):
+            # New UTC day or the monthly quota was reset
+            self._day = today
+            self._day_start_used = None
+        if used is not None and self._day_start_used is None:
+            self._day_start_used = used - (last or 0)
+        self.remaining = remaining if remaining is not None else self.remaining
+        self.used = used if used is not None else self.used
+        if update_cost and last:
+            self.cost_per_call = last
+        self.updated_at = time.time()
+
+    @property
+    def used_today(self) -> int:
+        if self.used is None or self._day_start_used is None or self._day != datetime.now(timezone.utc).date():
+            return 0
+        return max(0, self.used - self._day_start_used)
+
+    def daily_budget(self) -> Optional[float]:
+        """Credits allowed per UTC day: the configured budget, else the remaining quota spread over the month"""
+        if self.configured_budget > 0:
+            return float(self.configured_budget)
+        if self.remaining is None:
+            return None
+        now = datetime.now(timezone.utc)
+        next_month = (now.replace(day=1) + timedelta(days=32)).replace(day=1)
+        days_left = max(1, (next_month.date() - now.date()).days)
+        return (self.remaining + self.used_today) / days_left
+
+    def exhausted(self) -> bool:
+        if self.remaining is not None and self.remaining <= 0:
+            return True
+        budget = self.daily_budget()
+        return budget is not None and self.used_today >= budget
+
+    def stretch(self, projected_daily: float) -> float:
+        """Interval multiplier that keeps polling within the daily budget.
+
+        Uses the larger of the projected burn and today's actual pace, so usage
+        by other workers on the same key slows this one down too.
+        """
+        budget = self.daily_budget()
+        if not budget:
+            return 1.0
+        now = datetime.now(timezone.utc)
+        day_elapsed = max((now.hour * 3600 + now.minute * 60 + now.second) / 86400, 1 / 24)
+        pace = self.used_today / (budget * day_elapsed)
+        return max(1.0, projected_daily / budget, pace)
+
+    def export(self) -> Dict[str, Any]:
+        """Raw counters, stored with the shared scores snapshot"""
+        return {
+            "remaining": self.remaining,
+            "used": self.used,
+            "cost_per_call": self.cost_per_call,
+            "updated_at": self.updated_at,
+            "day": self._day.isoformat(),
+            "day_start_used": self._day_start_used,
+        }
+
+    def restore(self, state: Dict[str, Any]):
+        if not state or (state.get("updated_at") or 0) <= (self.updated_at or 0):
+            return
+        self.remaining = state["remaining"]
+        self.used = state["used"]
+        self.cost_per_call = state["cost_per_call"]
+        self.updated_at = state["updated_at"]
+        self._day = datetime.fromisoformat(state["day"]).date()
+        self._day_start_used = state["day_start_used"]
+
+    def snapshot(self) -> Dict[str, Any]:
+        budget = self.daily_budget()
+        return {
+            "remaining": self.remaining,
+            "used": self.used,
+            "used_today": self.used_today,
+            "cost_per_call": self.cost_per_call,
+            "daily_budget": round(budget, 1) if budget is not None else None,
+            "budget_source": "env" if self.configured_budget > 0 else ("remaining_quota" if budget is not None else None),
+            "exhausted": self.exhausted(),
+            "updated_at": datetime.fromtimestamp(self.updated_at, tz=timezone.utc).isoformat() if self.updated_at else None,
+        }
+
+odds_quota = OddsQuota(ODDS_DAILY_BUDGET)
+
+async def _fetch_league_scores(sport_key: str) -> Optional[list]:
+    """Fetch one league's scores (retried by the odds upstream policy). Returns None on failure."""
+    try:
+        resp = await http_clients.get(
+            "odds", f"/sports/{sport_key}/scores",
+            params={"apiKey": ODDS_API_KEY, "daysFrom": "1", "dateFormat": "iso"},
+        )
+        odds_quota.record(resp.headers)
+        if resp.status_code != 200:
+            logger.warning(f"Odds API score error {sport_key}: HTTP {resp.status_code}")
+            return None
+        return [_normalize_match(m, sport_key) for m in resp.json()]
+    except Exception as e:
+        logger.warning(f"Odds API score error {sport_key}: {e}")
+        return None
+
+async def _with_league_timeout(sport_key: str, fetch: Callable) -> Optional[list]:
+    # The timeout starts once a slot is free, so queued leagues are not counted as failures
+    async with _odds_semaphore:
+        try:
+            return await asyncio.wait_for(fetch(sport_key), timeout=ODDS_API_LEAGUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Odds API timeout {sport_key} (>{ODDS_API_LEAGUE_TIMEOUT}s)")
+            return None
+
+async def _fetch_scores_from_api(sport_keys: Optional[List[str]] = None) -> Dict[str, Optional[list]]:
+    """Fetch the given leagues (default: all) concurrently; failed leagues keep their last good result.
+
+    Returns each requested league's fresh result, or None where the fetch failed.
+    """
+    sport_keys = sport_keys or SPORT_KEYS
+    results = await asyncio.gather(*[_with_league_timeout(k, _fetch_league_scores) for k in sport_keys])
+    leagues = _scores_cache["leagues"]
+    for sport_key, matches in zip(sport_keys, results):
+        if matches is not None:
+            leagues[sport_key] = matches
+    return dict(zip(sport_keys, results))
+
+def _league_mode(matches: list, now: datetime) -> str:
+    """live: a match is in progress; soon: kickoff within SCORES_SOON_WINDOW; idle otherwise"""
+    live_since = (now - timedelta(seconds=_SCORES_LIVE_WINDOW)).isoformat()
+    soon_until = (now + timedelta(seconds=SCORES_SOON_WINDOW)).isoformat()
+    now_iso = now.isoformat()
+    mode = "idle"
+    for m in matches:
+        if m["completed"]:
+            continue
+        if live_since <= m["commence_time"] <= now_iso:
+            return "live"
+        if now_iso < m["commence_time"] <= soon_until:
+            mode = "soon"
+    return mode
+
+_LEAGUE_INTERVALS = {"live": SCORES_INTERVAL_LIVE, "soon": SCORES_INTERVAL_SOON, "idle": SCORES_INTERVAL_IDLE}
+
+async def _fetch_league_upcoming(sport_key: str) -> Optional[list]:
+    try:
+        resp = await http_clients.get(
+            "odds", f"/sports/{sport_key}/events",
+            params={"apiKey": ODDS_API_KEY, "dateFormat": "iso"},
+        )
+        odds_quota.record(resp.headers, update_cost=False)
+        if resp.status_code != 200:
+            logger.warning(f"Odds API upcoming error {sport_key}: HTTP {resp.status_code}")
+            return None
+        return [
+            _normalize_match({**m, "completed": False, "scores": None, "last_update": None}, sport_key)
+            for m in resp.json()[:5]
+        ]
+    except Exception as e:
+        logger.warning(f"Odds API upcoming error {sport_key}: {e}")
+        return None
 
 async def _fetch_upcoming_fallback() -> list:
     """Fallback: fetch upcoming fixtures (next 24h)"""
-    all_matches = []
-    async with httpx.AsyncClient(timeout=12) as client:
-        for sport_key in SPORT_KEYS[:3]:  # limit to top 3 leagues for fallback
-            try:
-                resp = await client.get(
-                    f"https://api.the-odds-api.com/v4/sports/{sport_key}/events",
-                    params={"apiKey": ODDS_API_KEY, "dateFormat": "iso"},
-                )
-                if resp.status_code == 200:
-                    for m in resp.json()[:5]:
-                        slug_date = m["commence_time"][:10]
-                        home_slug = re.sub(r"[^a-z0-9]+", "-", m["home_team"].lower()).strip("-")
-                        away_slug = re.sub(r"[^a-z0-9]+", "-", m["away_team"].lower()).strip("-")
-                        all_matches.append({
-                            "id": m["id"],
-                            "sport_key": sport_key,
-                            "sport_title": m.get("sport_title", ""),
-                            "home_team": m["home_team"],
-                            "away_team": m["away_team"],
-                            "commence_time": m["commence_time"],
-                            "completed": False,
-                            "home_score": None,
-                            "away_score": None,
-                            "last_update": None,
-                            "slug": f"{home_slug}-vs-{away_slug}-{slug_date}",
-                        })
-            except Exception as e:
-                logger.warning(f"Odds API upcoming error {sport_key}: {e}")
-    return all_matches
+    fallback_keys = SPORT_KEYS[:3]  # limit to top 3 leagues for fallback
+    results = await asyncio.gather(*[_with_league_timeout(k, _fetch_league_upcoming) for k in fallback_keys])
+    return [m for matches in results if matches for m in matches]
 
 def _sort_matches(matches: list) -> list:
     now = datetime.now(timezone.utc).isoformat()
@@ -2243,58 +3752,438 @@ def _sort_matches(matches: list) -> list:
     upcoming = sorted([m for m in matches if not m["completed"] and m["commence_time"] > now], key=lambda x: x["commence_time"])
     return live + completed + upcoming
 
-async def _get_scores_cached() -> tuple[list, bool]:
-    """Returns (matches, is_cached). Populates / refreshes cache."""
-    now_ts = time.time()
-    # Cache still fresh
-    if _scores_cache["data"] is not None and (now_ts - _scores_cache["ts"]) < _CACHE_TTL:
-        return _scores_cache["data"], True
+_MATCH_PROJECTION = {"_id": 0, "commence_at": 0, "archived_at": 0}
 
+async def _archive_matches(matches: list):
+    """Upsert every fetched match into the `matches` collection so match URLs outlive the snapshot"""
+    if not matches:
+        return
+    now = datetime.now(timezone.utc)
+    ops = []
+    for m in matches:
+        try:
+            commence_at = datetime.fromisoformat(m["commence_time"].replace("Z", "+00:00"))
+        except ValueError:
+            commence_at = now
+        ops.append(UpdateOne({"id": m["id"]}, {"$set": {**m, "commence_at": commence_at, "archived_at": now}}, upsert=True))
     try:
-        matches = await _fetch_scores_from_api()
-        if not matches:
-            matches = await _fetch_upcoming_fallback()
-        _scores_cache["data"] = _sort_matches(matches)[:10]
-        _scores_cache["ts"] = now_ts
-        _scores_cache["error_count"] = 0
-        _scores_cache["last_error"] = None
-        return _scores_cache["data"], False
+        await db.matches.bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        logger.warning(f"Match archive: {len(e.details.get('writeErrors', []))} write errors (duplicate slug?)")
     except Exception as e:
-        _scores_cache["error_count"] = _scores_cache.get("error_count", 0) + 1
-        _scores_cache["last_error"] = str(e)
-        logger.error(f"Scores fetch failed: {e}")
-        # Return stale cache if available
-        if _scores_cache["data"]:
-            return _scores_cache["data"], True
-        return [], False
+        logger.error(f"Match archive failed: {e}")
+
+async def _find_match(match_id: Optional[str] = None, slug: Optional[str] = None) -> Optional[dict]:
+    """O(1) lookup: live snapshot index first, then the indexed `matches` archive"""
+    if match_id:
+        match = _scores_cache["by_id"].get(match_id)
+        query = {"id": match_id}
+    else:
+        match = _scores_cache["by_slug"].get(slug)
+        query = {"slug": slug}
+    if match:
+        return match
+    return await db.matches.find_one(query, _MATCH_PROJECTION)
+
+class ScoresRefresher:
+    """Background refresher for the sports scores snapshot.
+
+    User requests only read ``_scores_cache``; the Odds API is called from this
+    loop only. Each league is polled on its own interval, picked from its match
+    state (live / soon / idle) and stretched by ``odds_quota`` when the projected
+    credit burn exceeds the daily budget. Refreshes run under a lock, so manual
+    refreshes coalesce with the loop; failing leagues back off exponentially.
+
+    The loop runs on the elected leader only. Every refresh is saved to
+    `scores_snapshot`; all workers poll it (``start_following``) and load newer
+    snapshots into their own ``_scores_cache``. Manual refreshes from any worker
+    go through ``requests`` and run in the leader's loop.
+    """
+
+    def __init__(self):
+        self.is_running = False
+        self.task = None
+        self.follow_task = None
+        self.lock = asyncio.Lock()
+        self.next_refresh_at: Optional[float] = None
+        self.snapshot_saved_at = 0.0
+        self.listeners: List[Callable] = []
+        self.local_listeners: List[Callable] = []
+        self._background: set = set()
+        self.requests = RunRequest("scores_refresh")
+        self.league_state: Dict[str, Dict[str, Any]] = {
+            k: {"last_attempt": 0.0, "errors": 0} for k in SPORT_KEYS
+        }
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info(
+            f"Scores refresher started (live/soon/idle: {SCORES_INTERVAL_LIVE}/{SCORES_INTERVAL_SOON}/{SCORES_INTERVAL_IDLE}s)"
+        )
+
+    def add_listener(self, callback: Callable, local: bool = False):
+        """Register ``async callback(matches)``, run in the background after each successful refresh.
+
+        ``matches`` is every match of the refresh, not just the top-10 ``_scores_cache["data"]``.
+
+        ``local`` listeners also run on every worker that loads a newer shared snapshot.
+        """
+        self.listeners.append(callback)
+        if local:
+            self.local_listeners.append(callback)
+
+    def _notify(self, matches: list, listeners: Optional[List[Callable]] = None):
+        for callback in self.listeners if listeners is None else listeners:
+            task = asyncio.create_task(callback(matches))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def stop(self):
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        logger.info("Scores refresher stopped")
+
+    def start_following(self):
+        if self.follow_task is None:
+            self.follow_task = asyncio.create_task(self._follow_loop())
+
+    async def stop_following(self):
+        if self.follow_task:
+            self.follow_task.cancel()
+            self.follow_task = None
+
+    async def save_snapshot(self, matches: Optional[list] = None):
+        """Share the snapshot and refresher state with the other workers"""
+        self.snapshot_saved_at = time.time()
+        fields = {
+            "saved_at": self.snapshot_saved_at,
+            "ts": _scores_cache["ts"],
+            "error_count": _scores_cache["error_count"],
+            "last_error": _scores_cache["last_error"],
+            "league_state": self.league_state,
+            "quota": odds_quota.export(),
+            "writer": WORKER_ID,
+        }
+        if matches is not None:
+            fields.update({"data": _scores_cache["data"], "leagues": _scores_cache["leagues"], "matches": matches})
+        await db.scores_snapshot.update_one({"id": "current"}, {"$set": fields}, upsert=True)
+
+    async def load_snapshot(self) -> bool:
+        """Load the shared snapshot if another worker saved a newer one"""
+        doc = await db.scores_snapshot.find_one({"id": "current", "saved_at": {"$gt": self.snapshot_saved_at}}, {"_id": 0})
+        if not doc:
+            return False
+        self.snapshot_saved_at = doc["saved_at"]
+        self.league_state.update({k: v for k, v in doc.get("league_state", {}).items() if k in self.league_state})
+        odds_quota.restore(doc.get("quota"))
+        _scores_cache["error_count"] = doc.get("error_count", 0)
+        _scores_cache["last_error"] = doc.get("last_error")
+        if doc.get("matches") and doc["ts"] > _scores_cache["ts"]:
+            matches = doc["matches"]
+            _scores_cache["leagues"] = doc["leagues"]
+            _scores_cache["data"] = doc["data"]
+            _scores_cache["by_id"] = {m["id"]: m for m in matches}
+            _scores_cache["by_slug"] = {m["slug"]: m for m in matches}
+            _scores_cache["ts"] = doc["ts"]
+            self._notify(matches, self.local_listeners)
+        return True
+
+    async def _follow_loop(self):
+        while True:
+            try:
+                await self.load_snapshot()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Scores snapshot sync error: {e}")
+            await asyncio.sleep(_SCORES_FOLLOW_INTERVAL)
+
+    def schedule(self) -> Dict[str, Dict[str, Any]]:
+        """Current mode, effective interval and next due time for every league"""
+        now = datetime.now(timezone.utc)
+        modes = {k: _league_mode(_scores_cache["leagues"].get(k, []), now) for k in SPORT_KEYS}
+        stretch = odds_quota.stretch(self.projected_daily_burn(modes))
+        plan = {}
+        for sport_key, mode in modes.items():
+            state = self.league_state[sport_key]
+            interval = _LEAGUE_INTERVALS[mode] * stretch
+            if state["errors"]:
+                interval = max(interval, min(interval * (2 ** state["errors"]), _SCORES_MAX_BACKOFF))
+            plan[sport_key] = {
+                "mode": mode,
+                "interval": interval,
+                "errors": state["errors"],
+                "due_at": state["last_attempt"] + interval,
+            }
+        return plan
+
+    @staticmethod
+    def projected_daily_burn(modes: Dict[str, str]) -> float:
+        """Credits per day if every league kept its current mode at the base interval"""
+        return sum(86400 / _LEAGUE_INTERVALS[mode] for mode in modes.values()) * odds_quota.cost_per_call
+
+    def quota_report(self) -> Dict[str, Any]:
+        plan = self.schedule()
+        projected = self.projected_daily_burn({k: v["mode"] for k, v in plan.items()})
+        effective = sum(86400 / v["interval"] for v in plan.values()) * odds_quota.cost_per_call
+        now = time.time()
+        return {
+            **odds_quota.snapshot(),
+            "projected_daily_burn": round(projected),
+            "effective_daily_burn": round(effective),
+            "stretch_factor": round(odds_quota.stretch(projected), 2),
+            "days_until_exhausted": round(odds_quota.remaining / effective, 1) if odds_quota.remaining is not None and effective else None,
+            "leagues": {
+                k: {
+                    "mode": v["mode"],
+                    "interval_seconds": round(v["interval"]),
+                    "errors": v["errors"],
+                    "next_refresh_in_seconds": max(0, round(v["due_at"] - now)),
+                }
+                for k, v in plan.items()
+            },
+        }
+
+    def freshness_target(self) -> int:
+        """Shortest effective league interval; the snapshot is stale once older than this"""
+        return round(min(v["interval"] for v in self.schedule().values()))
+
+    async def refresh(self, sport_keys: Optional[List[str]] = None) -> bool:
+        """Fetch the given leagues (default: all) and rebuild the snapshot. Keeps the previous snapshot on failure."""
+        async with self.lock:
+            try:
+                requested = sport_keys or SPORT_KEYS
+                results = await _fetch_scores_from_api(requested)
+                now = time.time()
+                for sport_key, result in results.items():
+                    state = self.league_state[sport_key]
+                    state["last_attempt"] = now
+                    state["errors"] = 0 if result is not None else state["errors"] + 1
+                if all(result is None for result in results.values()):
+                    raise Exception(f"Odds API failed for {len(requested)} league(s)")
+                leagues = _scores_cache["leagues"]
+                matches = [m for k in SPORT_KEYS for m in leagues.get(k, [])]
+                if not matches:
+                    matches = await _fetch_upcoming_fallback()
+                if not matches:
+                    raise Exception("Odds API returned no matches")
+                _scores_cache["data"] = _sort_matches(matches)[:10]
+                _scores_cache["by_id"] = {m["id"]: m for m in matches}
+                _scores_cache["by_slug"] = {m["slug"]: m for m in matches}
+                _scores_cache["ts"] = time.time()
+                _scores_cache["error_count"] = 0
+                _scores_cache["last_error"] = None
+                self._notify(matches)
+                await self.save_snapshot(matches)
+                await _archive_matches(matches)
+                return True
+            except Exception as e:
+                _scores_cache["error_count"] = _scores_cache.get("error_count", 0) + 1
+                _scores_cache["last_error"] = str(e)
+                logger.error(f"Scores fetch failed ({_scores_cache['error_count']}x): {e}")
+                await self.save_snapshot()
+                return False
+
+    async def _run_loop(self):
+        while self.is_running:
+            requested = False
+            try:
+                requested = await self.requests.claim(WORKER_ID)
+                if requested:
+                    refreshed = await self.refresh()
+                    result = {"refreshed": refreshed, "count": len(_scores_cache["data"] or [])}
+                    await self.requests.finish(WORKER_ID, result, None if refreshed else _scores_cache["last_error"])
+                    requested = False
+                plan = self.schedule()
+                now = time.time()
+                if odds_quota.exhausted():
+                    # Wait for the next UTC day (or a manual refresh)
+                    tomorrow = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+                    self.next_refresh_at = tomorrow.timestamp()
+                else:
+                    due = [k for k, v in plan.items() if v["due_at"] <= now]
+                    if due:
+                        await self.refresh(due)
+                        plan = self.schedule()
+                    self.next_refresh_at = min(v["due_at"] for v in plan.values())
+            except asyncio.CancelledError:
+                if requested:
+                    await asyncio.shield(self.requests.release(WORKER_ID))
+                break
+            except Exception as e:
+                logger.error(f"Scores refresher loop error: {e}")
+            await asyncio.sleep(_SCORES_TICK)
+
+scores_refresher = ScoresRefresher()
+
+# Live score push: one snapshot per worker, fanned out to every /sports/stream client
+scores_broadcaster = SnapshotBroadcaster("scores", history=100, max_subscribers=SSE_MAX_CLIENTS)
+
+async def publish_scores(matches: list):
+    # Clients get the same top matches as /sports/scores
+    scores_broadcaster.publish(_scores_cache["data"])
+
+scores_refresher.add_listener(publish_scores, local=True)
+
+async def _get_scores_cached() -> tuple[list, bool]:
+    """Returns (matches, is_cached) from the last snapshot. Never calls the Odds API."""
+    if _scores_cache["data"] is not None:
+        return _scores_cache["data"], True
+    return [], False
 
 async def _generate_ai_insight(home_team: str, away_team: str, league: str) -> str:
     """Generate 2-3 line neutral AI match insight in Turkish"""
     if not _ai_insight_enabled or not EMERGENT_LLM_KEY:
         return ""
     try:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=f"insight-{home_team}-{away_team}",
-            system_message=(
+        response = await llm_gateway.complete_hedged(
+            (
+                f"'{home_team}' - '{away_team}' ({league}) maçı için 2-3 cümlelik "
+                f"Türkçe, kısa ve tarafsız bir analiz yaz. "
+                f"Form durumunu, güçlü yönleri ve olası senaryoları belirt. "
+                f"'Bu yazı bilgi amaçlıdır' şeklinde başla."
+            ),
+            (
                 "Sen bir spor analisti asistanısın. Kısa, tarafsız ve bilgilendirici maç analizleri yazıyorsun. "
                 "Kesinlikle 'kesin gol atar', 'garantili kazanır' gibi ifadeler kullanma. "
                 "Sadece genel olası senaryoları, dikkat edilmesi gereken faktörleri belirt."
-            )
-        ).with_model("gemini", "gemini-3-flash-preview")
-
-        msg = UserMessage(text=(
-            f"'{home_team}' - '{away_team}' ({league}) maçı için 2-3 cümlelik "
-            f"Türkçe, kısa ve tarafsız bir analiz yaz. "
-            f"Form durumunu, güçlü yönleri ve olası senaryoları belirt. "
-            f"'Bu yazı bilgi amaçlıdır' şeklinde başla."
-        ))
-        response = await chat.send_message(msg)
+            ),
+            ("gemini", "gemini-3-flash-preview"), ("openai", "gpt-4o-mini"),
+            session_id=f"insight-{home_team}-{away_team}", priority="public",
+        )
         return response[:300] if response else ""
     except Exception as e:
         logger.warning(f"AI insight error: {e}")
         return ""
 
+# Two-tier insight cache: in-process (single-flight) in front of the shared
+# `ai_insights` collection, keyed by match id + prompt version.
+ai_insight_cache = AsyncTTLCache("ai_insights", AI_INSIGHT_TTL, maxsize=256, empty_ttl=60)
+
+def _insight_key(match: dict) -> str:
+    return f"{match['id']}:{AI_INSIGHT_PROMPT_VERSION}"
+
+async def _load_match_insight(match: dict) -> str:
+    key = _insight_key(match)
+    now = datetime.now(timezone.utc)
+    doc = await db.ai_insights.find_one({"key": key, "expires_at": {"$gt": now}}, {"_id": 0, "insight": 1})
+    if doc:
+        return doc["insight"]
+
+    insight = await _generate_ai_insight(match["home_team"], match["away_team"], match["sport_title"])
+    if insight:
+        await db.ai_insights.update_one({"key": key}, {"$set": {
+            "key": key,
+            "match_id": match["id"],
+            "prompt_version": AI_INSIGHT_PROMPT_VERSION,
+            "insight": insight,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=AI_INSIGHT_TTL),
+        }}, upsert=True)
+    return insight
+
+async def get_match_insight(match: dict, wait: Optional[float] = None) -> str:
+    """Cached insight for a match. Waits at most ``wait`` seconds; generation continues in the background."""
+    if not _ai_insight_enabled or not EMERGENT_LLM_KEY:
+        return ""
+    load = ai_insight_cache.get_or_load(_insight_key(match), lambda: _load_match_insight(match))
+    try:
+        return await asyncio.wait_for(load, timeout=wait)
+    except asyncio.TimeoutError:
+        return ""
+    except Exception as e:
+        logger.warning(f"AI insight cache error: {e}")
+        return ""
+
+async def pregenerate_match_insights(matches: list):
+    """Scores refresh listener: warm insights for every non-completed match, live and soonest first"""
+    if not _ai_insight_enabled or not EMERGENT_LLM_KEY:
+        return
+    for match in _sort_matches(matches):
+        if match.get("completed"):
+            continue
+        await get_match_insight(match)
+
+scores_refresher.add_listener(pregenerate_match_insights)
+
+# ── long-form match analyses ─────────────────────────────────────────
+
+def _match_state(match: dict) -> str:
+    if match.get("completed"):
+        return "completed"
+    if match["commence_time"] <= datetime.now(timezone.utc).isoformat():
+        return "live"
+    return "upcoming"
+
+async def _generate_match_analysis(match: dict) -> str:
+    """Structured Turkish analysis for the match detail page"""
+    try:
+        return await llm_gateway.complete(
+            (
+                f"'{match['home_team']}' - '{match['away_team']}' ({match['sport_title']}) maçı için "
+                f"yapılandırılmış bir Türkçe analiz yaz. "
+                f"Şu başlıkları kullan: 1) Genel Bakış 2) Dikkat Edilmesi Gerekenler 3) Olası Senaryolar. "
+                f"Her bölüm 2-3 cümle. Tarafsız ol, garanti ifade kullanma. "
+                f"Sonunda: 'Bu analiz yalnızca bilgi amaçlıdır.' ekle."
+            ),
+            "Sen bir spor analisti asistanısın. Yapılandırılmış, tarafsız Türkçe maç analizleri yazıyorsun.",
+            "gemini", "gemini-3-flash-preview",
+            session_id=f"analysis-{match['id']}", priority="public",
+        ) or ""
+    except Exception as e:
+        logger.warning(f"Match analysis AI error: {e}")
+        return ""
+
+_analysis_job_lock = asyncio.Lock()
+
+async def pregenerate_match_analyses(matches: list):
+    """Scores refresh listener: (re)generate analyses for upcoming/live matches whose state changed.
+
+    Covers every match of the refresh, so any match page resolved through the
+    snapshot or the archive has an analysis; live and soonest matches go first.
+    """
+    if not _ai_insight_enabled or not EMERGENT_LLM_KEY:
+        return
+    if _analysis_job_lock.locked():
+        return  # previous run still in progress
+    async with _analysis_job_lock:
+        targets = {m["id"]: (m, _match_state(m)) for m in _sort_matches(matches) if _match_state(m) != "completed"}
+        if not targets:
+            return
+        existing = await db.match_analyses.find(
+            {"match_id": {"$in": list(targets)}},
+            {"_id": 0, "match_id": 1, "state": 1, "prompt_version": 1}
+        ).to_list(len(targets))
+        current = {d["match_id"] for d in existing if d.get("state") == targets[d["match_id"]][1] and d.get("prompt_version") == MATCH_ANALYSIS_PROMPT_VERSION}
+        pending = [t for match_id, t in targets.items() if match_id not in current]
+        if not pending:
+            return
+
+        semaphore = asyncio.Semaphore(MATCH_ANALYSIS_CONCURRENCY)
+
+        async def generate(match: dict, state: str):
+            async with semaphore:
+                analysis = await _generate_match_analysis(match)
+            if not analysis:
+                return
+            await db.match_analyses.update_one({"match_id": match["id"]}, {"$set": {
+                "match_id": match["id"],
+                "state": state,
+                "prompt_version": MATCH_ANALYSIS_PROMPT_VERSION,
+                "analysis": analysis,
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+            }}, upsert=True)
+
+        await asyncio.gather(*[generate(m, state) for m, state in pending], return_exceptions=True)
+        logger.info(f"Match analyses generated for {len(pending)} matches")
+
+scores_refresher.add_listener(pregenerate_match_analyses)
+
 # ── endpoints ────────────────────────────────────────────────────────
 
 @api_router.get("/sports/scores")
@@ -2305,6 +4194,25 @@ async def get_live_scores():
     matches, from_cache = await _get_scores_cached()
     return {"matches": matches, "from_cache": from_cache, "count": len(matches)}
 
+@api_router.get("/sports/stream")
+async def stream_live_scores(request: Request):
+    """SSE: a `snapshot` event, then `diff` events after each background refresh.
+
+    Reconnecting clients send Last-Event-ID and receive only the missed diffs.
+    """
+    if not ODDS_API_KEY:
+        raise HTTPException(status_code=503, detail="Odds API key not configured")
+    if scores_broadcaster.full:
+        raise HTTPException(status_code=503, detail="Too many live connections, poll /api/sports/scores")
+    matches, _ = await _get_scores_cached()
+    if matches and not scores_broadcaster.order:
+        scores_broadcaster.publish(matches)
+    return StreamingResponse(
+        scores_broadcaster.stream(request.headers.get("last-event-id"), heartbeat=SSE_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
 @api_router.get("/sports/featured")
 async def get_featured_match():
     """Returns featured match + AI mini-insight"""
@@ -2322,41 +4230,25 @@ async def get_featured_match():
     if not featured:
         featured = matches[0]
 
-    insight = ""
-    if _ai_insight_enabled:
-        insight = await _generate_ai_insight(
-            featured["home_team"], featured["away_team"], featured["sport_title"]
-        )
+    insight = await get_match_insight(featured, wait=AI_INSIGHT_WAIT_SECONDS)
 
     return {**featured, "ai_insight": insight}
 
 @api_router.get("/sports/match/{match_id}")
 async def get_match_detail(match_id: str):
     """Returns match details with AI analysis + recommended partner"""
-    matches, _ = await _get_scores_cached()
-    match = next((m for m in matches if m["id"] == match_id), None)
+    match = await _find_match(match_id=match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
+    return await _match_detail_response(match)
 
-    # AI analysis (longer, for detail page)
+async def _match_detail_response(match: dict) -> dict:
+    match_id = match["id"]
+    # AI analysis (longer, for detail page) — pre-generated after each scores refresh
     analysis = ""
-    if _ai_insight_enabled and EMERGENT_LLM_KEY:
-        try:
-            chat = LlmChat(
-                api_key=EMERGENT_LLM_KEY,
-                session_id=f"analysis-{match_id}",
-                system_message="Sen bir spor analisti asistanısın. Yapılandırılmış, tarafsız Türkçe maç analizleri yazıyorsun."
-            ).with_model("gemini", "gemini-3-flash-preview")
-            msg = UserMessage(text=(
-                f"'{match['home_team']}' - '{match['away_team']}' ({match['sport_title']}) maçı için "
-                f"yapılandırılmış bir Türkçe analiz yaz. "
-                f"Şu başlıkları kullan: 1) Genel Bakış 2) Dikkat Edilmesi Gerekenler 3) Olası Senaryolar. "
-                f"Her bölüm 2-3 cümle. Tarafsız ol, garanti ifade kullanma. "
-                f"Sonunda: 'Bu analiz yalnızca bilgi amaçlıdır.' ekle."
-            ))
-            analysis = await chat.send_message(msg)
-        except Exception as e:
-            logger.warning(f"Match detail AI error: {e}")
+    if _ai_insight_enabled:
+        doc = await db.match_analyses.find_one({"match_id": match_id}, {"_id": 0, "analysis": 1})
+        analysis = doc["analysis"] if doc else ""
 
     # Recommended partner (top rated bonus site)
     partner = None
@@ -2376,11 +4268,10 @@ async def get_match_detail(match_id: str):
 @api_router.get("/sports/match-by-slug/{slug}")
 async def get_match_by_slug(slug: str):
     """Find match by URL slug"""
-    matches, _ = await _get_scores_cached()
-    match = next((m for m in matches if m.get("slug") == slug), None)
+    match = await _find_match(slug=slug)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
-    return await get_match_detail(match["id"])
+    return await _match_detail_response(match)
 
 @api_router.get("/go/{partner_id}/{match_id}")
 async def tracking_redirect(partner_id: str, match_id: str, request: Request):
@@ -2407,19 +4298,40 @@ async def tracking_redirect(partner_id: str, match_id: str, request: Request):
 async def get_api_status():
     """Admin: API health and cache info"""
     age = time.time() - _scores_cache.get("ts", 0)
+    freshness = scores_refresher.freshness_target()
     return {
         "odds_api_configured": bool(ODDS_API_KEY),
         "cache_age_seconds": round(age),
-        "cache_ttl_seconds": _CACHE_TTL,
-        "is_stale": age > _CACHE_TTL,
+        "cache_ttl_seconds": freshness,
+        "is_stale": age > freshness,
         "cached_match_count": len(_scores_cache.get("data") or []),
         "error_count": _scores_cache.get("error_count", 0),
         "last_error": _scores_cache.get("last_error"),
         "ai_insight_enabled": _ai_insight_enabled,
         "featured_match_override": _featured_match_override,
         "last_fetch_time": datetime.fromtimestamp(_scores_cache["ts"], tz=timezone.utc).isoformat() if _scores_cache["ts"] else None,
+        "refresher_running": scores_refresher.is_running,
+        "leader": leader_election.status(),
+        "next_refresh_in_seconds": max(0, round(scores_refresher.next_refresh_at - time.time())) if scores_refresher.next_refresh_at else None,
+        "quota": scores_refresher.quota_report(),
+        "stream": scores_broadcaster.stats(),
     }
 
+@api_router.get("/admin/upstream-metrics")
+async def get_upstream_metrics():
+    """Admin: outbound connection reuse, retries and latency per upstream API"""
+    return http_clients.metrics()
+
+@api_router.get("/admin/llm-status")
+async def get_llm_status():
+    """Admin: adaptive LLM concurrency per provider, outcomes and latency"""
+    return {"worker": WORKER_ID, **llm_gateway.stats()}
+
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats():
+    """Admin: hit/miss counters for in-process read caches"""
+    return {"caches": cache_stats()}
+
 class FeaturedMatchRequest(BaseModel):
     match_id: Optional[str] = None
 
@@ -2440,10 +4352,24 @@ async def toggle_ai_insight(req: AiToggleRequest):
 
 @api_router.post("/admin/refresh-scores")
 async def refresh_scores():
-    """Force refresh scores cache"""
-    _scores_cache["ts"] = 0  # invalidate cache
+    """Ask the leader to refresh the scores snapshot now; waits briefly for the result"""
+    if not ODDS_API_KEY:
+        matches, _ = await _get_scores_cached()
+        return {"ok": True, "requested": False, "refreshed": False, "error": "Odds API key not configured", "count": len(matches)}
+    requested = await scores_refresher.requests.request()
+    done = await scores_refresher.requests.wait(SCORES_REFRESH_WAIT)
+    if done is not None:
+        # Pick up the leader's snapshot now instead of at the next follow tick
+        await scores_refresher.load_snapshot()
     matches, _ = await _get_scores_cached()
-    return {"ok": True, "count": len(matches)}
+    return {
+        "ok": True,
+        "requested": requested,
+        "completed": done is not None,
+        "refreshed": done is not None and not done.get("last_error"),
+        "error": done.get("last_error") if done else None,
+        "count": len(matches),
+    }
 
 # Stats
 @api_router.get("/stats/dashboard")
@@ -2507,10 +4433,37 @@ async def verify_token(request: Request):
 
 # ============== PERIGON NEWS ==============
 
-_news_cache: Dict[str, Any] = {"data": None, "ts": 0}
-_NEWS_TTL = 600  # 10 dakika cache
+NEWS_INGEST_INTERVAL = int(get_optional_env("NEWS_INGEST_INTERVAL", "600"))  # 10 dakika
+NEWS_INGEST_WAIT = 30  # seconds /admin/news/ingest waits for the leader's run
+NEWS_INGEST_PAGE_SIZE = 100  # Perigon max page size
+NEWS_INGEST_MAX_PAGES = int(get_optional_env("NEWS_INGEST_MAX_PAGES", "10"))
+NEWS_INGEST_OVERLAP = timedelta(minutes=5)  # re-read the edge of the window; upserts dedupe it
+NEWS_BACKFILL_HOURS = int(get_optional_env("NEWS_BACKFILL_HOURS", "48"))  # first run on an empty store
+NEWS_RETENTION_DAYS = int(get_optional_env("NEWS_RETENTION_DAYS", "30"))
+NEWS_MAX_SIZE = 100
 
-async def _fetch_perigon_news(size: int = 20, topic: Optional[str] = None) -> list:
+_NEWS_PROJECTION = {"_id": 0, "published_dt": 0}
+
+# Page cache over the `news` collection; cleared after every ingestion that stored something
+news_cache = AsyncTTLCache("news", READ_CACHE_TTL, maxsize=128, stale_ttl=READ_CACHE_STALE_TTL)
+
+def _normalize_perigon_article(a: dict) -> dict:
+    return {
+        "id": a.get("articleId", ""),
+        "title": a.get("title", ""),
+        "description": a.get("shortSummary") or a.get("description", ""),
+        "content": a.get("content", ""),
+        "image": a.get("imageUrl", ""),
+        "url": a.get("url", ""),
+        "source": (a.get("source") or {}).get("domain", ""),
+        "published_at": a.get("pubDate", ""),
+        "topics": [t["name"] for t in (a.get("topics") or [])],
+        "slug": re.sub(r"[^a-z0-9]+", "-", (a.get("title") or "").lower()).strip("-")[:80],
+        "category": "sports",
+    }
+
+async def _fetch_perigon_news(size: int = 20, since: Optional[datetime] = None, page: int = 0) -> tuple[list, int]:
+    """One page of Perigon sports news, newest first. Returns (articles, total results)."""
     params: Dict[str, Any] = {
         "apiKey": PERIGON_API_KEY,
         "category": "Sports",
@@ -2519,64 +4472,211 @@ async def _fetch_perigon_news(size: int = 20, topic: Optional[str] = None) -> li
         "showReprints": "false",
         "hasImage": "true",
         "size": size,
+        "page": page,
     }
-    if topic:
-        params["topic"] = topic
+    if since:
+        params["from"] = since.strftime("%Y-%m-%dT%H:%M:%S")
+
+    resp = await http_clients.get("perigon", "/v1/all", params=params)
+    resp.raise_for_status()
+    body = resp.json()
+    articles = body.get("articles", [])
+    normalized = [
+        _normalize_perigon_article(a)
+        for a in articles
+        if a.get("articleId") and a.get("title") and a.get("imageUrl")
+    ]
+    return normalized, body.get("numResults", len(articles))
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        resp = await client.get("https://api.goperigon.com/v1/all", params=params)
-        resp.raise_for_status()
-        articles = resp.json().get("articles", [])
+def _parse_pub_date(value: str) -> Optional[datetime]:
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+async def _store_news(articles: list) -> int:
+    """Upsert articles keyed by Perigon articleId. Returns how many were new."""
+    now = datetime.now(timezone.utc)
+    docs = []
+    for a in articles:
+        published_dt = _parse_pub_date(a["published_at"]) or now
+        slug = a["slug"] or a["id"]
+        fields = {k: v for k, v in a.items() if k != "slug"}
+        docs.append((a["id"], slug, {**fields, "published_dt": published_dt, "updated_at": now}))
+
+    def upsert(article_id: str, slug: str, fields: dict) -> UpdateOne:
+        # slug is only set on insert so article URLs stay stable
+        return UpdateOne({"id": article_id}, {"$set": fields, "$setOnInsert": {"slug": slug, "ingested_at": now}}, upsert=True)
 
-    return [
-        {
-            "id": a.get("articleId", ""),
-            "title": a.get("title", ""),
-            "description": a.get("shortSummary") or a.get("description", ""),
-            "content": a.get("content", ""),
-            "image": a.get("imageUrl", ""),
-            "url": a.get("url", ""),
-            "source": (a.get("source") or {}).get("domain", ""),
-            "published_at": a.get("pubDate", ""),
-            "topics": [t["name"] for t in (a.get("topics") or [])],
-            "slug": re.sub(r"[^a-z0-9]+", "-", (a.get("title") or "").lower()).strip("-")[:80],
-            "category": "sports",
+    try:
+        result = await db.news.bulk_write([upsert(*d) for d in docs], ordered=False)
+        return result.upserted_count
+    except BulkWriteError as e:
+        inserted = e.details.get("nUpserted", 0)
+        failed = [docs[err["index"]] for err in e.details.get("writeErrors", []) if err.get("code") == 11000]
+    # Same title from another source: disambiguate the slug with the article id
+    for article_id, slug, fields in failed:
+        try:
+            result = await db.news.bulk_write([upsert(article_id, f"{slug[:71]}-{article_id[:8]}", fields)])
+            inserted += result.upserted_count
+        except BulkWriteError as e:
+            logger.warning(f"News upsert failed for {article_id}: {e.details.get('writeErrors', [{}])[0].get('errmsg')}")
+    return inserted
+
+class NewsIngestor:
+    """Pulls Perigon sports news into the `news` collection.
+
+    Each run only requests articles published since the newest stored
+    ``pubDate`` (minus a small overlap) and pages until the window is read;
+    upserts keyed by ``articleId`` make the overlap free of duplicates.
+    Retention is a TTL index on ``published_dt``.
+
+    Runs on the leader only: on its interval, or when any worker flags a run
+    through ``requests``. The outcome is stored there for every worker to report.
+    """
+
+    def __init__(self):
+        self.is_running = False
+        self.task = None
+        self.lock = asyncio.Lock()
+        self.requests = RunRequest("news_ingest")
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info(f"News ingestor started (interval: {NEWS_INGEST_INTERVAL}s)")
+
+    async def stop(self):
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self) -> Dict[str, Any]:
+        """Ingest everything published since the last run. Concurrent calls wait for one run."""
+        async with self.lock:
+            newest = await db.news.find_one({}, {"_id": 0, "published_dt": 1}, sort=[("published_dt", -1)])
+            if newest:
+                since = newest["published_dt"].replace(tzinfo=timezone.utc) - NEWS_INGEST_OVERLAP
+            else:
+                since = datetime.now(timezone.utc) - timedelta(hours=NEWS_BACKFILL_HOURS)
+            fetched = inserted = pages = 0
+            error = None
+            try:
+                for page in range(NEWS_INGEST_MAX_PAGES):
+                    articles, total = await _fetch_perigon_news(size=NEWS_INGEST_PAGE_SIZE, since=since, page=page)
+                    pages += 1
+                    fetched += len(articles)
+                    if articles:
+                        inserted += await _store_news(articles)
+                    if (page + 1) * NEWS_INGEST_PAGE_SIZE >= total:
+                        break
+                else:
+                    logger.warning(f"News ingest stopped at {NEWS_INGEST_MAX_PAGES} pages; older articles in the window were skipped")
+            except Exception as e:
+                error = str(e)
+                logger.error(f"News ingest failed: {e}")
+            if inserted:
+                news_cache.invalidate()
+            logger.info(f"News ingest: {inserted} new / {fetched} fetched since {since.isoformat()}")
+            return {"since": since.isoformat(), "pages": pages, "fetched": fetched, "inserted": inserted, "error": error}
+
+    async def _run_loop(self):
+        next_run = 0.0
+        while self.is_running:
+            requested = False
+            try:
+                requested = await self.requests.claim(WORKER_ID)
+                if requested or time.monotonic() >= next_run:
+                    result = await self.run()
+                    next_run = time.monotonic() + NEWS_INGEST_INTERVAL
+                    await self.requests.finish(WORKER_ID, result, result["error"])
+                await asyncio.sleep(RUN_REQUEST_POLL)
+            except asyncio.CancelledError:
+                if requested:
+                    await asyncio.shield(self.requests.release(WORKER_ID))
+                break
+            except Exception as e:
+                logger.error(f"News ingestor error: {e}")
+                await asyncio.sleep(RUN_REQUEST_POLL)
+
+    async def status(self) -> Dict[str, Any]:
+        shared = await self.requests.get() or {}
+        return {
+            "ingest_in_progress": shared.get("status") == "running",
+            "ingest_requested": shared.get("status") == "requested",
+            "last_run": _iso(shared.get("last_run")),
+            "last_result": shared.get("last_result"),
+            "last_error": shared.get("last_error"),
         }
-        for a in articles
-        if a.get("title") and a.get("imageUrl")
-    ]
+
+news_ingestor = NewsIngestor()
+
+@cached(news_cache)
+async def _news_page(topic: Optional[str], page: int, size: int) -> Dict[str, Any]:
+    query = {"topics": topic} if topic else {}
+    total = await db.news.count_documents(query)
+    articles = await db.news.find(query, _NEWS_PROJECTION).sort("published_dt", -1).skip((page - 1) * size).limit(size).to_list(size)
+    return {
+        "articles": articles,
+        "count": len(articles),
+        "total": total,
+        "page": page,
+        "size": size,
+        "has_more": page * size < total,
+    }
 
 @api_router.get("/news")
-async def get_news(size: int = 20, topic: Optional[str] = None, refresh: bool = False):
-    """Get sports news from Perigon API with caching"""
-    if not PERIGON_API_KEY:
+async def get_news(size: int = 20, topic: Optional[str] = None, page: int = 1):
+    """Get sports news from the `news` store (fed by the Perigon ingestor)"""
+    size = max(1, min(size, NEWS_MAX_SIZE))
+    page = max(1, page)
+    result = await _news_page(topic, page, size)
+    if PERIGON_API_KEY and not result["total"] and page == 1 and not topic:
+        # Cold store before the first background run: nudge the leader, serve what is there
+        await news_ingestor.requests.request()
+    if not result["total"] and not PERIGON_API_KEY:
         raise HTTPException(status_code=503, detail="Perigon API key not configured")
+    return result
 
-    now_ts = time.time()
-    cache_key = f"{topic or 'all'}-{size}"
-
-    # Serve from cache if fresh
-    if (
-        not refresh
-        and _news_cache.get("data")
-        and _news_cache.get("cache_key") == cache_key
-        and (now_ts - _news_cache.get("ts", 0)) < _NEWS_TTL
-    ):
-        return {"articles": _news_cache["data"], "from_cache": True, "count": len(_news_cache["data"])}
+@api_router.get("/news/{slug}")
+async def get_news_article(slug: str):
+    """Get a single stored news article by slug"""
+    article = await db.news.find_one({"slug": slug}, _NEWS_PROJECTION)
+    if not article:
+        raise HTTPException(status_code=404, detail="Haber bulunamadı")
+    return article
 
-    try:
-        articles = await _fetch_perigon_news(size=size, topic=topic)
-        _news_cache["data"] = articles
-        _news_cache["ts"] = now_ts
-        _news_cache["cache_key"] = cache_key
-        return {"articles": articles, "from_cache": False, "count": len(articles)}
-    except Exception as e:
-        logger.error(f"Perigon API error: {e}")
-        if _news_cache.get("data"):
-            return {"articles": _news_cache["data"], "from_cache": True, "stale": True, "count": len(_news_cache["data"])}
-        raise HTTPException(status_code=503, detail=f"News API unavailable: {str(e)}")
+@api_router.post("/admin/news/ingest")
+async def ingest_news():
+    """Admin: ask the leader to pull new Perigon articles now; waits briefly for the result"""
+    if not PERIGON_API_KEY:
+        raise HTTPException(status_code=503, detail="Perigon API key not configured")
+    requested = await news_ingestor.requests.request()
+    done = await news_ingestor.requests.wait(NEWS_INGEST_WAIT)
+    if done is None:
+        return {"requested": requested, "completed": False, **await news_ingestor.status()}
+    return {"requested": requested, "completed": True, **(done.get("last_result") or {}), "error": done.get("last_error")}
+
+@api_router.get("/admin/news/status")
+async def get_news_status():
+    """Admin: news store size and last ingestion result"""
+    newest = await db.news.find_one({}, {"_id": 0, "published_at": 1}, sort=[("published_dt", -1)])
+    return {
+        "perigon_configured": bool(PERIGON_API_KEY),
+        "ingestor_running": news_ingestor.is_running,
+        "leader": leader_election.status(),
+        "stored_count": await db.news.estimated_document_count(),
+        "newest_published_at": newest["published_at"] if newest else None,
+        "retention_days": NEWS_RETENTION_DAYS,
+        **await news_ingestor.status(),
+    }
 
 @api_router.get("/categories")
+@cached(categories_cache)
 async def get_categories():
     """Get categories from DB, fallback to defaults"""
     cats = await db.categories.find({}, {"_id": 0}).sort("order", 1).to_list(50)
@@ -2609,6 +4709,7 @@ async def create_category(data: Dict[str, Any]):
         "is_active": True,
     }
     await db.categories.insert_one(cat)
+    categories_cache.invalidate()
     cat.pop("_id", None)
     return cat
 
@@ -2618,6 +4719,7 @@ async def update_category(cat_id: str, data: Dict[str, Any]):
     data.pop("id", None)
     data.pop("_id", None)
     await db.categories.update_one({"id": cat_id}, {"$set": data})
+    categories_cache.invalidate()
     updated = await db.categories.find_one({"id": cat_id}, {"_id": 0})
     return updated
 
@@ -2625,6 +4727,7 @@ async def update_category(cat_id: str, data: Dict[str, Any]):
 async def delete_category(cat_id: str):
     """Delete a category"""
     await db.categories.delete_one({"id": cat_id})
+    categories_cache.invalidate()
     return {"message": "Kategori silindi"}
 
 @api_router.post("/categories/reorder")
@@ -2633,6 +4736,7 @@ async def reorder_categories(data: Dict[str, Any]):
     order_list = data.get("order", [])
     for i, cat_id in enumerate(order_list):
         await db.categories.update_one({"id": cat_id}, {"$set": {"order": i + 1}})
+    categories_cache.invalidate()
     return {"message": "Sıralama güncellendi"}
 
 # Bonus Sites Reorder
@@ -2642,6 +4746,7 @@ async def reorder_bonus_sites(data: Dict[str, Any]):
     order_list = data.get("order", [])
     for i, site_id in enumerate(order_list):
         await db.bonus_sites.update_one({"id": site_id}, {"$set": {"sort_order": i + 1}})
+    invalidate_bonus_site_caches()
     return {"message": "Site sıralaması güncellendi"}
 
 # ============== SEO ENDPOINTS ==============
@@ -2778,6 +4883,7 @@ async def seed_database():
         site_obj = BonusSite(**site)
         site_obj.bonus_value = extract_bonus_value(site_obj.bonus_amount)
         await db.bonus_sites.insert_one(site_obj.model_dump())
+    invalidate_bonus_site_caches()
     
     logger.info("Database seeded successfully")
     return {"message": "Seeded", "sites": len(sites)}
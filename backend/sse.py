@@ -0,0 +1,195 @@
+"""
+SSE - Server-Sent Events helpers
+Event formatting, snapshot fan-out with diff events and Last-Event-ID replay,
+and progress streams for slow one-shot calls
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("api")
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # disable proxy buffering (nginx / Railway edge)
+}
+
+# ============== FORMAT ==============
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[str] = None, retry_ms: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    if retry_ms is not None:
+        lines.append(f"retry: {retry_ms}")
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, default=str)
+    lines.extend(f"data: {line}" for line in payload.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_comment(text: str = "keep-alive") -> str:
+    return f": {text}\n\n"
+
+# ============== SNAPSHOT BROADCASTER ==============
+
+_RESET = object()  # queued for subscribers that fell behind; they get a full snapshot instead
+
+Event = Tuple[int, str, Dict[str, Any]]
+
+
+class SnapshotBroadcaster:
+    """Fans out one ordered snapshot (items with an ``id``) to many SSE clients.
+
+    ``publish`` diffs the new snapshot against the previous one and pushes a
+    ``diff`` event (changed items, removed ids, new order) with an incremental
+    id to every subscriber queue. The last ``history`` events are kept so a
+    reconnecting client sending ``Last-Event-ID`` only receives what it missed;
+    older ids (or a full queue) fall back to a ``snapshot`` event.
+
+    Event ids are ``<epoch>:<n>``; the epoch changes per process, so an id
+    issued by another worker or before a restart always gets a fresh snapshot.
+    """
+
+    def __init__(self, name: str, history: int = 100, queue_size: int = 32, max_subscribers: int = 1000):
+        self.name = name
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.epoch = uuid.uuid4().hex[:8]
+        self.event_id = 0
+        self.items: Dict[str, dict] = {}
+        self.order: List[str] = []
+        self.history: "deque[Event]" = deque(maxlen=history)
+        self.subscribers: set = set()
+        self.published = 0
+        self.resets = 0
+        self.connections = 0
+
+    def publish(self, items: List[dict]) -> Optional[int]:
+        """Push the diff against the previous snapshot; returns the event id, or None if nothing changed"""
+        new_items = {item["id"]: item for item in items}
+        order = [item["id"] for item in items]
+        changed = [item for item in items if self.items.get(item["id"]) != item]
+        removed = [key for key in self.items if key not in new_items]
+        if not changed and not removed and order == self.order:
+            return None
+        self.items, self.order = new_items, order
+        self.event_id += 1
+        event: Event = (self.event_id, "diff", {"changed": changed, "removed": removed, "order": order})
+        self.history.append(event)
+        self.published += 1
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client: drop its backlog and resync it with one snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_RESET)
+                self.resets += 1
+        return self.event_id
+
+    def snapshot_event(self) -> Event:
+        return self.event_id, "snapshot", {"items": [self.items[key] for key in self.order]}
+
+    def replay_since(self, last_event_id: int) -> Optional[List[Event]]:
+        """Events after ``last_event_id``, or None when they are no longer in the history"""
+        if last_event_id == self.event_id:
+            return []
+        if last_event_id > self.event_id or not self.history or self.history[0][0] > last_event_id + 1:
+            return None
+        return [event for event in self.history if event[0] > last_event_id]
+
+    def _parse_id(self, last_event_id: Optional[str]) -> Optional[int]:
+        epoch, _, number = (last_event_id or "").partition(":")
+        if epoch != self.epoch or not number.isdigit():
+            return None
+        return int(number)
+
+    def _frame(self, event_id: int, event: str, data: Dict[str, Any]) -> str:
+        return format_sse(data, event=event, event_id=f"{self.epoch}:{event_id}")
+
+    @property
+    def full(self) -> bool:
+        return len(self.subscribers) >= self.max_subscribers
+
+    async def stream(self, last_event_id: Optional[str] = None, heartbeat: float = 15, retry_ms: int = 5000) -> AsyncIterator[str]:
+        """Yield SSE frames for one client until it disconnects (the generator is cancelled)"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.add(queue)
+        self.connections += 1
+        try:
+            initial = None
+            last_seen = self._parse_id(last_event_id)
+            if last_seen is not None:
+                initial = self.replay_since(last_seen)
+            if initial is None:
+                initial = [self.snapshot_event()]
+            sent_id = self.event_id  # the initial events cover everything up to now
+            yield format_sse({"subscribers": len(self.subscribers)}, event="hello", retry_ms=retry_ms)
+            for event_id, event, data in initial:
+                yield self._frame(event_id, event, data)
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield sse_comment()
+                    continue
+                if item is _RESET:
+                    event_id, event, data = self.snapshot_event()
+                elif item[0] > sent_id:
+                    event_id, event, data = item
+                else:
+                    continue  # already covered by the initial events
+                yield self._frame(event_id, event, data)
+                sent_id = event_id
+        finally:
+            self.subscribers.discard(queue)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "max_subscribers": self.max_subscribers,
+            "last_event_id": f"{self.epoch}:{self.event_id}",
+            "published": self.published,
+            "resets": self.resets,
+            "connections": self.connections,
+            "history": len(self.history),
+        }
+
+# ============== RESULT STREAM ==============
+
+async def stream_result(work: Callable[[], Awaitable[Any]], heartbeat: float = 15) -> AsyncIterator[str]:
+    """SSE frames for one slow call (e.g. an LLM completion).
+
+    ``start`` is sent right away and ``progress`` every ``heartbeat`` seconds while
+    ``work()`` runs; then the ``result`` and ``done``. A failure ends the stream
+    with ``error``. The call is cancelled when the client disconnects. The upstream
+    call is not token-streamed, so there are no partial-text events.
+    """
+    started = time.monotonic()
+    task = asyncio.ensure_future(work())
+    try:
+        yield format_sse({"status": "started"}, event="start")
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=heartbeat)
+            if done:
+                break
+            yield format_sse({"status": "running", "elapsed_seconds": round(time.monotonic() - started, 1)}, event="progress")
+        try:
+            result = task.result()
+        except Exception as e:
+            logger.warning(f"Streamed call failed: {e}")
+            yield format_sse({"detail": getattr(e, "detail", None) or str(e)}, event="error")
+            return
+        yield format_sse(result, event="result")
+        yield format_sse({"elapsed_seconds": round(time.monotonic() - started, 1)}, event="done")
+    finally:
+        task.cancel()
@@ -452,6 +452,35 @@ class TestDomainsCRUD:
         # Cleanup
         self.api.delete(f"{BASE_URL}/api/domains/{domain_id}")
 
+    def test_create_domain_queues_starter_job(self):
+        """POST /api/domains - starter content goes to the domain job queue and can be cancelled"""
+        test_domain = {
+            "domain_name": f"job-test-{uuid.uuid4().hex[:8]}.com",
+            "display_name": "Job Test",
+            "focus": "bonus"
+        }
+        create_resp = self.api.post(f"{BASE_URL}/api/domains", json=test_domain)
+        assert create_resp.status_code == 200
+        domain_id = create_resp.json()["id"]
+
+        jobs_resp = self.api.get(f"{BASE_URL}/api/domain-jobs", params={"domain_id": domain_id})
+        assert jobs_resp.status_code == 200
+        data = jobs_resp.json()
+        assert "counts" in data and "supervisor" in data
+        assert len(data["jobs"]) == 1
+        job = data["jobs"][0]
+        assert job["kind"] == "starter_content"
+        assert job["status"] in ("queued", "running")
+        print(f"✓ Starter job {job['id']} is {job['status']}")
+
+        cancel_resp = self.api.post(f"{BASE_URL}/api/domain-jobs/{job['id']}/cancel")
+        assert cancel_resp.status_code == 200
+        assert cancel_resp.json()["status"] in ("cancelled", "running")
+        print("✓ Starter job cancel accepted")
+
+        # Cleanup
+        self.api.delete(f"{BASE_URL}/api/domains/{domain_id}")
+
 
 class TestAutoContent:
     """Test Auto Content Generation endpoints"""
@@ -494,6 +523,112 @@ class TestAdminAPIStatus:
         print(f"  - AI insight enabled: {data['ai_insight_enabled']}")
 
 
+class TestReadCaches:
+    """Test read cache invalidation and /api/admin/cache-stats"""
+
+    def test_cache_stats_structure(self):
+        """GET /api/admin/cache-stats - exposes hit/miss counters per cache"""
+        api = requests.Session()
+        api.get(f"{BASE_URL}/api/categories")
+        api.get(f"{BASE_URL}/api/categories")
+        response = api.get(f"{BASE_URL}/api/admin/cache-stats")
+        assert response.status_code == 200
+
+        caches = response.json()["caches"]
+        for name in ("categories", "bonus_sites", "latest_articles", "firma_detail", "site_data"):
+            assert name in caches, f"Missing cache: {name}"
+        stats = caches["categories"]
+        for field in ("hits", "misses", "stale_hits", "coalesced", "size"):
+            assert field in stats
+        assert stats["hits"] + stats["stale_hits"] >= 1
+        print(f"✓ GET /api/admin/cache-stats - categories: {stats}")
+
+    def test_bonus_site_update_invalidates_cache(self):
+        """PUT /api/bonus-sites/{id} - cached list reflects the update immediately"""
+        api = requests.Session()
+        api.headers.update({"Content-Type": "application/json"})
+        created = api.post(f"{BASE_URL}/api/bonus-sites", json={
+            "name": f"TEST_Cache_{uuid.uuid4().hex[:8]}",
+            "logo_url": "https://example.com/logo.png",
+            "bonus_type": "deneme",
+            "bonus_amount": "500 TL",
+            "affiliate_url": "https://example.com/affiliate",
+        }).json()
+        site_id = created["id"]
+
+        # Warm the cache, then update
+        api.get(f"{BASE_URL}/api/bonus-sites")
+        api.put(f"{BASE_URL}/api/bonus-sites/{site_id}", json={"bonus_amount": "999 TL"})
+
+        sites = api.get(f"{BASE_URL}/api/bonus-sites").json()
+        site = next((s for s in sites if s["id"] == site_id), None)
+        assert site is not None
+        assert site["bonus_amount"] == "999 TL", "Cached list should be invalidated on update"
+
+        api.delete(f"{BASE_URL}/api/bonus-sites/{site_id}")
+        sites = api.get(f"{BASE_URL}/api/bonus-sites").json()
+        assert site_id not in [s["id"] for s in sites], "Cached list should be invalidated on delete"
+        print("✓ Bonus site cache invalidated on update and delete")
+
+
+class TestLlmGateway:
+    """Test /api/admin/llm-status"""
+
+    def test_llm_status_structure(self):
+        """GET /api/admin/llm-status - adaptive concurrency per provider"""
+        response = requests.get(f"{BASE_URL}/api/admin/llm-status")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["worker"]
+        assert data["call_timeout_seconds"] > 0
+        for provider, limiter in data["providers"].items():
+            assert limiter["min_limit"] <= limiter["limit"] <= limiter["max_limit"], provider
+            assert limiter["in_flight"] >= 0
+        print(f"✓ GET /api/admin/llm-status - providers: {list(data['providers'])}")
+
+    def test_llm_status_priority_classes(self):
+        """GET /api/admin/llm-status - per-class shares and queue depth"""
+        response = requests.get(f"{BASE_URL}/api/admin/llm-status")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["priorities"] == ["interactive", "public", "background"]
+        assert data["deadline_seconds"]["background"] is None
+        for provider, limiter in data["providers"].items():
+            classes = limiter["classes"]
+            assert set(classes) == set(data["priorities"]), provider
+            assert classes["interactive"]["max_slots"] == limiter["limit"]
+            assert classes["background"]["max_slots"] <= limiter["limit"]
+            assert sum(c["queued"] for c in classes.values()) == limiter["waiting"]
+        print(f"✓ GET /api/admin/llm-status - priority classes: {data['priorities']}")
+
+    def test_llm_status_breakers(self):
+        """GET /api/admin/llm-status - circuit breaker per provider/model"""
+        response = requests.get(f"{BASE_URL}/api/admin/llm-status")
+        assert response.status_code == 200
+
+        breakers = response.json()["breakers"]
+        for name, breaker in breakers.items():
+            assert "/" in name
+            assert breaker["state"] in ("closed", "open", "half_open"), name
+            assert 0 <= breaker["error_rate"] <= 1
+            assert breaker["cooldown_seconds"] > 0
+        print(f"✓ GET /api/admin/llm-status - breakers: { {k: b['state'] for k, b in breakers.items()} }")
+
+    def test_llm_status_hedging(self):
+        """GET /api/admin/llm-status - hedged requests stay within budget"""
+        response = requests.get(f"{BASE_URL}/api/admin/llm-status")
+        assert response.status_code == 200
+
+        hedging = response.json()["hedging"]
+        assert 0 <= hedging["budget"] <= 1
+        assert hedging["hedge_wins"] <= hedging["hedged"] <= hedging["eligible"]
+        if hedging["eligible"] >= 100:
+            assert hedging["hedged"] <= hedging["budget"] * hedging["eligible"] + 10
+        print(f"✓ GET /api/admin/llm-status - hedged {hedging['hedged']}/{hedging['eligible']}")
+
+
 # Cleanup helper to remove test data
 def cleanup_test_data():
     """Remove all TEST_ prefixed data"""
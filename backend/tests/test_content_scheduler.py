@@ -152,6 +152,18 @@ class TestSchedulerControls:
         
         print(f"Scheduler status: is_running={data['is_running']}, interval={data['interval_minutes']}min, pending={data['pending_items']}")
 
+    def test_scheduler_status_reports_leases(self):
+        """Test GET /api/scheduler/status exposes the worker id and held leases"""
+        response = requests.get(f"{BASE_URL}/api/scheduler/status")
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["worker"], "Status should name the worker holding leases"
+        assert isinstance(data["leases_held"], int)
+        assert data["leases_held"] >= 0
+        print(f"Scheduler worker={data['worker']}, leases_held={data['leases_held']}")
+
     def test_start_scheduler(self):
         """Test POST /api/scheduler/start"""
         response = requests.post(f"{BASE_URL}/api/scheduler/start")
@@ -202,6 +214,44 @@ class TestSchedulerControls:
         # Should reject values less than 1
         assert response.status_code == 400, "Interval < 1 should be rejected"
 
+    def test_scheduler_status_reports_pipeline_progress(self):
+        """Test GET /api/scheduler/status exposes throughput, in-flight count and backlog ETA"""
+        response = requests.get(f"{BASE_URL}/api/scheduler/status")
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert isinstance(data["pipelines"], list)
+        assert data["in_flight"] >= 0
+        assert data["throughput_per_minute"] >= 0
+        if data["throughput_per_minute"] == 0:
+            assert data["backlog_eta_seconds"] is None
+        for pipeline in data["pipelines"]:
+            assert set(pipeline["stages"]) == {"prompt", "llm", "post_process", "persist"}
+        print(f"Pipeline: in_flight={data['in_flight']}, {data['throughput_per_minute']}/min, eta={data['backlog_eta_seconds']}s")
+
+    def test_update_scheduler_concurrency(self):
+        """Test PUT /api/scheduler/concurrency is stored in the shared state"""
+        response = requests.put(f"{BASE_URL}/api/scheduler/concurrency", json={"concurrency": 3})
+        
+        assert response.status_code == 200
+        assert response.json()["batch_size"] == 3
+        
+        status_response = requests.get(f"{BASE_URL}/api/scheduler/status")
+        data = status_response.json()
+        assert data["batch_size"] == 3
+        assert isinstance(data["workers"], list)
+        print(f"Scheduler concurrency=3, consumers={[w['id'] for w in data['workers']]}")
+        
+        # Restore default
+        requests.put(f"{BASE_URL}/api/scheduler/concurrency", json={"concurrency": 5})
+
+    def test_update_scheduler_concurrency_bounds(self):
+        """Test PUT /api/scheduler/concurrency rejects values outside 1-20"""
+        for value in (0, 21, "5"):
+            response = requests.put(f"{BASE_URL}/api/scheduler/concurrency", json={"concurrency": value})
+            assert response.status_code == 400, f"concurrency={value!r} should be rejected"
+
     def test_run_scheduler_now(self):
         """Test POST /api/scheduler/run-now returns immediately"""
         start_time = time.time()
@@ -189,6 +189,67 @@ class TestGoDaddyAPI:
         
         print(f"✓ already_added flags verified for {min(50, len(godaddy_data['domains']))} domains")
 
+    def test_godaddy_domains_paging_and_filters(self):
+        """GET /api/godaddy/domains - server-side paging, hosting_status filter and search"""
+        response = self.session.get(f"{BASE_URL}/api/godaddy/domains", params={"limit": 5, "page": 1})
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["domains"]) <= 5
+        assert data["has_more"] == (data["total"] > 5)
+        for key in ["total", "parked", "hosted", "platform"]:
+            assert key in data["stats"]
+        assert data["stats"]["total"] == data["stats"]["parked"] + data["stats"]["hosted"] + data["stats"]["platform"]
+
+        parked = self.session.get(f"{BASE_URL}/api/godaddy/domains", params={"hosting_status": "parked", "limit": 20}).json()
+        assert parked["total"] == data["stats"]["parked"]
+        assert all(d["hosting_status"] == "parked" for d in parked["domains"])
+
+        if data["domains"]:
+            needle = data["domains"][0]["domain"].split(".")[0]
+            found = self.session.get(f"{BASE_URL}/api/godaddy/domains", params={"search": needle}).json()
+            assert all(needle in d["domain"] for d in found["domains"])
+        print(f"✓ Paging/filter verified: {data['stats']}")
+
+    def test_godaddy_sync_status(self):
+        """GET /api/godaddy/sync-status - reports stored inventory and last sync"""
+        response = self.session.get(f"{BASE_URL}/api/godaddy/sync-status")
+        assert response.status_code == 200
+        data = response.json()
+        for field in ["stored_count", "in_progress", "last_sync", "last_error"]:
+            assert field in data, f"Missing field: {field}"
+        print(f"✓ Sync status: {data['stored_count']} stored, last sync {data['last_sync']}")
+
+    def test_godaddy_bulk_import_validation(self):
+        """POST /api/godaddy/import-bulk - invalid and existing names are skipped in one job"""
+        domains_response = self.session.get(f"{BASE_URL}/api/domains")
+        assert domains_response.status_code == 200
+        platform_domains = [d["domain_name"] for d in domains_response.json()]
+        if not platform_domains:
+            pytest.skip("No platform domains to test duplicate detection")
+
+        existing = platform_domains[0]
+        response = self.session.post(
+            f"{BASE_URL}/api/godaddy/import-bulk",
+            json={"domain_names": [existing, existing.upper(), "not a domain"], "focus": "bonus"}
+        )
+        assert response.status_code == 200, response.text
+        job = response.json()
+        assert job["accepted"] == 0
+        reasons = {s["domain"]: s["reason"] for s in job["skipped"]}
+        assert reasons[existing] == "already_exists"
+        assert reasons["not a domain"] == "invalid"
+
+        job_response = self.session.get(f"{BASE_URL}/api/godaddy/import-jobs/{job['id']}")
+        assert job_response.status_code == 200
+        assert job_response.json()["status"] == "completed"
+        print(f"✓ Bulk import skipped {len(job['skipped'])} names")
+
+    def test_godaddy_bulk_import_empty(self):
+        """POST /api/godaddy/import-bulk - should reject a list without valid names"""
+        response = self.session.post(f"{BASE_URL}/api/godaddy/import-bulk", json={"domain_names": ["", "  "]})
+        assert response.status_code == 400
+        print("✓ Empty bulk import rejected")
+
 
 class TestGoDaddyImportIntegration:
     """Test GoDaddy import creates all required platform resources"""
@@ -1,6 +1,6 @@
 """
 Match Hub Backend API Tests
-Tests for: /api/sports/scores, /api/sports/featured, /api/sports/match/{id},
+Tests for: /api/sports/scores, /api/sports/stream, /api/sports/featured, /api/sports/match/{id},
            /api/sports/match-by-slug/{slug}, /api/admin/api-status,
            /api/admin/ai-toggle, /api/admin/refresh-scores,
            /api/go/{partner_id}/{match_id}, /api/auth/login
@@ -179,6 +179,50 @@ class TestSportsScores:
         print(f"Cache working: from_cache={data['from_cache']}")
 
 
+# ── live score stream ─────────────────────────────────────────────────
+
+def _read_sse_events(resp, count):
+    """Parse the first `count` SSE events (comments skipped) into dicts"""
+    events, current = [], {}
+    for line in resp.iter_lines(decode_unicode=True):
+        if line == "":
+            if current:
+                events.append(current)
+                current = {}
+                if len(events) >= count:
+                    break
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(": ")
+        current[field] = value
+    return events
+
+class TestScoresStream:
+    """Tests for /api/sports/stream (SSE)"""
+
+    def test_stream_sends_hello_and_snapshot(self):
+        """First events: hello (with retry), then a snapshot carrying an event id"""
+        with requests.get(f"{BASE_URL}/api/sports/stream", stream=True, timeout=20) as resp:
+            assert resp.status_code == 200
+            assert resp.headers["content-type"].startswith("text/event-stream")
+            hello, snapshot = _read_sse_events(resp, 2)
+        assert hello["event"] == "hello"
+        assert "retry" in hello
+        assert snapshot["event"] == "snapshot"
+        assert ":" in snapshot["id"]
+        print(f"Stream snapshot id: {snapshot['id']}")
+
+    def test_stream_unknown_last_event_id_gets_snapshot(self):
+        """Reconnecting with an unknown Last-Event-ID falls back to a snapshot"""
+        headers = {"Last-Event-ID": "stale:1"}
+        with requests.get(f"{BASE_URL}/api/sports/stream", headers=headers, stream=True, timeout=20) as resp:
+            assert resp.status_code == 200
+            events = _read_sse_events(resp, 2)
+        assert events[1]["event"] == "snapshot"
+        print("Stream resume with stale id returned a snapshot")
+
+
 # ── featured match ────────────────────────────────────────────────────
 
 class TestFeaturedMatch:
@@ -223,6 +267,18 @@ class TestFeaturedMatch:
         assert data["slug"], "Featured match slug is empty"
         print(f"Featured slug: {data['slug']}")
 
+    def test_featured_insight_is_cached(self):
+        """Repeated featured requests should be fast and return the same cached insight"""
+        first = requests.get(f"{BASE_URL}/api/sports/featured").json()
+        if first is None or not first.get("ai_insight"):
+            pytest.skip("No featured match or insight not generated yet")
+        start = time.time()
+        second = requests.get(f"{BASE_URL}/api/sports/featured").json()
+        elapsed = time.time() - start
+        assert second["ai_insight"] == first["ai_insight"], "Insight should come from cache"
+        assert elapsed < 2.0, f"Cached featured request too slow: {elapsed:.2f}s"
+        print(f"Cached featured insight in {elapsed * 1000:.0f}ms")
+
 
 # ── match detail ──────────────────────────────────────────────────────
 
@@ -319,13 +375,35 @@ class TestAdminApiStatus:
         print(f"Odds API configured: {data['odds_api_configured']}")
 
     def test_api_status_cache_ttl(self):
-        """Cache TTL should be 120 seconds"""
+        """Cache TTL follows the shortest league polling interval (60s live .. 1800s idle, or stretched)"""
         resp = requests.get(f"{BASE_URL}/api/admin/api-status")
         assert resp.status_code == 200
         data = resp.json()
-        assert data["cache_ttl_seconds"] == 120
+        assert data["cache_ttl_seconds"] >= 60
         print(f"Cache TTL: {data['cache_ttl_seconds']}s")
 
+    def test_api_status_quota(self):
+        """Quota section reports budget, projected burn and per-league schedule"""
+        resp = requests.get(f"{BASE_URL}/api/admin/api-status")
+        assert resp.status_code == 200
+        quota = resp.json()["quota"]
+        for field in ["remaining", "used_today", "daily_budget", "projected_daily_burn", "effective_daily_burn", "stretch_factor", "leagues"]:
+            assert field in quota, f"Missing quota field: {field}"
+        assert quota["effective_daily_burn"] <= quota["projected_daily_burn"]
+        for league in quota["leagues"].values():
+            assert league["mode"] in ("live", "soon", "idle")
+        print(f"Quota: {quota['used_today']} used today, projected {quota['projected_daily_burn']}/day")
+
+    def test_api_status_leader(self):
+        """Leader section names the process running the singleton loops"""
+        resp = requests.get(f"{BASE_URL}/api/admin/api-status")
+        assert resp.status_code == 200
+        leader = resp.json()["leader"]
+        assert leader["leader"], "A leader should be elected while the API is up"
+        assert leader["is_leader"] == (leader["leader"] == leader["process"])
+        assert "bootstrap_database" in leader["singletons"]
+        print(f"Leader: {leader['leader']} (term {leader['term']}), served by {leader['process']}")
+
 
 # ── admin AI toggle ───────────────────────────────────────────────────
 
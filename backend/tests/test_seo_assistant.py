@@ -5,10 +5,31 @@ Tests /api/seo/* endpoints for the Advanced SEO Assistant feature
 import pytest
 import requests
 import os
+import json
 import time
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
 
+def _read_sse_until_done(resp):
+    """Parse SSE events until `done` or `error`; the first event records its arrival time in `_at`"""
+    events, current = [], {}
+    for line in resp.iter_lines(decode_unicode=True):
+        if line == "":
+            if current:
+                if not events:
+                    current["_at"] = time.time()
+                events.append(current)
+                if current.get("event") in ("done", "error"):
+                    break
+                current = {}
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(": ")
+        current[field] = current[field] + "\n" + value if field in current else value
+    return events
+
+
 class TestSEODashboard:
     """SEO Dashboard endpoint tests"""
     
@@ -161,6 +182,28 @@ class TestMetaGenerator:
             print(f"✓ Meta title generated: {opt.get('meta_title')[:50]}...")
         print("✓ Meta generator completed")
 
+    def test_meta_generator_repeat_is_cached(self):
+        """POST /api/seo/meta-generator twice with the same input - second answer comes from the cache"""
+        payload = {"topic": "TEST_Cache Bonus Rehberi", "page_type": "article", "keywords": ["bonus"]}
+        first = requests.post(f"{BASE_URL}/api/seo/meta-generator", json=payload, timeout=60)
+        assert first.status_code == 200
+
+        started = time.time()
+        second = requests.post(f"{BASE_URL}/api/seo/meta-generator", json=payload, timeout=60)
+        elapsed = time.time() - started
+        assert second.status_code == 200
+        assert second.json()["cached"] is True
+        assert {k: v for k, v in second.json().items() if k != "cached"} == {k: v for k, v in first.json().items() if k != "cached"}
+        print(f"✓ Meta generator cache hit in {elapsed:.2f}s")
+
+    def test_meta_generator_refresh_bypasses_cache(self):
+        """POST /api/seo/meta-generator?refresh=true always regenerates"""
+        payload = {"topic": "TEST_Cache Bonus Rehberi", "page_type": "article", "keywords": ["bonus"]}
+        response = requests.post(f"{BASE_URL}/api/seo/meta-generator?refresh=true", json=payload, timeout=60)
+        assert response.status_code == 200
+        assert response.json()["cached"] is False
+        print("✓ Meta generator refresh=true regenerated")
+
 
 class TestContentOptimizer:
     """Content Optimizer endpoint tests"""
@@ -208,6 +251,36 @@ class TestContentOptimizer:
         assert response.status_code == 400
         print("✓ Content optimizer validates required fields")
 
+    def test_content_optimizer_stream(self):
+        """POST /api/seo/content-optimizer/stream sends start first and ends with result + done"""
+        payload = {
+            "title": "Deneme Bonusu Rehberi",
+            "content": "Deneme bonusu, bahis sitelerinin yeni üyelerine sunduğu bir promosyon türüdür.",
+            "target_keyword": "deneme bonusu"
+        }
+        started = time.time()
+        with requests.post(f"{BASE_URL}/api/seo/content-optimizer/stream", json=payload, stream=True, timeout=120) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = _read_sse_until_done(response)
+        first_event_seconds = events[0].pop("_at") - started
+
+        names = [e["event"] for e in events]
+        assert names[0] == "start"
+        assert first_event_seconds < 2
+        assert names[-1] in ("done", "error")
+        if names[-1] == "done":
+            result = json.loads(next(e["data"] for e in events if e["event"] == "result"))
+            assert "optimized_title" in result or "content_improvements" in result or "raw_result" in result
+        print(f"✓ Content optimizer stream: first event after {first_event_seconds:.2f}s, events: {names}")
+
+    def test_content_optimizer_stream_requires_content(self):
+        """POST /api/seo/content-optimizer/stream validates before streaming (400)"""
+        payload = {"title": "", "content": "", "target_keyword": ""}
+        response = requests.post(f"{BASE_URL}/api/seo/content-optimizer/stream", json=payload, timeout=30)
+        assert response.status_code == 400
+        print("✓ Content optimizer stream validates required fields")
+
 
 class TestContentScore:
     """Content Score endpoint tests"""
@@ -235,6 +308,68 @@ class TestContentScore:
             print(f"✓ Content score: {data.get('overall_score')}")
         print("✓ Content scoring completed")
 
+    def test_content_score_is_local_and_deterministic(self):
+        """POST /api/seo/content-score scores locally: exact metrics, rule checks, same result twice"""
+        payload = {
+            "title": "Deneme Bonusu Rehberi",
+            "content": "<h2>Deneme Bonusu Nedir</h2><p>Deneme bonusu yeni üyelere verilir. Çevrim şartı vardır.</p>"
+                       "<ul><li>Kolay</li></ul><table><tr><td>Site</td></tr></table>",
+            "target_keyword": "deneme bonusu",
+            "meta_title": "Deneme Bonusu Rehberi 2026 - Güncel Liste"
+        }
+        first = requests.post(f"{BASE_URL}/api/seo/content-score", json=payload, timeout=30)
+        second = requests.post(f"{BASE_URL}/api/seo/content-score", json=payload, timeout=30)
+        assert first.status_code == 200
+        data = first.json()
+        assert data == second.json()
+
+        assert data["analyzer"] == "local"
+        assert data["advice"] is None
+        assert data["headings"]["counts"]["h2"] == 1
+        assert data["tables"] == 1 and data["lists"] == 1
+        assert data["keyword"]["in_first_paragraph"] is True
+        assert data["meta"]["title"]["ok"] is True
+        assert 0 <= data["overall_score"] <= 100
+        rules = {r["id"]: r for r in data["rules"]}
+        assert rules["min_words"]["passed"] is False
+        assert rules["h2_count"]["actual"] == 1
+        print(f"✓ Local content score: {data['overall_score']}, {data['rules_passed']}/{data['rules_checked']} rules")
+
+    def test_content_score_unclosed_paragraphs(self):
+        """POST /api/seo/content-score keeps text of <p> tags left open before a block"""
+        payload = {
+            "title": "Deneme Bonusu Rehberi",
+            "content": "<p>Deneme bonusu yeni üyelere verilir.<h2>Çevrim Şartı</h2><p>Çevrim şartı vardır."
+                       "<ul><li>Kolay</li></ul><p>Kısa metin.<table><tr><td>Site</td></tr></table>"
+                       "<p>Sonuç olarak deneme bonusu avantajlıdır.",
+            "target_keyword": "deneme bonusu",
+        }
+        response = requests.post(f"{BASE_URL}/api/seo/content-score", json=payload, timeout=30)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["keyword"]["in_first_paragraph"] is True
+        assert data["keyword"]["in_last_paragraph"] is True
+        assert data["paragraphs"]["count"] == 4
+        print(f"✓ Unclosed paragraphs scored: {data['paragraphs']}")
+
+    def test_content_score_batch(self):
+        """POST /api/seo/content-score/batch scores the corpus and saves a report"""
+        response = requests.post(f"{BASE_URL}/api/seo/content-score/batch?limit=5", timeout=120)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["report_id"]
+        assert len(data["lowest"]) <= 5
+        scores = [r["overall_score"] for r in data["lowest"]]
+        assert scores == sorted(scores)
+        print(f"✓ Batch scored {data['articles']} articles in {data['duration_seconds']}s, avg {data['avg_score']}")
+
+        scores_response = requests.get(f"{BASE_URL}/api/seo/reports/{data['report_id']}/scores?limit=5", timeout=30)
+        assert scores_response.status_code == 200
+        scores_data = scores_response.json()
+        assert scores_data["total"] == data["articles"]
+        assert [r["overall_score"] for r in scores_data["scores"]] == scores
+        print(f"✓ Report stores {scores_data['total']} per-article scores")
+
 
 class TestInternalLinks:
     """Internal Links endpoint tests"""
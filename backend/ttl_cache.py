@@ -0,0 +1,202 @@
+"""
+TTL CACHE - Async in-process cache for hot read endpoints
+Per-key TTL, LRU bound, single-flight loading, stale-while-revalidate
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Union
+
+logger = logging.getLogger("api")
+
+# ============== CACHE ==============
+
+_TTL = Union[float, Callable[[Any], float]]  # seconds, or computed from the loaded value
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+class AsyncTTLCache:
+    """LRU-bounded TTL cache whose loads are shared between concurrent callers.
+
+    - fresh entry: returned immediately (hit)
+    - stale entry (within ``stale_ttl`` after expiry): returned immediately while
+      one background load refreshes it
+    - missing entry: all concurrent callers await a single load (single-flight)
+
+    Loads run as their own task, so a cancelled request never cancels the load
+    other callers are waiting on. Failed loads are not cached; empty (falsy)
+    results are kept for ``empty_ttl`` when given, so they are retried sooner.
+    ``ttl`` may also be a function of the loaded value, for values that carry
+    their own expiry.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 256, stale_ttl: float = 0, empty_ttl: Optional[float] = None):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self.empty_ttl = empty_ttl
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.load_errors = 0
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh value without loading, or ``default``"""
+        entry = self._data.get(key)
+        if entry is None or time.monotonic() >= entry.expires_at:
+            return default
+        return entry.value
+
+    def peek(self, key: Hashable) -> Optional[tuple]:
+        """Return ``(value, is_fresh)`` for a fresh or stale entry, else None"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now >= entry.stale_until:
+            return None
+        return entry.value, now < entry.expires_at
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        now = time.monotonic()
+        self._data[key] = _Entry(value, now + ttl, now + ttl + self.stale_ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[_TTL] = None) -> Any:
+        entry = self._data.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry.expires_at:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            if now < entry.stale_until:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                self._start_load(key, loader, ttl)
+                return entry.value
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = self._start_load(key, loader, ttl)
+        return await asyncio.shield(task)
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[_TTL]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+        task = asyncio.ensure_future(self._run_load(key, loader, ttl))
+        task.add_done_callback(self._load_done)
+        self._inflight[key] = task
+        return task
+
+    async def _run_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[_TTL]) -> Any:
+        current = False
+        try:
+            value = await loader()
+        except Exception as e:
+            self.load_errors += 1
+            logger.warning(f"Cache '{self.name}' load failed: {e}")
+            raise
+        finally:
+            # invalidate() detaches the key's in-flight load, so only that key's load is discarded
+            current = self._inflight.get(key) is asyncio.current_task()
+            if current:
+                del self._inflight[key]
+        if current:
+            if not value and self.empty_ttl is not None:
+                ttl = self.empty_ttl
+            elif callable(ttl):
+                ttl = ttl(value)
+            self.set(key, value, ttl)
+        return value
+
+    @staticmethod
+    def _load_done(task: asyncio.Task) -> None:
+        # Background refreshes have no awaiter; retrieve the exception so it is not logged as lost
+        if not task.cancelled():
+            task.exception()
+
+    def invalidate(self, key: Any = None) -> None:
+        """Drop one key, or the whole cache when no key is given.
+
+        Loads in flight for the dropped keys still answer their callers but are not stored.
+        """
+        self.invalidations += 1
+        if key is None:
+            self._data.clear()
+            self._inflight.clear()
+        else:
+            self._data.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "load_errors": self.load_errors,
+            "inflight": len(self._inflight),
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+_registry: Dict[str, AsyncTTLCache] = {}
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters for every cache created in this process"""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+# ============== DECORATOR ==============
+
+def _make_key(args: tuple, kwargs: dict) -> Hashable:
+    return (args, tuple(sorted(kwargs.items())))
+
+
+def cached(cache: AsyncTTLCache, key: Optional[Callable[..., Hashable]] = None, ttl: Optional[float] = None):
+    """Cache an async function's result in ``cache``.
+
+    The wrapper keeps the original signature (FastAPI reads it through
+    ``__wrapped__``), so it can sit directly under a route decorator.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else _make_key(args, kwargs)
+            return await cache.get_or_load(cache_key, lambda: func(*args, **kwargs), ttl)
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,45 @@
+"""
+WORKER - Standalone background worker process
+Runs the content queue consumer (scheduled + bulk generation) and domain jobs
+outside the API processes, so LLM batches never share an event loop with page traffic.
+
+    python worker.py
+
+Set CONTENT_WORKER_EMBEDDED=false on the web service so only this process consumes.
+Control it through the /api/scheduler/* endpoints (shared state in Mongo).
+"""
+
+import asyncio
+import signal
+import sys
+
+import server
+from server import content_scheduler, domain_job_supervisor, http_clients, logger, WORKER_ID
+
+
+async def main():
+    if not await server.connect_to_mongo():
+        logger.error("[FATAL] Worker cannot start without database connection")
+        sys.exit(1)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await content_scheduler.start(mode="worker")
+    domain_job_supervisor.start()
+    logger.info(f"Worker {WORKER_ID} running")
+
+    await stop.wait()
+
+    logger.info("Worker shutting down...")
+    await content_scheduler.stop()
+    await domain_job_supervisor.stop()
+    await http_clients.aclose()
+    await server.disconnect_from_mongo()
+    logger.info("Worker shutdown complete")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -188,11 +188,52 @@ export default function MatchHub() {
     }
   };
 
+  const fetchFeatured = async () => {
+    const featuredRes = await axios.get(`${API}/sports/featured`).catch(() => ({ data: null }));
+    setFeatured(featuredRes.data);
+  };
+
   useEffect(() => {
     fetchData();
-    // Auto-refresh every 90 seconds
-    const interval = setInterval(fetchData, 90000);
-    return () => clearInterval(interval);
+    let interval = null;
+    // Fallback: auto-refresh every 90 seconds when live push is unavailable
+    const startPolling = () => {
+      if (!interval) interval = setInterval(fetchData, 90000);
+    };
+    if (typeof EventSource === "undefined") {
+      startPolling();
+      return () => clearInterval(interval);
+    }
+
+    // Live push: one snapshot, then diffs after each server-side refresh.
+    // EventSource reconnects on its own and resumes via Last-Event-ID.
+    const source = new EventSource(`${API}/sports/stream`);
+    source.addEventListener("snapshot", (e) => {
+      const { items } = JSON.parse(e.data);
+      if (items.length) setMatches(items);
+      setFromCache(false);
+      setError(null);
+      setLoading(false);
+    });
+    source.addEventListener("diff", (e) => {
+      const { changed, removed, order } = JSON.parse(e.data);
+      setMatches((prev) => {
+        const byId = Object.fromEntries(prev.map((m) => [m.id, m]));
+        changed.forEach((m) => { byId[m.id] = m; });
+        removed.forEach((id) => { delete byId[id]; });
+        return order.map((id) => byId[id]).filter(Boolean);
+      });
+      setFromCache(false);
+      fetchFeatured();
+    });
+    source.onerror = () => {
+      // CLOSED means the server refused the stream (e.g. 503) — go back to polling
+      if (source.readyState === EventSource.CLOSED) startPolling();
+    };
+    return () => {
+      source.close();
+      clearInterval(interval);
+    };
   }, []);
 
   const scroll = (dir) => {
@@ -751,6 +751,14 @@ function DomainsTab({ domains, onRefresh }) {
   const [godaddySearch, setGodaddySearch] = useState("");
   const [godaddyFilter, setGodaddyFilter] = useState("all");
   const [godaddyStats, setGodaddyStats] = useState({ total: 0, parked: 0, hosted: 0, platform: 0 });
+  const [godaddyExpiring, setGodaddyExpiring] = useState(false);
+  const [godaddyPage, setGodaddyPage] = useState(1);
+  const [godaddyTotal, setGodaddyTotal] = useState(0);
+  const [godaddyHasMore, setGodaddyHasMore] = useState(false);
+  const [godaddySyncing, setGodaddySyncing] = useState(false);
+  const [bulkNames, setBulkNames] = useState("");
+  const [bulkJob, setBulkJob] = useState(null);
+  const [bulkSubmitting, setBulkSubmitting] = useState(false);
 
   useEffect(() => {
     domains.forEach(async (d) => {
@@ -763,13 +771,22 @@ function DomainsTab({ domains, onRefresh }) {
     });
   }, [domains]);
 
-  const fetchGodaddyDomains = async () => {
+  // Filtering, search and paging run server-side over the synced inventory
+  const fetchGodaddyDomains = async (page = 1) => {
     setGodaddyLoading(true);
     setGodaddyError("");
     try {
-      const res = await axios.get(`${API}/godaddy/domains`);
-      setGodaddyDomains(res.data.domains || []);
+      const params = { page, limit: 100 };
+      if (godaddyFilter !== "all") params.hosting_status = godaddyFilter;
+      if (godaddySearch.trim()) params.search = godaddySearch.trim();
+      if (godaddyExpiring) params.expires_within_days = 30;
+      const res = await axios.get(`${API}/godaddy/domains`, { params });
+      const list = res.data.domains || [];
+      setGodaddyDomains(prev => page === 1 ? list : [...prev, ...list]);
       setGodaddyStats(res.data.stats || { total: 0, parked: 0, hosted: 0, platform: 0 });
+      setGodaddyTotal(res.data.total || 0);
+      setGodaddyHasMore(!!res.data.has_more);
+      setGodaddyPage(page);
       setGodaddyFetched(true);
     } catch (e) {
       setGodaddyError(e.response?.data?.detail || "GoDaddy domainleri alınamadı");
@@ -778,6 +795,53 @@ function DomainsTab({ domains, onRefresh }) {
     }
   };
 
+  useEffect(() => {
+    if (!godaddyFetched) return;
+    const timer = setTimeout(() => fetchGodaddyDomains(1), 300);
+    return () => clearTimeout(timer);
+  }, [godaddyFilter, godaddySearch, godaddyExpiring]);
+
+  const handleGodaddySync = async () => {
+    setGodaddySyncing(true);
+    try {
+      const res = await axios.post(`${API}/godaddy/sync`);
+      toast.success(res.data.started ? "GoDaddy senkronizasyonu başladı" : "Senkronizasyon zaten çalışıyor");
+    } catch (e) {
+      toast.error(e.response?.data?.detail || "Senkronizasyon başlatılamadı");
+    } finally {
+      setGodaddySyncing(false);
+    }
+  };
+
+  // Poll the bulk import job until it finishes
+  useEffect(() => {
+    if (!bulkJob || ["completed", "failed"].includes(bulkJob.status)) return;
+    const timer = setTimeout(async () => {
+      try {
+        const res = await axios.get(`${API}/godaddy/import-jobs/${bulkJob.id}`);
+        setBulkJob(res.data);
+        if (res.data.status === "completed") onRefresh();
+      } catch { /* keep last state, retry on next tick */ }
+    }, 5000);
+    return () => clearTimeout(timer);
+  }, [bulkJob]);
+
+  const handleBulkImport = async () => {
+    const names = bulkNames.split(/[\s,]+/).map(n => n.trim()).filter(Boolean);
+    if (!names.length) return toast.error("Domain listesi boş");
+    setBulkSubmitting(true);
+    try {
+      const res = await axios.post(`${API}/godaddy/import-bulk`, { domain_names: names, focus: "bonus" });
+      setBulkJob(res.data);
+      setBulkNames("");
+      toast.success(`${res.data.accepted} domain kuyruğa alındı, ${res.data.skipped.length} atlandı`);
+    } catch (e) {
+      toast.error(e.response?.data?.detail || "Toplu ekleme başlatılamadı");
+    } finally {
+      setBulkSubmitting(false);
+    }
+  };
+
   const handleImportDomain = async (gdDomain) => {
     setImportingDomain(gdDomain.domain);
     try {
@@ -786,7 +850,7 @@ function DomainsTab({ domains, onRefresh }) {
         focus: "bonus"
       });
       toast.success(`${gdDomain.domain} platforma eklendi! AI içerik üretimi başladı.`);
-      setGodaddyDomains(prev => prev.map(d => d.domain === gdDomain.domain ? { ...d, already_added: true } : d));
+      setGodaddyDomains(prev => prev.map(d => d.domain === gdDomain.domain ? { ...d, already_added: true, hosting_status: "platform" } : d));
       onRefresh();
     } catch (e) {
       toast.error(e.response?.data?.detail || "Domain eklenemedi");
@@ -832,16 +896,6 @@ function DomainsTab({ domains, onRefresh }) {
     finally { setSaving(false); }
   };
 
-  const filteredGodaddyDomains = godaddyDomains.filter(d => {
-    const matchesSearch = d.domain.toLowerCase().includes(godaddySearch.toLowerCase());
-    if (!matchesSearch) return false;
-    if (godaddyFilter === "all") return true;
-    if (godaddyFilter === "parked") return d.hosting_status === "parked";
-    if (godaddyFilter === "hosted") return d.hosting_status === "hosted";
-    if (godaddyFilter === "platform") return d.hosting_status === "platform";
-    return true;
-  });
-
   const filterButtons = [
     { key: "all", label: "Tümü", count: godaddyStats.total, color: "text-white" },
     { key: "parked", label: "Boşta", count: godaddyStats.parked, color: "text-yellow-400" },
@@ -861,7 +915,7 @@ function DomainsTab({ domains, onRefresh }) {
         </CardHeader>
         <CardContent>
           {!godaddyFetched ? (
-            <Button onClick={fetchGodaddyDomains} disabled={godaddyLoading} className="bg-[#00F0FF] text-black hover:bg-[#00F0FF]/80" data-testid="fetch-godaddy-btn">
+            <Button onClick={() => fetchGodaddyDomains(1)} disabled={godaddyLoading} className="bg-[#00F0FF] text-black hover:bg-[#00F0FF]/80" data-testid="fetch-godaddy-btn">
               {godaddyLoading ? <Loader2 className="w-4 h-4 mr-2 animate-spin" /> : <Download className="w-4 h-4 mr-2" />}
               GoDaddy Domainlerini Getir
             </Button>
@@ -885,7 +939,14 @@ function DomainsTab({ domains, onRefresh }) {
               {/* Search & Refresh */}
               <div className="flex items-center justify-between gap-4">
                 <div className="flex items-center gap-2 text-sm text-muted-foreground">
-                  <span>{filteredGodaddyDomains.length} domain gösteriliyor</span>
+                  <span>{godaddyDomains.length} / {godaddyTotal} domain gösteriliyor</span>
+                  <button
+                    onClick={() => setGodaddyExpiring(v => !v)}
+                    className={`text-xs px-2 py-0.5 rounded border ${godaddyExpiring ? "border-[#00F0FF] text-[#00F0FF]" : "border-white/10"}`}
+                    data-testid="godaddy-expiring-filter"
+                  >
+                    30 gün içinde bitenler
+                  </button>
                 </div>
                 <div className="flex items-center gap-2">
                   <div className="relative">
@@ -898,17 +959,17 @@ function DomainsTab({ domains, onRefresh }) {
                       data-testid="godaddy-search-input"
                     />
                   </div>
-                  <Button variant="outline" size="sm" onClick={fetchGodaddyDomains} disabled={godaddyLoading} data-testid="refresh-godaddy-btn">
-                    <RefreshCw className={`w-4 h-4 ${godaddyLoading ? "animate-spin" : ""}`} />
+                  <Button variant="outline" size="sm" onClick={handleGodaddySync} disabled={godaddySyncing} title="GoDaddy ile senkronize et" data-testid="refresh-godaddy-btn">
+                    <RefreshCw className={`w-4 h-4 ${godaddySyncing ? "animate-spin" : ""}`} />
                   </Button>
                 </div>
               </div>
 
-              {filteredGodaddyDomains.length === 0 ? (
+              {godaddyDomains.length === 0 ? (
                 <p className="text-muted-foreground text-center py-6">Eşleşen domain bulunamadı</p>
               ) : (
                 <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-3 max-h-[400px] overflow-y-auto pr-1">
-                  {filteredGodaddyDomains.map((gd) => (
+                  {godaddyDomains.map((gd) => (
                     <div key={gd.domain} className={`rounded-lg border p-3 flex flex-col gap-2 ${gd.hosting_status === "platform" ? "border-neon-green/30" : gd.hosting_status === "hosted" ? "border-blue-500/30" : "border-yellow-500/20"}`} data-testid={`godaddy-domain-${gd.domain}`}>
                       <div className="flex items-center justify-between">
                         <span className="font-medium text-sm truncate">{gd.domain}</span>
@@ -945,6 +1006,38 @@ function DomainsTab({ domains, onRefresh }) {
                   ))}
                 </div>
               )}
+              {/* Bulk import */}
+              <div className="rounded-lg border border-white/10 p-3 space-y-2" data-testid="godaddy-bulk-import">
+                <div className="flex items-center justify-between text-sm">
+                  <span className="font-medium">Toplu Ekle</span>
+                  <Button
+                    variant="ghost"
+                    size="sm"
+                    onClick={() => setBulkNames(godaddyDomains.filter(d => !d.already_added).map(d => d.domain).join("\n"))}
+                    data-testid="godaddy-bulk-fill"
+                  >
+                    Listelenenleri doldur
+                  </Button>
+                </div>
+                <Textarea value={bulkNames} onChange={(e) => setBulkNames(e.target.value)} placeholder="Her satıra bir domain..." rows={3} data-testid="godaddy-bulk-input" />
+                <Button size="sm" onClick={handleBulkImport} disabled={bulkSubmitting} className="bg-[#00F0FF] text-black hover:bg-[#00F0FF]/80" data-testid="godaddy-bulk-submit">
+                  {bulkSubmitting ? <Loader2 className="w-4 h-4 mr-1 animate-spin" /> : <Plus className="w-4 h-4 mr-1" />}
+                  Toplu Ekle
+                </Button>
+                {bulkJob && (
+                  <div className="text-xs text-muted-foreground" data-testid="godaddy-bulk-progress">
+                    Durum: {bulkJob.status} · {bulkJob.provisioned}/{bulkJob.accepted} eklendi · içerik {bulkJob.content_done}/{bulkJob.content_total}
+                    {bulkJob.content_failed > 0 && ` (${bulkJob.content_failed} hata)`} · %{bulkJob.progress ?? 0}
+                  </div>
+                )}
+              </div>
+
+              {godaddyHasMore && (
+                <Button variant="outline" size="sm" onClick={() => fetchGodaddyDomains(godaddyPage + 1)} disabled={godaddyLoading} className="w-full" data-testid="godaddy-load-more">
+                  {godaddyLoading ? <Loader2 className="w-4 h-4 mr-2 animate-spin" /> : null}
+                  Daha Fazla Yükle
+                </Button>
+              )}
             </div>
           )}
           {godaddyError && (